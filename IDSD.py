@@ -2,14 +2,13 @@
 # 🏆 Ultra-Polished Dashboard IDSD NTT
 # =======================================
 import streamlit as st
-import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit_folium import st_folium
+from streamlit.components.v1 import html
 import plotly.express as px
-import plotly.graph_objects as go
 from branca.colormap import linear
-from io import BytesIO
+from idsd_core import DataTidakValid, service
+from idsd_core.choropleth import layer_choropleth
 
 # ===== Config halaman =====
 st.set_page_config(page_title="Ultra-Polished Dashboard IDSD NTT", layout="wide", initial_sidebar_state="expanded")
@@ -17,71 +16,60 @@ st.set_page_config(page_title="Ultra-Polished Dashboard IDSD NTT", layout="wide"
 # ===== Tema =====
 theme = st.sidebar.radio("🎨 Tema Dashboard", ["Light", "Dark"], index=0)
 
-# ===== Load Data =====
-@st.cache_data
-def load_data():
-    df_2023 = pd.read_csv("data/idsd_data_2023_lengkap.csv")
-    df_2024 = pd.read_csv("data/idsd_data_2024.csv")
-    return df_2023, df_2024
+# ===== Load Data (layanan bersama idsd_core.service) =====
+try:
+    panel = service.get_panel()
+    fitur_peta = service.get_fitur_peta(zoom=7)
+except FileNotFoundError as e:
+    st.error(f"❌ Data tidak ditemukan: {e}")
+    st.stop()
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
+    st.stop()
 
-df_2023, df_2024 = load_data()
-
-# ===== Load GeoJSON =====
-@st.cache_resource
-def load_geojson():
-    gdf = gpd.read_file("data/geojson_kabupaten_ntt_no_csv.geojson")
-    gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-    return gdf
-
-gdf = load_geojson()
+daftar_tahun = service.daftar_tahun()
 
 # ===== Nama Pilar =====
 nama_pilar = {f'pilar_{i}': f'Pilar {i}' for i in range(1,13)}
 
 # ===== Sidebar =====
 st.sidebar.header("📌 Filter Dashboard")
-tahun_sel = st.sidebar.multiselect("📅 Tahun", ["2023","2024"], default=["2023","2024"])
-kab_sel = st.sidebar.multiselect("🏛 Kabupaten/Kota", sorted(df_2023['kabupaten'].unique()), default=["Semua"])
+tahun_sel = st.sidebar.multiselect("📅 Tahun", daftar_tahun, default=daftar_tahun[-2:])
+kab_sel = st.sidebar.multiselect("🏛 Kabupaten/Kota", ["Semua"] + sorted(panel.kabupaten), default=["Semua"])
 indikator = st.sidebar.selectbox("🎯 Pilar IDSD", [f'pilar_{i}' for i in range(1,13)], format_func=lambda x: nama_pilar.get(x,x))
+# Statis: HTML jadi dari cache bersama, pan/zoom/klik tidak mengirim state ke server
+peta_statis = st.sidebar.checkbox("🧊 Peta statis (tanpa rerun)", value=True)
 
-# ===== Fungsi Merge Data =====
-def merge_data(tahun):
-    df = df_2023 if tahun=="2023" else df_2024
-    df["kabupaten"] = df["kabupaten"].str.upper().str.strip()
-    df_map = df[['kabupaten', indikator]].copy()
-    gdf_merged = gdf.merge(df_map, on="kabupaten", how="left")
-    gdf_merged[indikator] = pd.to_numeric(gdf_merged[indikator], errors="coerce")
-    return gdf_merged, df
+# ===== Fungsi Data per Tahun =====
+def data_tahun(tahun):
+    df = service.get_tahun(tahun)
+    return df[indikator], df
 
 # ===== Tabs Tahun =====
 tabs = st.tabs(tahun_sel)
 for i, tahun in enumerate(tahun_sel):
     with tabs[i]:
-        gdf_merged, df_terpilih = merge_data(tahun)
-
-        # ===== Colormap =====
-        vmin, vmax = gdf_merged[indikator].min(), gdf_merged[indikator].max()
-        if vmin==vmax: vmax=vmin+0.01
-        colormap = linear.YlGnBu_09.scale(vmin,vmax).to_step(n=10)
-        colormap.caption = f"{nama_pilar.get(indikator,indikator)} ({tahun})"
-
-        # ===== Peta Interaktif =====
-        def style_function(feature):
-            val = feature["properties"].get(indikator)
-            base_color = colormap(val) if val is not None else "#d3d3d3"
-            if kab_sel != ["Semua"] and feature["properties"]["kabupaten"] in kab_sel:
-                base_color = "#ff6600"
-            return {"fillColor": base_color, "color":"black","weight":1,"fillOpacity":0.7}
-
-        m = folium.Map(location=[-8.6,121.1], zoom_start=7, tiles="CartoDB positron" if theme=="Light" else "CartoDB dark_matter")
-        folium.GeoJson(
-            gdf_merged,
-            style_function=style_function,
-            tooltip=folium.features.GeoJsonTooltip(fields=["kabupaten", indikator], aliases=["Kabupaten/Kota:", f"{nama_pilar.get(indikator,indikator)}:"], localize=True)
-        ).add_to(m)
-        colormap.add_to(m)
+        nilai_peta, df_terpilih = data_tahun(tahun)
+
+        # ===== Peta =====
         st.subheader(f"🗺️ Peta {nama_pilar.get(indikator,indikator)} - Tahun {tahun}")
-        st_folium(m, width=900, height=550)
+        highlight = kab_sel if kab_sel != ["Semua"] else []
+        if peta_statis:
+            map_html = service.peta_html(tahun, indikator, nama_pilar.get(indikator,indikator), highlight, theme)
+            html(map_html, width=900, height=550)
+        else:
+            # ===== Colormap =====
+            vmin, vmax = nilai_peta.min(), nilai_peta.max()
+            if vmin==vmax: vmax=vmin+0.01
+            colormap = linear.YlGnBu_09.scale(vmin,vmax).to_step(n=10)
+            colormap.caption = f"{nama_pilar.get(indikator,indikator)} ({tahun})"
+
+            # ===== Peta Interaktif =====
+            m = folium.Map(location=[-8.6,121.1], zoom_start=7, tiles="CartoDB positron" if theme=="Light" else "CartoDB dark_matter")
+            layer_choropleth(fitur_peta, df_terpilih, indikator, colormap, alias=[f"{nama_pilar.get(indikator,indikator)}:"], highlight=highlight).add_to(m)
+            colormap.add_to(m)
+            # returned_objects=[]: komponen tidak mengembalikan state, jadi tidak memicu rerun
+            st_folium(m, width=900, height=550, returned_objects=[], key=f"peta_{tahun}")
 
         # ===== Ranking Chart =====
         st.subheader("📊 Ranking Kabupaten")
@@ -92,29 +80,38 @@ for i, tahun in enumerate(tahun_sel):
 
         fig = px.bar(df_sorted, x='kabupaten', y=indikator, color=indikator, color_continuous_scale='YlGnBu')
         fig.update_layout(xaxis_tickangle=-45, height=500, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=True, key=f"ranking_{tahun}")
 
         # ===== Radar Chart =====
         st.subheader("📈 Radar Chart 12 Pilar")
-        df_radar = df_terpilih.set_index('kabupaten')[[f'pilar_{i}' for i in range(1,13)]]
-        if "Semua" not in kab_sel:
-            df_radar = df_radar.loc[kab_sel]
-        fig_radar = go.Figure()
-        for idx,row in df_radar.iterrows():
-            fig_radar.add_trace(go.Scatterpolar(r=row.values, theta=list(nama_pilar.values()), fill='toself', name=idx))
-        fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0,100])), showlegend=True, height=550)
-        st.plotly_chart(fig_radar, use_container_width=True)
-
-        # ===== Download Excel =====
-        st.subheader("💾 Download Data Filtered")
-        def to_excel(df):
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False, sheet_name='Data')
-            return output.getvalue()
-
-        excel_data = to_excel(df_terpilih)
-        st.download_button("📥 Download Data Excel", excel_data, file_name=f"IDSD_NTT_{tahun}.xlsx", mime="application/vnd.ms-excel")
+        if not kab_sel:
+            st.info("ℹ️ Pilih minimal satu kabupaten/kota (atau Semua) untuk radar.")
+            continue
+        # Jejak per kabupaten di-cache per versi dataset; di sini hanya dirangkai
+        kab_radar = None if "Semua" in kab_sel else kab_sel
+        fig_radar = service.get_profil().radar(tahun, kab_radar, label=list(nama_pilar.values()))
+        st.plotly_chart(fig_radar, use_container_width=True, key=f"radar_{tahun}")
+
+# ===== Download Excel (dibuat hanya saat diminta, cache per versi data + filter) =====
+@st.fragment
+def bagian_ekspor(tahun_list, kabupaten):
+    st.subheader("💾 Download Data Filtered")
+    if not tahun_list:
+        st.info("ℹ️ Pilih minimal satu tahun untuk ekspor.")
+        return
+    kunci = (tuple(tahun_list), tuple(kabupaten))
+    if st.button("📦 Siapkan File Excel"):
+        st.session_state["ekspor_siap"] = kunci
+    if st.session_state.get("ekspor_siap") == kunci:
+        st.download_button(
+            "📥 Download Data Excel",
+            service.ekspor_excel(tahun_list, kabupaten),
+            file_name=f"IDSD_NTT_{'_'.join(tahun_list)}.xlsx",
+            mime=service.MIME_XLSX,
+        )
+
+
+bagian_ekspor(tahun_sel, kab_sel)
 
 # ===== Statistik Deskriptif =====
 st.markdown("---")
@@ -0,0 +1,291 @@
+# =======================================
+# ⏱️ Benchmark headless semua entry point dashboard (Streamlit AppTest)
+# =======================================
+# Setiap script dijalankan di proses baru (cold start sungguhan: import,
+# cache service kosong), lalu widget diputar melintasi seluruh matriks
+# pilar × tahun × mode (tahun dari store lewat service.daftar_tahun() di proses
+# induk, jadi tahun baru otomatis ikut; cache worker tetap dingin). Per run
+# dicatat waktu total, waktu per fase (data / peta / sisanya = script +
+# widget), dan memori puncak.
+# Hasil JSON bisa dibandingkan antar commit:
+#   python benchmark_dashboard.py                       # semua script
+#   python benchmark_dashboard.py --script gerald.py    # satu script
+#   python benchmark_dashboard.py --banding lama.json baru.json
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+FOLDER_HASIL = os.path.join(ROOT_DIR, "data", "benchmark")
+
+PILAR = [f"pilar_{i}" for i in range(1, 13)]
+
+MODE_PETA = ["Interaktif (ganti di peta)", "Statis", "Kecamatan (vector tile)"]
+SCRIPT = ["dashboard_final.py", "idsd_dashboard_ntt_composite.py", "gerald.py"]
+
+
+def skenario(tahun):
+    # Matriks widget per script: (jenis widget, label, daftar nilai)
+    return {
+        "dashboard_final.py": [
+            ("selectbox", "📅 Pilih Tahun:", tahun),
+            ("selectbox", "🎯 Pilih Pilar IDSD:", PILAR),
+            ("radio", "Pilih Mode Tampilan:", ["Per Kabupaten", "Per Indikator"]),
+            ("radio", "🗺️ Mode Peta", MODE_PETA),
+        ],
+        "idsd_dashboard_ntt_composite.py": [
+            ("selectbox", "🎯 Pilih Pilar IDSD:", PILAR),
+            ("radio", "📅 Mode Perbandingan:", ["Antar Tahun", "Antar Kabupaten"]),
+        ],
+        "gerald.py": [
+            # Tiap tahun sendiri + default dashboard (dua tahun terakhir)
+            ("multiselect", "📅 Tahun", [[t] for t in tahun] + ([tahun[-2:]] if len(tahun) > 1 else [])),
+            ("selectbox", "🎯 Pilar IDSD", PILAR),
+            ("radio", "🎨 Tema Dashboard", ["Light", "Dark"]),
+        ],
+    }
+
+
+# Fungsi yang waktunya dicatat per fase (hanya panggilan terluar yang dihitung)
+FASE = {
+    "data": [
+        ("idsd_core.service", "get_panel"),
+        ("idsd_core.service", "get_agregat"),
+        ("idsd_core.service", "get_tahun"),
+        ("idsd_core.service", "get_geometri"),
+        ("idsd_core.service", "get_fitur_peta"),
+    ],
+    "peta": [
+        ("idsd_core.service", "peta_html"),
+        ("idsd_core.service", "peta_klien_html"),
+        ("idsd_core.service", "peta_kecamatan_html"),
+        ("idsd_core.choropleth", "layer_choropleth"),
+        ("idsd_core.choropleth", "render_peta"),
+        ("branca.element", "Figure.render"),
+    ],
+}
+
+
+# ===== Pencatat fase =====
+class PencatatFase:
+    def __init__(self):
+        self.waktu = {fase: 0.0 for fase in FASE}
+        self._kedalaman = 0
+
+    def reset(self):
+        self.waktu = {fase: 0.0 for fase in FASE}
+
+    def bungkus(self, fase, fungsi):
+        def terbungkus(*args, **kwargs):
+            self._kedalaman += 1
+            mulai = time.perf_counter()
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                self._kedalaman -= 1
+                if self._kedalaman == 0:
+                    self.waktu[fase] += time.perf_counter() - mulai
+
+        terbungkus.__wrapped__ = fungsi
+        return terbungkus
+
+    def pasang(self):
+        import importlib
+
+        for fase, target in FASE.items():
+            for nama_modul, nama in target:
+                objek = importlib.import_module(nama_modul)
+                *induk, atribut = nama.split(".")
+                for bagian in induk:
+                    objek = getattr(objek, bagian)
+                setattr(objek, atribut, self.bungkus(fase, getattr(objek, atribut)))
+
+
+def _rss_mb():
+    # ru_maxrss: KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _widget(at, jenis, label):
+    for w in getattr(at, jenis):
+        if w.label == label:
+            return w
+    return None
+
+
+# ===== Worker: satu script, satu proses =====
+def ukur_run(at, pencatat, pakai_tracemalloc):
+    pencatat.reset()
+    if pakai_tracemalloc:
+        tracemalloc.start()
+    mulai = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - mulai
+    hasil = {
+        "total_ms": total * 1000,
+        **{f"{fase}_ms": detik * 1000 for fase, detik in pencatat.waktu.items()},
+    }
+    hasil["lainnya_ms"] = hasil["total_ms"] - sum(pencatat.waktu.values()) * 1000
+    if pakai_tracemalloc:
+        hasil["tracemalloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    hasil["peak_rss_mb"] = _rss_mb()
+    hasil["exception"] = [str(e.value) for e in at.exception][:3]
+    return hasil
+
+
+def jalankan_script(script, tahun, pakai_tracemalloc=False, timeout=120):
+    from streamlit.testing.v1 import AppTest
+
+    pencatat = PencatatFase()
+    pencatat.pasang()
+
+    at = AppTest.from_file(os.path.join(ROOT_DIR, script), default_timeout=timeout)
+    runs = [{"script": script, "fase": "cold", "parameter": {}, **ukur_run(at, pencatat, pakai_tracemalloc)}]
+
+    widgets = skenario(tahun)[script]
+    for kombinasi in itertools.product(*(nilai for _, _, nilai in widgets)):
+        parameter, hilang = {}, []
+        for (jenis, label, _), nilai in zip(widgets, kombinasi):
+            w = _widget(at, jenis, label)
+            if w is None:
+                hilang.append(label)
+                continue
+            w.set_value(nilai)
+            parameter[label] = nilai
+        hasil = ukur_run(at, pencatat, pakai_tracemalloc)
+        if hilang:
+            hasil["widget_hilang"] = hilang
+        runs.append({"script": script, "fase": "rerun", "parameter": parameter, **hasil})
+    return runs
+
+
+# ===== Ringkasan & perbandingan =====
+def _persentil(nilai, p):
+    nilai = sorted(nilai)
+    return nilai[min(len(nilai) - 1, int(round(p / 100 * (len(nilai) - 1))))] if nilai else None
+
+
+def ringkas(runs):
+    ringkasan = {}
+    for (script, fase), grup in itertools.groupby(
+        sorted(runs, key=lambda r: (r["script"], r["fase"])), key=lambda r: (r["script"], r["fase"])
+    ):
+        grup = list(grup)
+        baris = {"n": len(grup), "error": sum(bool(r["exception"]) for r in grup)}
+        for kunci in ["total_ms", "data_ms", "peta_ms", "lainnya_ms"]:
+            nilai = [r[kunci] for r in grup]
+            baris[kunci] = {"median": _persentil(nilai, 50), "p95": _persentil(nilai, 95), "max": max(nilai)}
+        baris["peak_rss_mb"] = max(r["peak_rss_mb"] for r in grup)
+        if "tracemalloc_peak_mb" in grup[0]:
+            baris["tracemalloc_peak_mb"] = max(r["tracemalloc_peak_mb"] for r in grup)
+        ringkasan.setdefault(script, {})[fase] = baris
+    return ringkasan
+
+
+def cetak_ringkasan(ringkasan):
+    for script, per_fase in ringkasan.items():
+        print(f"\n📄 {script}")
+        for fase, b in per_fase.items():
+            print(
+                f"   {fase:<5} n={b['n']:<3} total median {b['total_ms']['median']:8.1f} ms "
+                f"p95 {b['total_ms']['p95']:8.1f} ms | data {b['data_ms']['median']:7.1f} "
+                f"| peta {b['peta_ms']['median']:7.1f} | lainnya {b['lainnya_ms']['median']:7.1f} "
+                f"| RSS {b['peak_rss_mb']:.0f} MB" + (f" | ❌ {b['error']} error" if b["error"] else "")
+            )
+
+
+def banding(path_lama, path_baru):
+    with open(path_lama, encoding="utf-8") as f:
+        data_lama = json.load(f)
+    with open(path_baru, encoding="utf-8") as f:
+        data_baru = json.load(f)
+    lama, baru = data_lama["ringkasan"], data_baru["ringkasan"]
+    print(f"===== {data_lama['meta']['commit']} -> {data_baru['meta']['commit']} (median total) =====")
+    if data_lama["meta"]["tracemalloc"] != data_baru["meta"]["tracemalloc"]:
+        print("⚠️ Salah satu hasil diukur dengan --tracemalloc, waktu tidak sebanding")
+    for script in sorted(set(lama) & set(baru)):
+        for fase in sorted(set(lama[script]) & set(baru[script])):
+            a = lama[script][fase]["total_ms"]["median"]
+            b = baru[script][fase]["total_ms"]["median"]
+            print(f"{script:<34} {fase:<5} {a:8.1f} -> {b:8.1f} ms ({(b - a) / a * 100:+.1f}%)")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ===== CLI =====
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark headless dashboard IDSD")
+    parser.add_argument("--script", action="append", choices=sorted(SCRIPT), help="Script yang diukur (default: semua)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Catat puncak alokasi Python per run (lebih lambat)")
+    parser.add_argument("--output", help="File JSON hasil (default: data/benchmark/<commit>.json)")
+    parser.add_argument("--banding", nargs=2, metavar=("LAMA", "BARU"), help="Bandingkan dua file hasil")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--tahun", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.banding:
+        banding(*args.banding)
+        sys.exit(0)
+
+    if args.worker:
+        # Dipanggil oleh proses induk: cetak hasil satu script sebagai JSON
+        json.dump(jalankan_script(args.script[0], args.tahun.split(","), args.tracemalloc), sys.stdout)
+        sys.exit(0)
+
+    from idsd_core import service
+
+    tahun = service.daftar_tahun()
+    runs = []
+    for script in args.script or SCRIPT:
+        print(f"⏱️ {script} ...", flush=True)
+        perintah = [
+            sys.executable, os.path.abspath(__file__), "--worker", "--script", script, "--tahun", ",".join(tahun)
+        ]
+        if args.tracemalloc:
+            perintah.append("--tracemalloc")
+        proses = subprocess.run(perintah, cwd=ROOT_DIR, capture_output=True, text=True)
+        if proses.returncode != 0:
+            print(f"❌ {script} gagal:\n{proses.stderr[-2000:]}")
+            continue
+        runs.extend(json.loads(proses.stdout.strip().splitlines()[-1]))
+
+    import streamlit
+
+    from idsd_core.store import dataset_version
+
+    hasil = {
+        "meta": {
+            "commit": _git_commit(),
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "versi_dataset": dataset_version(),
+            "tracemalloc": args.tracemalloc,
+        },
+        "ringkasan": ringkas(runs),
+        "runs": runs,
+    }
+    cetak_ringkasan(hasil["ringkasan"])
+
+    path = args.output or os.path.join(FOLDER_HASIL, f"{hasil['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(hasil, f, indent=2)
+    print(f"\n💾 Hasil: {os.path.relpath(path, ROOT_DIR)}")
@@ -0,0 +1,41 @@
+# =======================================
+# ⏱️ Benchmark: CSV lama vs store Arrow
+# =======================================
+import time
+
+import pandas as pd
+
+from idsd_core.store import SUMBER_CSV, ensure_store, load_tahun
+
+ULANG = 50
+
+
+# ===== Jalur lama: read_csv + pd.to_numeric per kolom =====
+def load_csv_lama(tahun):
+    df = pd.read_csv(SUMBER_CSV[tahun])
+    df["kabupaten"] = df["kabupaten"].str.upper().str.strip()
+    for col in df.columns:
+        if col != "kabupaten":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def ukur(fungsi, ulang=ULANG):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        for tahun in SUMBER_CSV:
+            fungsi(tahun)
+        waktu.append(time.perf_counter() - mulai)
+    waktu.sort()
+    return waktu[len(waktu) // 2], waktu[0]
+
+
+if __name__ == "__main__":
+    ensure_store()
+    print(f"===== Benchmark load_data ({len(SUMBER_CSV)} tahun, {ULANG}x) =====")
+    median_csv, min_csv = ukur(load_csv_lama)
+    median_arrow, min_arrow = ukur(load_tahun)
+    print(f"📄 CSV   : median {median_csv * 1000:7.2f} ms | min {min_csv * 1000:7.2f} ms")
+    print(f"🗄️ Arrow : median {median_arrow * 1000:7.2f} ms | min {min_arrow * 1000:7.2f} ms")
+    print(f"🚀 Speedup median: {median_csv / median_arrow:.1f}x")
@@ -0,0 +1,20 @@
+# =======================================
+# 🗺️ Build geometri multi-resolusi kabupaten
+# =======================================
+from idsd_core.geometry_build import build_geometry
+
+if __name__ == "__main__":
+    print("🔧 Menyederhanakan batas kabupaten (coverage_simplify + kuantisasi)...")
+    manifest = build_geometry()
+    print(f"📄 Sumber: {', '.join(manifest['sumber'])}")
+    print(f"📌 Vertex asli: {manifest['vertex_asli']:,}")
+    for status, nama in manifest["kabupaten"].items():
+        if nama:
+            print(f"⚠️ Fitur dibuang, kabupaten {status.replace('_', ' ')}: {', '.join(nama)}")
+    for level, info in manifest["level"].items():
+        rasio = manifest["vertex_asli"] / max(info["vertex"], 1)
+        print(
+            f"✅ {level:<8} zoom>={info['zoom_min']:<2} toleransi={info['toleransi']:<7} "
+            f"{info['vertex']:>7,} vertex ({rasio:.0f}x lebih sedikit), {info['bytes'] / 1024:.1f} KB"
+        )
+    print(f"📦 Versi geometri: {manifest['versi']}")
@@ -0,0 +1,41 @@
+# =======================================
+# 🗄️ Build store kolumnar IDSD (CSV -> Arrow IPC)
+# =======================================
+import sys
+
+from idsd_core.store import FOLDER_STORE, NAMA_LAPORAN, build_store
+from idsd_core.validasi import DataTidakValid
+
+IKON = {"galat": "❌", "peringatan": "⚠️"}
+
+
+def cetak_temuan(temuan):
+    for t in temuan:
+        lokasi = f" {t['kolom']}" if t.get("kolom") else ""
+        contoh = f": {', '.join(t['contoh'])}" if t.get("contoh") else ""
+        print(f"   {IKON[t['tingkat']]} {t['cek'].replace('_', ' ')}{lokasi} ({t['jumlah']}){contoh}")
+
+
+if __name__ == "__main__":
+    print("🔧 Mengompilasi CSV lengkap menjadi store Arrow...")
+    try:
+        manifest = build_store()
+    except DataTidakValid as e:
+        print(e)
+        for tahun, jumlah in e.laporan["ringkasan"].items():
+            print(f"🧪 {tahun}: {jumlah['galat']} galat, {jumlah['peringatan']} peringatan")
+        cetak_temuan([t for t in e.laporan["temuan"] if t["tingkat"] == "galat"])
+        print(f"🚫 Store tidak dipublikasikan; laporan lengkap: {FOLDER_STORE}/{NAMA_LAPORAN}")
+        sys.exit(1)
+    for tahun, info in manifest["tahun"].items():
+        print(f"✅ {tahun}: {info['sumber']} -> {info['file']} ({info['baris']} baris, {info['kolom']} kolom)")
+        peringatan = [t for t in info["validasi"] if t["tingkat"] == "peringatan"]
+        cetak_temuan([t for t in peringatan if t["cek"] != "pencilan"])
+        pencilan = [t for t in peringatan if t["cek"] == "pencilan"]
+        if pencilan:
+            print(f"   ℹ️ pencilan (robust z): {sum(t['jumlah'] for t in pencilan)} sel di {len(pencilan)} kolom")
+    selaras = manifest["selaras"]
+    print(f"🔗 Penyelarasan indikator: {selaras['lintas_tahun']}/{selaras['indikator']} indikator terhubung "
+          f"lintas tahun (artefak {selaras['file']}, versi {selaras['versi']})")
+    print(f"🧪 Validasi: {manifest['validasi']['status']} (laporan {manifest['validasi']['file']})")
+    print(f"📦 Versi dataset: {manifest['versi']}  (folder: {FOLDER_STORE})")
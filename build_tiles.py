@@ -0,0 +1,23 @@
+# =======================================
+# 🧱 Build vector tile batas kecamatan (MBTiles)
+# =======================================
+import os
+
+from idsd_core.store import ROOT_DIR
+from idsd_core.tiles import path_mbtiles
+from idsd_core.tiles_build import build_tiles
+
+if __name__ == "__main__":
+    print("🔧 Memotong batas kecamatan menjadi vector tile (MVT)...")
+    manifest = build_tiles()
+    print(f"📄 Sumber: {', '.join(manifest['sumber'])}")
+    for path in manifest["dilewati"]:
+        print(f"⚠️ Sumber kosong, dilewati: {path}")
+    for status, nama in manifest["kabupaten"].items():
+        if nama:
+            print(f"⚠️ Kabupaten induk {status.replace('_', ' ')}: {', '.join(nama)}")
+    print(f"📌 Fitur: {manifest['fitur']:,}")
+    for zoom, info in manifest["zoom"].items():
+        print(f"✅ zoom {zoom:>2}: {info['tiles']:>6,} tile, {info['bytes'] / 1024:8.1f} KB")
+    print(f"💾 {os.path.relpath(path_mbtiles(), ROOT_DIR)} ({manifest['bytes'] / 1024:.1f} KB)")
+    print(f"📦 Versi tiles: {manifest['versi']}")
@@ -0,0 +1,179 @@
+# =======================================
+# 🔒 Cek lapisan data bersama read-only
+# =======================================
+# Semua sesi Streamlit di satu proses membaca objek yang sama dari cache
+# idsd_core.service (panel, agregat, mesin komposit/tren, profil, fitur & indeks peta).
+# Cek ini:
+#   1. setiap array numpy di cache bersama read-only
+#   2. frame get_tahun() berbagi buffer dengan panel (tanpa salin) dan tulis
+#      in-place ke frame itu ditolak
+#   3. setiap dashboard dijalankan beberapa sesi (AppTest, proses yang sama)
+#      lalu sidik semua objek bersama dibandingkan sebelum/sesudah
+#   4. memori tambahan per sesi untuk frame semua tahun
+# Gagal (exit 1) bila ada view yang mengubah state bersama.
+#   python check_hanya_baca.py [--sesi 2]
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from idsd_core import service
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD = [
+    "dashboard_final.py",
+    "gerald.py",
+    "IDSD.py",
+    "idsd_dashboard_ntt.py",
+    "idsd_dashboard_ntt_full.py",
+    "idsd_dashboard_ntt_composite.py",
+    "idsd_dashboard_ntt_stable.py",
+    "streamlit_app.py",
+]
+
+
+# ===== Jelajah objek bersama =====
+def jelajah(obj, jalur, hasil, dilihat):
+    # {jalur: objek} untuk array numpy, objek pandas, dan data JSON (fitur peta)
+    if id(obj) in dilihat or obj is None or isinstance(obj, (str, bytes, int, float, bool)):
+        return
+    dilihat.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        hasil[jalur] = obj
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        hasil[jalur] = obj
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            jelajah(v, f"{jalur}[{k!r}]", hasil, dilihat)
+    elif isinstance(obj, list) and all(v is None or isinstance(v, (str, int, float)) for v in obj):
+        # Daftar nilai polos (mis. r/theta jejak radar) disidik utuh
+        hasil[jalur] = obj
+    elif isinstance(obj, (list, tuple)):
+        for i, v in enumerate(obj):
+            jelajah(v, f"{jalur}[{i}]", hasil, dilihat)
+    elif type(obj).__module__.startswith("idsd_core") and hasattr(obj, "__dict__"):
+        for k, v in vars(obj).items():
+            if not callable(v):
+                jelajah(v, f"{jalur}.{k}", hasil, dilihat)
+
+
+def objek_bersama():
+    hasil, dilihat = {}, set()
+    with service._LOCK:
+        cache = dict(service._CACHE)
+    for kunci, (_, nilai) in cache.items():
+        if isinstance(nilai, (dict, list)):
+            # Data JSON (fitur GeoJSON peta) disidik utuh
+            hasil[str(kunci)] = nilai
+            continue
+        jelajah(nilai, str(kunci), hasil, dilihat)
+    return hasil
+
+
+def sidik(objek):
+    sidik = {}
+    for jalur, obj in objek.items():
+        if isinstance(obj, np.ndarray) and obj.dtype != object:
+            data = np.ascontiguousarray(obj).tobytes()
+        else:
+            data = pickle.dumps(obj)
+        sidik[jalur] = hashlib.sha256(data).hexdigest()
+    return sidik
+
+
+# ===== Cek =====
+def cek_read_only(objek):
+    return [jalur for jalur, obj in objek.items() if isinstance(obj, np.ndarray) and obj.flags.writeable]
+
+
+def cek_tanpa_salin(panel):
+    masalah = []
+    for tahun in panel.tahun:
+        df = service.get_tahun(tahun)
+        blok = panel._baris_tercatat(tahun)
+        kolom = df.columns[1]
+        if not np.shares_memory(df[kolom].to_numpy(), blok):
+            masalah.append(f"{tahun}: get_tahun menyalin nilai")
+        try:
+            df.loc[df.index[0], kolom] = -1.0
+            masalah.append(f"{tahun}: tulis in-place ke frame bersama tidak ditolak")
+        except ValueError:
+            pass
+    return masalah
+
+
+def jalankan_dashboard(nama, sesi):
+    from streamlit.testing.v1 import AppTest
+
+    galat = []
+    for _ in range(sesi):
+        at = AppTest.from_file(os.path.join(ROOT_DIR, nama), default_timeout=120).run()
+        galat += [str(e.value) for e in at.exception]
+    return galat
+
+
+def memori_per_sesi(panel, sesi=20):
+    # Frame semua tahun untuk `sesi` sesi yang hidup bersamaan
+    for tahun in panel.tahun:
+        service.get_tahun(tahun)
+    tracemalloc.start()
+    awal = tracemalloc.get_traced_memory()[0]
+    simpan = [[service.get_tahun(t) for t in panel.tahun] for _ in range(sesi)]
+    per_sesi = (tracemalloc.get_traced_memory()[0] - awal) / sesi
+    tracemalloc.stop()
+    data = sum(panel._baris_tercatat(t).nbytes for t in panel.tahun)
+    del simpan
+    return per_sesi, data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cek lapisan data bersama read-only IDSD")
+    parser.add_argument("--sesi", type=int, default=2, help="jumlah sesi per dashboard")
+    args = parser.parse_args()
+
+    panel = service.get_panel()
+    ok = True
+
+    masalah = cek_tanpa_salin(panel)
+    for m in masalah:
+        print(f"❌ {m}")
+    ok &= not masalah
+
+    per_sesi, data = memori_per_sesi(panel)
+    print(f"🧠 frame semua tahun per sesi: {per_sesi / 1024:.1f} KB "
+          f"(nilai bersama {data / 1024:.1f} KB, tidak disalin)")
+
+    # Dashboard pertama kali: isi cache bersama (panel, agregat, mesin, peta)
+    for nama in DASHBOARD:
+        galat = jalankan_dashboard(nama, 1)
+        if galat:
+            print(f"❌ {nama}: {galat[0]}")
+            ok = False
+    sebelum_objek = objek_bersama()
+    sebelum = sidik(sebelum_objek)
+
+    bisa_ditulis = cek_read_only(sebelum_objek)
+    for jalur in bisa_ditulis:
+        print(f"❌ array bersama bisa ditulis: {jalur}")
+    ok &= not bisa_ditulis
+
+    for nama in DASHBOARD:
+        galat = jalankan_dashboard(nama, args.sesi)
+        if galat:
+            print(f"❌ {nama}: {galat[0]}")
+            ok = False
+    sesudah = sidik(objek_bersama())
+    berubah = sorted(j for j in sebelum if sesudah.get(j) != sebelum[j])
+    for jalur in berubah:
+        print(f"❌ state bersama berubah oleh view: {jalur}")
+    ok &= not berubah
+
+    print(f"🔒 {len(sebelum)} objek bersama diperiksa, {len(DASHBOARD)} dashboard × {args.sesi} sesi")
+    if ok:
+        print("✅ Tidak ada view yang mengubah state bersama")
+    sys.exit(0 if ok else 1)
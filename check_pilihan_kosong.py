@@ -0,0 +1,40 @@
+# =======================================
+# 🧹 Cek dashboard dengan pilihan widget kosong (Streamlit AppTest)
+# =======================================
+# Pengguna bisa mengosongkan multiselect kapan saja; view harus menampilkan
+# pesan, bukan exception (mis. radar tanpa jejak, st.columns(0)).
+# Setiap kasus: jalankan script, set widget, rerun, lalu cek tidak ada exception.
+#   python check_pilihan_kosong.py
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (script, jenis widget, label, nilai)
+KASUS = [
+    ("gerald.py", "multiselect", "🏛 Kabupaten/Kota", []),
+    ("IDSD.py", "multiselect", "🏛 Kabupaten/Kota", []),
+]
+
+
+def jalankan(script, jenis, label, nilai):
+    at = AppTest.from_file(os.path.join(ROOT_DIR, script), default_timeout=120).run()
+    widget = [w for w in getattr(at, jenis) if w.label == label]
+    if not widget:
+        return [f"widget {jenis} '{label}' tidak ditemukan"]
+    widget[0].set_value(nilai).run()
+    return [str(e.value) for e in at.exception]
+
+
+if __name__ == "__main__":
+    ok = True
+    for script, jenis, label, nilai in KASUS:
+        galat = jalankan(script, jenis, label, nilai)
+        if galat:
+            print(f"❌ {script}: {label} = {nilai!r} -> {galat[0]}")
+            ok = False
+        else:
+            print(f"✅ {script}: {label} = {nilai!r}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,67 @@
+# =======================================
+# 🚀 Cek anggaran waktu start worker dashboard
+# =======================================
+# Diukur di proses Python baru (tanpa cache modul / service):
+#   1. import idsd_core.service
+#   2. siap melayani: panel skor + fitur peta kabupaten dimuat
+# Gagal (exit 1) bila melewati anggaran atau bila modul berat yang
+# seharusnya tidak ada di jalur runtime (geopandas, pyproj, ...) ikut diimpor.
+#   python check_startup.py [--anggaran-ms 800] [--ulang 3]
+import argparse
+import json
+import subprocess
+import sys
+
+ANGGARAN_MS = 800
+
+# Tidak boleh ada di worker setelah data siap (peta belum dirender)
+MODUL_TERLARANG = ["geopandas", "pyproj", "fiona", "pyogrio", "shapely", "folium", "branca", "plotly"]
+
+KODE_UKUR = """
+import json, sys, time
+mulai = time.perf_counter()
+from idsd_core import service
+t_import = time.perf_counter()
+service.get_panel()
+service.get_agregat()
+service.get_fitur_peta(zoom=7)
+t_siap = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t_import - mulai) * 1000,
+    "siap_ms": (t_siap - mulai) * 1000,
+    "modul": sorted({m.split(".")[0] for m in sys.modules}),
+}))
+"""
+
+
+def ukur_sekali():
+    proses = subprocess.run([sys.executable, "-c", KODE_UKUR], capture_output=True, text=True, check=True)
+    return json.loads(proses.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cek anggaran waktu start worker IDSD")
+    parser.add_argument("--anggaran-ms", type=float, default=ANGGARAN_MS)
+    parser.add_argument("--ulang", type=int, default=3)
+    args = parser.parse_args()
+
+    # Run pertama juga memastikan store & geometri sudah dibuild (tidak diukur)
+    ukur_sekali()
+    hasil = [ukur_sekali() for _ in range(args.ulang)]
+    import_ms = sorted(h["import_ms"] for h in hasil)[len(hasil) // 2]
+    siap_ms = sorted(h["siap_ms"] for h in hasil)[len(hasil) // 2]
+    terlarang = sorted(set(MODUL_TERLARANG) & set(hasil[0]["modul"]))
+
+    print(f"📦 import idsd_core.service : {import_ms:7.1f} ms (median {args.ulang}x)")
+    print(f"🚀 worker siap (data+peta)  : {siap_ms:7.1f} ms / anggaran {args.anggaran_ms:.0f} ms")
+
+    ok = True
+    if terlarang:
+        print(f"❌ Modul berat ikut diimpor di jalur runtime: {', '.join(terlarang)}")
+        ok = False
+    if siap_ms > args.anggaran_ms:
+        print("❌ Melebihi anggaran waktu start")
+        ok = False
+    if ok:
+        print("✅ Jalur start worker sesuai anggaran")
+    sys.exit(0 if ok else 1)
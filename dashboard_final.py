@@ -4,50 +4,33 @@
 
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
-import folium
-from streamlit_folium import st_folium
+from streamlit.components.v1 import html
 import plotly.express as px
-import plotly.graph_objects as go
-from branca.colormap import linear
+from idsd_core import DataTidakValid, service
+from idsd_core.komposit import Skenario
 
 # Konfigurasi halaman
 st.set_page_config(page_title="Dashboard IDSD NTT", layout="wide")
 
 
 # ---------------------------
-# 📂 Load Data
+# 📂 Load Data (layanan bersama idsd_core.service)
 # ---------------------------
-@st.cache_data
-def load_data():
-    try:
-        # Load data lengkap dengan semua indikator
-        df_2023 = pd.read_csv("data_2023_lengkap.csv")
-        df_2024 = pd.read_csv("data_2024_lengkap.csv")
-        return df_2023, df_2024
-    except FileNotFoundError:
-        st.error("❌ File CSV lengkap tidak ditemukan. Jalankan script extract data terlebih dahulu!")
-        st.stop()
-
-
-df_2023, df_2024 = load_data()
-
-
-# ---------------------------
-# 🗺️ Load GeoJSON
-# ---------------------------
-@st.cache_resource
-def load_geojson():
-    try:
-        gdf = gpd.read_file("NTT_Kabupaten_All.geojson")
-        gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-        return gdf
-    except FileNotFoundError:
-        st.error("❌ File GeoJSON tidak ditemukan: NTT_Kabupaten_All.geojson")
-        st.stop()
-
+# Panel skor & geometri di-cache sekali per proses untuk semua dashboard,
+# dikunci versi dataset; lihat build_store.py dan build_geometry.py
+try:
+    panel = service.get_panel()
+    agregat = service.get_agregat()
+    service.get_fitur_peta(zoom=7)
+except FileNotFoundError as e:
+    st.error(f"❌ Data tidak ditemukan: {e}")
+    st.stop()
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
+    st.stop()
 
-gdf = load_geojson()
+# Tahun = partisi store yang ada; data satu tahun dimuat saat tahun itu dipilih
+daftar_tahun = service.daftar_tahun()
 
 # ---------------------------
 # 📋 Mapping Nama Pilar
@@ -79,17 +62,13 @@ st.markdown("**Indeks Daya Saing Daerah (IDSD)** - Analisis 12 Pilar dengan Deta
 col_filter1, col_filter2 = st.columns(2)
 
 with col_filter1:
-    tahun = st.selectbox("📅 Pilih Tahun:", ["2023", "2024"])
+    tahun = st.selectbox("📅 Pilih Tahun:", daftar_tahun, index=len(daftar_tahun) - 1)
 
-# Pilih dataframe berdasarkan tahun
-df_terpilih = df_2023 if tahun == "2023" else df_2024
-
-# Pastikan kolom kabupaten konsisten
-df_terpilih["kabupaten"] = df_terpilih["kabupaten"].str.upper().str.strip()
+# Frame lebar tahun terpilih (kolom sudah disamakan antar tahun)
+df_terpilih = service.get_tahun(tahun)
 
 # Ambil hanya kolom pilar utama (pilar_1 sampai pilar_12)
-kolom_pilar = [col for col in df_terpilih.columns if
-               col.startswith('pilar_') and col.split('_')[1].isdigit() and len(col.split('_')) == 2]
+kolom_pilar = panel.kolom_pilar()
 
 with col_filter2:
     indikator = st.selectbox(
@@ -99,216 +78,317 @@ with col_filter2:
     )
 
 # ---------------------------
-# 🔄 Gabung Data dengan GeoJSON
+# 🧩 Bagian halaman sebagai fragment
 # ---------------------------
-# Untuk peta, kita hanya perlu kolom kabupaten dan pilar yang dipilih
-df_map = df_terpilih[['kabupaten', indikator]].copy()
-gdf_merged = gdf.merge(df_map, on="kabupaten", how="left")
-
-# ---------------------------
-# 🎨 Buat Colormap
-# ---------------------------
-gdf_merged[indikator] = pd.to_numeric(gdf_merged[indikator], errors="coerce")
-gdf_with_data = gdf_merged.dropna(subset=[indikator])
-
-if len(gdf_with_data) == 0:
-    st.error(f"❌ Tidak ada data valid untuk: {nama_pilar.get(indikator, indikator)}")
-    st.stop()
-
-vmin = gdf_with_data[indikator].min()
-vmax = gdf_with_data[indikator].max()
-if vmin == vmax:
-    vmax = vmin + 0.01
+# Widget di dalam satu bagian (mode peta, pilihan kabupaten/indikator detail)
+# hanya menjalankan ulang bagian itu, bukan seluruh script. Ganti tahun/pilar
+# di atas tetap menjalankan semua bagian karena semuanya bergantung padanya.
 
-colormap = linear.YlGnBu_09.scale(vmin, vmax).to_step(n=10)
-colormap.caption = f"Skor {nama_pilar.get(indikator, indikator)} ({tahun})"
 
 # ---------------------------
-# 🗺️ Buat Peta Folium
+# 🗺️ Peta (HTML jadi dari cache LRU, tidak mengembalikan state interaksi)
 # ---------------------------
-m = folium.Map(location=[-8.6, 121.1], zoom_start=7, tiles="CartoDB positron")
-
-folium.GeoJson(
-    gdf_merged,
-    name="IDSD NTT",
-    style_function=lambda x: {
-        "fillColor": colormap(x["properties"][indikator])
-        if x["properties"].get(indikator) is not None
-        else "#d3d3d3",
-        "color": "black",
-        "weight": 1,
-        "fillOpacity": 0.7,
-    },
-    tooltip=folium.features.GeoJsonTooltip(
-        fields=["kabupaten", indikator],
-        aliases=["Kabupaten/Kota:", f"{nama_pilar.get(indikator, indikator)}:"],
-        localize=True,
-    ),
-).add_to(m)
-
-colormap.add_to(m)
+@st.fragment
+def bagian_peta(tahun, indikator):
+    # Interaktif: geometri + nilai semua pilar × tahun dikirim sekali, pilar/tahun
+    # diganti langsung di browser. Statis: satu peta Folium per pilihan.
+    # Kecamatan: batas kecamatan sebagai vector tile, hanya tile yang terlihat diminta.
+    # Semuanya iframe HTML biasa, jadi pan/zoom/klik tidak memicu rerun.
+    mode_peta = st.radio(
+        "🗺️ Mode Peta", ["Interaktif (ganti di peta)", "Statis", "Kecamatan (vector tile)"], horizontal=True
+    )
+    if mode_peta == "Statis":
+        st.subheader(f"🗺️ Peta {nama_pilar.get(indikator, indikator)} - Tahun {tahun}")
+        map_html = service.peta_html(tahun, indikator, nama_pilar.get(indikator, indikator))
+    elif mode_peta == "Kecamatan (vector tile)":
+        st.subheader(f"🗺️ Peta Kecamatan {nama_pilar.get(indikator, indikator)} - Tahun {tahun}")
+        try:
+            map_html = service.peta_kecamatan_html(tahun, indikator, nama_pilar.get(indikator, indikator))
+        except FileNotFoundError as e:
+            st.warning(f"⚠️ Vector tile kecamatan belum tersedia: {e}")
+            return
+        st.caption("Kecamatan diwarnai skor kabupaten induknya; klik wilayah untuk detail.")
+    else:
+        st.subheader("🗺️ Peta Pilar IDSD (pilih pilar & tahun di pojok kanan atas peta)")
+        map_html = service.peta_klien_html(kolom_pilar, label=nama_pilar)
+    html(map_html, width=900, height=550)
+
 
 # ---------------------------
-# 📊 Layout Dashboard - Peta & Tabel
+# 📋 Tabel Skor Pilar
 # ---------------------------
-st.markdown("---")
-
-col1, col2 = st.columns([2, 1])
-
-with col1:
-    st.subheader(f"🗺️ Peta {nama_pilar.get(indikator, indikator)} - Tahun {tahun}")
-    st_folium(m, width=900, height=550)
-
-with col2:
+@st.fragment
+def bagian_tabel(df_terpilih):
     st.subheader("📋 Tabel Skor Pilar")
     df_display = df_terpilih[['kabupaten'] + kolom_pilar].sort_values('kabupaten')
     st.dataframe(df_display, use_container_width=True, height=550)
 
+
 # ---------------------------
 # 📈 Grafik Ranking Pilar
 # ---------------------------
-st.markdown("---")
-st.subheader(f"📊 Ranking {nama_pilar.get(indikator, indikator)} per Kabupaten/Kota ({tahun})")
-
-df_sorted = df_terpilih[['kabupaten', indikator]].sort_values(by=indikator, ascending=False)
-
-fig_pilar = px.bar(
-    df_sorted,
-    x="kabupaten",
-    y=indikator,
-    color=indikator,
-    color_continuous_scale="YlGnBu",
-    title=f"Skor {nama_pilar.get(indikator, indikator)} - Tahun {tahun}",
-    labels={indikator: nama_pilar.get(indikator, indikator), "kabupaten": "Kabupaten/Kota"}
-)
-fig_pilar.update_layout(
-    xaxis_tickangle=-45,
-    height=500,
-    showlegend=False
-)
-st.plotly_chart(fig_pilar, use_container_width=True)
+@st.fragment
+def bagian_ranking(tahun, indikator):
+    st.subheader(f"📊 Ranking {nama_pilar.get(indikator, indikator)} per Kabupaten/Kota ({tahun})")
+
+    # Urutan ranking sudah dihitung di kubus agregat (idsd_core/agregat.py)
+    df_sorted = agregat.ranking(tahun, indikator)[['kabupaten', indikator]]
+
+    fig_pilar = px.bar(
+        df_sorted,
+        x="kabupaten",
+        y=indikator,
+        color=indikator,
+        color_continuous_scale="YlGnBu",
+        title=f"Skor {nama_pilar.get(indikator, indikator)} - Tahun {tahun}",
+        labels={indikator: nama_pilar.get(indikator, indikator), "kabupaten": "Kabupaten/Kota"}
+    )
+    fig_pilar.update_layout(
+        xaxis_tickangle=-45,
+        height=500,
+        showlegend=False
+    )
+    st.plotly_chart(fig_pilar, use_container_width=True)
+
 
 # ---------------------------
 # 📊 Detail Indikator per Pilar
 # ---------------------------
-st.markdown("---")
-st.subheader(f"🔍 Detail Indikator: {nama_pilar.get(indikator, indikator)}")
-
-# Ambil kolom indikator yang sesuai dengan pilar terpilih
-kolom_indikator = [col for col in df_terpilih.columns if col.startswith(f"{indikator}_")]
-
-if len(kolom_indikator) > 0:
-    # Tab untuk memilih kabupaten
-    tab_mode = st.radio("Pilih Mode Tampilan:", ["Per Kabupaten", "Per Indikator"], horizontal=True)
-
-    if tab_mode == "Per Kabupaten":
-        # Pilih kabupaten
-        kabupaten_terpilih = st.selectbox("Pilih Kabupaten:", sorted(df_terpilih['kabupaten'].unique()))
-
-        # Ambil data kabupaten
-        data_kab = df_terpilih[df_terpilih['kabupaten'] == kabupaten_terpilih].iloc[0]
-
-        # Buat dataframe untuk indikator
-        indikator_data = []
-        for col in kolom_indikator:
-            # Parse nama indikator dari nama kolom
-            parts = col.split('_', 2)
-            if len(parts) >= 3:
-                nama_ind = parts[2].replace('_', ' ')
-            else:
-                nama_ind = col
-
-            nilai = data_kab[col]
-            indikator_data.append({'Indikator': nama_ind, 'Nilai': nilai})
-
-        df_indikator = pd.DataFrame(indikator_data)
-
-        # Tampilkan dalam 2 kolom
-        col_detail1, col_detail2 = st.columns(2)
-
-        with col_detail1:
-            st.markdown(f"### 📍 {kabupaten_terpilih}")
-            st.markdown(f"**Skor {nama_pilar.get(indikator, indikator)}:** `{data_kab[indikator]:.2f}`")
-
-            # Tabel indikator
-            st.dataframe(df_indikator, use_container_width=True, height=400)
-
-        with col_detail2:
-            # Grafik radar/bar untuk indikator
-            fig_detail = go.Figure()
-
-            fig_detail.add_trace(go.Bar(
-                x=df_indikator['Nilai'],
-                y=df_indikator['Indikator'],
-                orientation='h',
-                marker=dict(color=df_indikator['Nilai'], colorscale='YlGnBu')
-            ))
-
-            fig_detail.update_layout(
-                title=f"Detail Indikator - {kabupaten_terpilih}",
-                xaxis_title="Nilai",
-                yaxis_title="Indikator",
-                height=500,
-                showlegend=False
+@st.fragment
+def bagian_detail(tahun, indikator, df_terpilih, kolom_indikator):
+    st.subheader(f"🔍 Detail Indikator: {nama_pilar.get(indikator, indikator)}")
+
+    if len(kolom_indikator) > 0:
+        # Tab untuk memilih kabupaten
+        tab_mode = st.radio("Pilih Mode Tampilan:", ["Per Kabupaten", "Per Indikator"], horizontal=True)
+
+        if tab_mode == "Per Kabupaten":
+            # Pilih kabupaten dengan klik di peta: titik klik -> kabupaten lewat STRtree
+            # (idsd_core/spasial.py), hanya fragment ini yang dijalankan ulang
+            from streamlit_folium import st_folium
+
+            daftar_kab = sorted(df_terpilih['kabupaten'].unique())
+            if st.session_state.get("kabupaten_detail") not in daftar_kab:
+                st.session_state["kabupaten_detail"] = daftar_kab[0]
+
+            def pilih_dari_klik():
+                # Callback: jalan sebelum fragment dirender ulang, jadi highlight langsung ikut
+                titik = (st.session_state.get("peta_klik_detail") or {}).get("last_clicked")
+                if not titik:
+                    return
+                kab_klik = service.cari_kabupaten(titik["lat"], titik["lng"])
+                st.session_state["klik_di_luar"] = kab_klik not in daftar_kab
+                if kab_klik in daftar_kab:
+                    st.session_state["kabupaten_detail"] = kab_klik
+
+            st.caption("🖱️ Klik kabupaten/kota di peta untuk melihat detail indikatornya.")
+            st_folium(
+                service.peta_objek(
+                    tahun, indikator, nama_pilar.get(indikator, indikator),
+                    highlight=[st.session_state["kabupaten_detail"]],
+                ),
+                width=900,
+                height=350,
+                returned_objects=["last_clicked"],
+                key="peta_klik_detail",
+                on_change=pilih_dari_klik,
             )
+            if st.session_state.pop("klik_di_luar", False):
+                st.info("ℹ️ Titik yang diklik tidak berada di kabupaten/kota dengan data tahun ini.")
+
+            kabupaten_terpilih = st.session_state["kabupaten_detail"]
+
+            # Ambil data kabupaten
+            data_kab = df_terpilih[df_terpilih['kabupaten'] == kabupaten_terpilih].iloc[0]
+
+            # Buat dataframe untuk indikator
+            indikator_data = []
+            for col in kolom_indikator:
+                # Parse nama indikator dari nama kolom
+                parts = col.split('_', 2)
+                if len(parts) >= 3:
+                    nama_ind = parts[2].replace('_', ' ')
+                else:
+                    nama_ind = col
+
+                nilai = data_kab[col]
+                indikator_data.append({'Indikator': nama_ind, 'Nilai': nilai})
+
+            df_indikator = pd.DataFrame(indikator_data)
+
+            # Tampilkan dalam 2 kolom
+            col_detail1, col_detail2 = st.columns(2)
+
+            with col_detail1:
+                st.markdown(f"### 📍 {kabupaten_terpilih}")
+                st.markdown(f"**Skor {nama_pilar.get(indikator, indikator)}:** `{data_kab[indikator]:.2f}`")
+
+                # Tabel indikator
+                st.dataframe(df_indikator, use_container_width=True, height=400)
+
+            with col_detail2:
+                # graph_objects hanya diimpor bila mode ini benar-benar dirender
+                import plotly.graph_objects as go
+
+                # Grafik radar/bar untuk indikator
+                fig_detail = go.Figure()
+
+                fig_detail.add_trace(go.Bar(
+                    x=df_indikator['Nilai'],
+                    y=df_indikator['Indikator'],
+                    orientation='h',
+                    marker=dict(color=df_indikator['Nilai'], colorscale='YlGnBu')
+                ))
+
+                fig_detail.update_layout(
+                    title=f"Detail Indikator - {kabupaten_terpilih}",
+                    xaxis_title="Nilai",
+                    yaxis_title="Indikator",
+                    height=500,
+                    showlegend=False
+                )
+
+                st.plotly_chart(fig_detail, use_container_width=True)
+
+        else:  # Per Indikator
+            # Pilih indikator
+            indikator_detail = st.selectbox("Pilih Indikator:", kolom_indikator,
+                                            format_func=lambda x: x.split('_', 2)[2].replace('_', ' ') if len(
+                                                x.split('_', 2)) >= 3 else x)
+
+            # Nama indikator untuk tampilan
+            nama_ind = indikator_detail.split('_', 2)[2].replace('_', ' ') if len(
+                indikator_detail.split('_', 2)) >= 3 else indikator_detail
+
+            # Data indikator untuk semua kabupaten
+            df_ind_all = agregat.ranking(tahun, indikator_detail)[['kabupaten', indikator_detail]]
+
+            col_ind1, col_ind2 = st.columns(2)
+
+            with col_ind1:
+                st.markdown(f"### 📊 {nama_ind}")
+                st.dataframe(df_ind_all, use_container_width=True, height=500)
+
+            with col_ind2:
+                # Grafik ranking indikator
+                fig_ind = px.bar(
+                    df_ind_all,
+                    x='kabupaten',
+                    y=indikator_detail,
+                    color=indikator_detail,
+                    color_continuous_scale='YlGnBu',
+                    title=f"Ranking: {nama_ind}"
+                )
+                fig_ind.update_layout(
+                    xaxis_tickangle=-45,
+                    height=500,
+                    showlegend=False
+                )
+                st.plotly_chart(fig_ind, use_container_width=True)
+
+    else:
+        st.info("ℹ️ Detail indikator tidak tersedia untuk pilar ini.")
 
-            st.plotly_chart(fig_detail, use_container_width=True)
 
-    else:  # Per Indikator
-        # Pilih indikator
-        indikator_detail = st.selectbox("Pilih Indikator:", kolom_indikator,
-                                        format_func=lambda x: x.split('_', 2)[2].replace('_', ' ') if len(
-                                            x.split('_', 2)) >= 3 else x)
+# ---------------------------
+# 🧪 Simulasi What-If
+# ---------------------------
+@st.fragment
+def bagian_skenario(tahun, indikator, df_terpilih):
+    st.subheader(f"🧪 Simulasi What-If: {nama_pilar.get(indikator, indikator)}")
+    st.caption(
+        "Ubah nilai indikator satu kabupaten dan lihat skor pilar, skor IDSD (rata-rata 12 pilar), "
+        "dan peringkatnya berubah langsung. Titik awal = skor rilis; perubahan indikator dihitung ulang "
+        "(idsd_core/komposit.py) dan ditambahkan sebagai selisih."
+    )
 
-        # Nama indikator untuk tampilan
-        nama_ind = indikator_detail.split('_', 2)[2].replace('_', ' ') if len(
-            indikator_detail.split('_', 2)) >= 3 else indikator_detail
+    # Skenario per sesi: hanya nilai yang diubah; kubus dasar dibagi semua sesi
+    mesin = service.get_komposit()
+    skenario = st.session_state.get("skenario")
+    if skenario is None or skenario.mesin is not mesin:
+        skenario = st.session_state["skenario"] = Skenario(mesin)
+
+    kab = st.selectbox("Kabupaten yang disimulasikan:", sorted(df_terpilih['kabupaten']), key="kabupaten_skenario")
+    kolom = [c for c in panel.kolom_indikator(indikator) if pd.notna(skenario.nilai(tahun, kab, c))]
+    if not kolom:
+        st.info("ℹ️ Kabupaten ini tidak memiliki nilai indikator untuk pilar terpilih.")
+        return
+
+    col_slider, col_hasil = st.columns([3, 2])
+    with col_slider:
+        for c in kolom:
+            kunci = f"skenario_{tahun}_{kab}_{c}"
+            nilai = st.slider(
+                c.split('_', 2)[2], 0.0, 5.0, float(skenario.nilai(tahun, kab, c)), 0.01, key=kunci
+            )
+            # Hanya indikator yang berubah yang dihitung ulang (satu pilar, satu kabupaten)
+            if nilai != skenario.nilai(tahun, kab, c):
+                skenario.atur(tahun, kab, c, nilai)
+        def kembalikan():
+            skenario.reset(tahun, kab)
+            for c in kolom:
+                st.session_state.pop(f"skenario_{tahun}_{kab}_{c}", None)
+
+        st.button("↩️ Kembalikan ke data rilis", on_click=kembalikan)
+
+    with col_hasil:
+        skor = skenario.skor(tahun, kab)
+        for k, judul in [(indikator, f"Skor {nama_pilar.get(indikator, indikator)}"), ("idsd", "Skor IDSD")]:
+            baru, lama, n = skenario.peringkat(tahun, kab, k)
+            dasar, hasil = skor.loc[k, "dasar"], skor.loc[k, "skenario"]
+            st.metric(judul, f"{hasil:.2f}", delta=f"{hasil - dasar:+.2f}" if hasil != dasar else None)
+            st.metric(
+                f"Peringkat {judul[5:]}",
+                f"{baru} / {n}" if baru else "-",
+                delta=(lama - baru) if baru and lama != baru else None,
+            )
+        st.caption(f"🧩 {len(skenario.ubah)} nilai indikator diubah di sesi ini")
 
-        # Data indikator untuk semua kabupaten
-        df_ind_all = df_terpilih[['kabupaten', indikator_detail]].sort_values(by=indikator_detail, ascending=False)
 
-        col_ind1, col_ind2 = st.columns(2)
+# ---------------------------
+# 📈 Statistik Deskriptif
+# ---------------------------
+@st.fragment
+def bagian_statistik(tahun, indikator):
+    st.subheader("📈 Statistik Deskriptif")
 
-        with col_ind1:
-            st.markdown(f"### 📊 {nama_ind}")
-            st.dataframe(df_ind_all, use_container_width=True, height=500)
+    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+    stat = agregat.statistik(tahun, indikator)
 
-        with col_ind2:
-            # Grafik ranking indikator
-            fig_ind = px.bar(
-                df_ind_all,
-                x='kabupaten',
-                y=indikator_detail,
-                color=indikator_detail,
-                color_continuous_scale='YlGnBu',
-                title=f"Ranking: {nama_ind}"
-            )
-            fig_ind.update_layout(
-                xaxis_tickangle=-45,
-                height=500,
-                showlegend=False
-            )
-            st.plotly_chart(fig_ind, use_container_width=True)
+    with col_stat1:
+        st.metric("📈 Nilai Tertinggi", f"{stat['max']:.2f}")
+    with col_stat2:
+        st.metric("📉 Nilai Terendah", f"{stat['min']:.2f}")
+    with col_stat3:
+        st.metric("📊 Rata-rata", f"{stat['mean']:.2f}")
+    with col_stat4:
+        st.metric("🎯 Median", f"{stat['median']:.2f}")
 
-else:
-    st.info("ℹ️ Detail indikator tidak tersedia untuk pilar ini.")
 
 # ---------------------------
-# 📊 Statistik Deskriptif
+# 📊 Layout Dashboard
 # ---------------------------
+# Ambil kolom indikator yang sesuai dengan pilar terpilih
+kolom_indikator = [col for col in panel.kolom_indikator(indikator) if df_terpilih[col].notna().any()]
+
+st.markdown("---")
+col1, col2 = st.columns([2, 1])
+with col1:
+    bagian_peta(tahun, indikator)
+with col2:
+    bagian_tabel(df_terpilih)
+
 st.markdown("---")
-st.subheader("📈 Statistik Deskriptif")
+bagian_ranking(tahun, indikator)
 
-col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+st.markdown("---")
+bagian_detail(tahun, indikator, df_terpilih, kolom_indikator)
+
+st.markdown("---")
+bagian_skenario(tahun, indikator, df_terpilih)
 
-with col_stat1:
-    st.metric("📈 Nilai Tertinggi", f"{df_terpilih[indikator].max():.2f}")
-with col_stat2:
-    st.metric("📉 Nilai Terendah", f"{df_terpilih[indikator].min():.2f}")
-with col_stat3:
-    st.metric("📊 Rata-rata", f"{df_terpilih[indikator].mean():.2f}")
-with col_stat4:
-    st.metric("🎯 Median", f"{df_terpilih[indikator].median():.2f}")
+st.markdown("---")
+bagian_statistik(tahun, indikator)
 
 # Info di sidebar
 with st.sidebar:
@@ -317,6 +397,12 @@ with st.sidebar:
     st.metric("Total Pilar", len(kolom_pilar))
     st.metric("Total Indikator", len(kolom_indikator))
 
+    cache_info = service.cache_peta.statistik()
+    st.caption(
+        f"🧠 Cache peta: {cache_info['entri']} entri, {cache_info['bytes'] / 1024:.0f} KB, "
+        f"hit {cache_info['hit']} / miss {cache_info['miss']}"
+    )
+
     st.markdown("---")
     st.markdown("### 📌 12 Pilar IDSD:")
     for i, (key, val) in enumerate(nama_pilar.items(), 1):
@@ -327,10 +413,10 @@ with st.sidebar:
 # ---------------------------
 st.markdown("---")
 st.markdown(
-    """
+    f"""
     ### 📌 Catatan:
     - **Sumber Data**: Indeks Daya Saing Daerah (IDSD) Nusa Tenggara Timur
-    - **Tahun Data**: 2023 dan 2024
+    - **Tahun Data**: {', '.join(daftar_tahun)}
     - **Jumlah Kabupaten/Kota**: 22
     - **Jumlah Pilar IDSD**: 12
     - **Kabupaten berwarna abu-abu di peta**: Tidak memiliki data untuk indikator terpilih
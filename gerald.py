@@ -3,13 +3,9 @@
 # =======================================
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
-import folium
-from streamlit_folium import st_folium
+from streamlit.components.v1 import html
 import plotly.express as px
-import plotly.graph_objects as go
-from branca.colormap import linear
-from io import BytesIO
+from idsd_core import DataTidakValid, service
 
 # ===== Config halaman =====
 st.set_page_config(
@@ -21,41 +17,28 @@ st.set_page_config(
 # ===== Tema =====
 theme = st.sidebar.radio("🎨 Tema Dashboard", ["Light", "Dark"], index=0)
 
-# ===== Load Data =====
-@st.cache_data
-def load_data():
-    try:
-        df_2023 = pd.read_csv("data/idsd_data_2023_lengkap.csv")
-        df_2024 = pd.read_csv("data/idsd_data_2024.csv")
-        return df_2023, df_2024
-    except FileNotFoundError:
-        st.error("❌ File data tidak ditemukan di folder /data.")
-        st.stop()
-
-df_2023, df_2024 = load_data()
-
-# ===== Load GeoJSON =====
-@st.cache_resource
-def load_geojson():
-    try:
-        gdf = gpd.read_file("data/geojson_kabupaten.geojson")
-        gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-        return gdf
-    except Exception as e:
-        st.error(f"❌ Gagal memuat GeoJSON: {e}")
-        st.stop()
-
-gdf = load_geojson()
+# ===== Load Data (layanan bersama idsd_core.service) =====
+try:
+    panel = service.get_panel()
+    service.get_fitur_peta(zoom=7)
+except FileNotFoundError as e:
+    st.error(f"❌ Data tidak ditemukan: {e}")
+    st.stop()
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
+    st.stop()
+
+daftar_tahun = service.daftar_tahun()
 
 # ===== Nama Pilar =====
 nama_pilar = {f"pilar_{i}": f"Pilar {i}" for i in range(1, 13)}
 
 # ===== Sidebar Filter =====
 st.sidebar.header("📌 Filter Dashboard")
-tahun_sel = st.sidebar.multiselect("📅 Tahun", ["2023", "2024"], default=["2023", "2024"])
+tahun_sel = st.sidebar.multiselect("📅 Tahun", daftar_tahun, default=daftar_tahun[-2:])
 kab_sel = st.sidebar.multiselect(
     "🏛 Kabupaten/Kota",
-    sorted(df_2023["kabupaten"].unique()),
+    ["Semua"] + sorted(panel.kabupaten),
     default=["Semua"]
 )
 indikator = st.sidebar.selectbox(
@@ -64,58 +47,32 @@ indikator = st.sidebar.selectbox(
     format_func=lambda x: nama_pilar.get(x, x)
 )
 
-# ===== Fungsi Merge Data =====
-def merge_data(tahun):
-    df = df_2023 if tahun == "2023" else df_2024
-    df["kabupaten"] = df["kabupaten"].str.upper().str.strip()
-    df_map = df[["kabupaten", indikator]].copy()
-    gdf_merged = gdf.merge(df_map, on="kabupaten", how="left")
-    gdf_merged[indikator] = pd.to_numeric(gdf_merged[indikator], errors="coerce")
-    return gdf_merged, df
+# ===== Fungsi Data per Tahun =====
+def data_tahun(tahun):
+    df = service.get_tahun(tahun)
+    return df[indikator], df
 
 # ===== Tabs per Tahun =====
 tabs = st.tabs(tahun_sel)
 for i, tahun in enumerate(tahun_sel):
     with tabs[i]:
-        gdf_merged, df_terpilih = merge_data(tahun)
+        nilai_peta, df_terpilih = data_tahun(tahun)
 
-        # ===== Colormap =====
-        vmin, vmax = gdf_merged[indikator].min(), gdf_merged[indikator].max()
-        if pd.isna(vmin) or pd.isna(vmax):
+        if nilai_peta.isna().all():
             st.warning(f"Tidak ada data {nama_pilar.get(indikator)} untuk {tahun}.")
             continue
-        if vmin == vmax:
-            vmax = vmin + 0.01
-        colormap = linear.YlGnBu_09.scale(vmin, vmax).to_step(n=10)
-        colormap.caption = f"{nama_pilar.get(indikator, indikator)} ({tahun})"
-
-        # ===== Peta Interaktif =====
-        def style_function(feature):
-            val = feature["properties"].get(indikator)
-            base_color = colormap(val) if val is not None else "#d3d3d3"
-            if kab_sel != ["Semua"] and feature["properties"]["kabupaten"] in kab_sel:
-                base_color = "#ff6600"
-            return {"fillColor": base_color, "color": "black", "weight": 1, "fillOpacity": 0.7}
-
-        m = folium.Map(
-            location=[-8.6, 121.1],
-            zoom_start=7,
-            tiles="CartoDB positron" if theme == "Light" else "CartoDB dark_matter"
-        )
 
-        folium.GeoJson(
-            gdf_merged,
-            style_function=style_function,
-            tooltip=folium.features.GeoJsonTooltip(
-                fields=["kabupaten", indikator],
-                aliases=["Kabupaten/Kota:", f"{nama_pilar.get(indikator, indikator)}:"],
-                localize=True,
-            ),
-        ).add_to(m)
-        colormap.add_to(m)
+        # ===== Peta Interaktif (HTML jadi dari cache LRU per state tampilan) =====
+        map_html = service.peta_html(
+            tahun,
+            indikator,
+            nama_pilar.get(indikator, indikator),
+            highlight=kab_sel if kab_sel != ["Semua"] else [],
+            tema=theme,
+        )
 
         st.subheader(f"🗺️ Peta {nama_pilar.get(indikator)} - Tahun {tahun}")
-        st_folium(m, width=900, height=550)
+        html(map_html, width=900, height=550)
 
         # ===== Ranking Chart =====
         st.subheader("📊 Ranking Kabupaten/Kota")
@@ -134,46 +91,126 @@ for i, tahun in enumerate(tahun_sel):
             color_continuous_scale="YlGnBu",
         )
         fig_rank.update_layout(xaxis_tickangle=-45, height=500, showlegend=False)
-        st.plotly_chart(fig_rank, use_container_width=True)
+        st.plotly_chart(fig_rank, use_container_width=True, key=f"ranking_{tahun}")
 
-        # ===== Radar Chart =====
+        # ===== Radar Chart (jejak per kabupaten di-cache per versi dataset) =====
         st.subheader("📈 Radar Chart 12 Pilar")
-        df_radar = df_terpilih.set_index("kabupaten")[[f"pilar_{i}" for i in range(1, 13)]]
-        if "Semua" not in kab_sel:
-            df_radar = df_radar.loc[kab_sel]
-        fig_radar = go.Figure()
-        for idx, row in df_radar.iterrows():
-            fig_radar.add_trace(
-                go.Scatterpolar(
-                    r=row.values,
-                    theta=list(nama_pilar.values()),
-                    fill="toself",
-                    name=idx,
-                )
+        if not kab_sel:
+            st.info("ℹ️ Pilih minimal satu kabupaten/kota (atau Semua) untuk radar & profil.")
+            continue
+        profil = service.get_profil()
+        kab_radar = None if "Semua" in kab_sel else kab_sel
+        fig_radar = profil.radar(tahun, kab_radar, label=list(nama_pilar.values()))
+        st.plotly_chart(fig_radar, use_container_width=True, key=f"radar_{tahun}")
+
+        # ===== Kartu Profil Kabupaten =====
+        st.subheader("🪪 Profil Kabupaten/Kota")
+        if kab_radar is None:
+            df_profil = profil.frame(tahun)
+            df_profil["terkuat"] = df_profil["terkuat"].map(nama_pilar)
+            df_profil["terlemah"] = df_profil["terlemah"].map(nama_pilar)
+            st.dataframe(
+                df_profil,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "rata": st.column_config.NumberColumn("Rata-rata 12 Pilar", format="%.2f"),
+                    "peringkat": st.column_config.NumberColumn("Peringkat", format="%d"),
+                    "delta_peringkat": st.column_config.NumberColumn("Δ Peringkat", format="%+d"),
+                    "terkuat": "Pilar Terkuat",
+                    "terlemah": "Pilar Terlemah",
+                },
             )
-        fig_radar.update_layout(
-            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-            showlegend=True,
-            height=550,
+        else:
+            kolom_kartu = st.columns(min(len(kab_radar), 4))
+            for j, kab in enumerate(kab_radar):
+                kartu = profil.kartu(tahun, kab)
+                with kolom_kartu[j % len(kolom_kartu)]:
+                    if pd.isna(kartu["rata"]):
+                        st.metric(kab, "–")
+                        st.caption(f"Tidak ada skor pilar untuk {tahun}.")
+                        continue
+                    delta = kartu["delta_peringkat_rata"]
+                    st.metric(
+                        kab,
+                        f"{kartu['rata']:.2f}",
+                        delta=f"{delta:+.0f} peringkat" if pd.notna(delta) else None,
+                    )
+                    st.caption(
+                        f"Peringkat {kartu['peringkat_rata']:.0f}/{kartu['jumlah_kabupaten']} · "
+                        f"💪 {nama_pilar[kartu['terkuat']]} · 🔧 {nama_pilar[kartu['terlemah']]}"
+                    )
+
+# ===== Tren & Proyeksi (regresi semua seri sekaligus, cache per versi data) =====
+@st.fragment
+def bagian_tren(indikator, kabupaten):
+    st.markdown("---")
+    st.subheader(f"📈 Tren & Proyeksi {nama_pilar.get(indikator, indikator)}")
+    tren = service.get_tren()
+    if len(tren.tahun) < 2:
+        st.info("ℹ️ Tren butuh data minimal dua tahun.")
+        return
+
+    df_tren = tren.ringkas(indikator)
+    if "Semua" not in kabupaten:
+        df_tren = df_tren[df_tren["kabupaten"].isin(kabupaten)]
+
+    # Arah rata-rata provinsi per pilar (panah dari tanda delta)
+    provinsi = tren.provinsi(panel.kolom_pilar())
+    kolom_metrik = st.columns(6)
+    for j, (pilar, terakhir, per_tahun) in enumerate(
+        zip(provinsi.index, provinsi["terakhir"], provinsi["per_tahun"])
+    ):
+        kolom_metrik[j % 6].metric(
+            nama_pilar.get(pilar, pilar),
+            f"{terakhir:.2f}",
+            delta=f"{per_tahun:+.2f}/thn" if pd.notna(per_tahun) else None,
         )
-        st.plotly_chart(fig_radar, use_container_width=True)
-
-        # ===== Download Excel =====
-        st.subheader("💾 Download Data Filtered")
-        def to_excel(df):
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                df.to_excel(writer, index=False, sheet_name="Data")
-            return output.getvalue()
 
-        excel_data = to_excel(df_terpilih)
+    kolom_proyeksi = {
+        f"proyeksi_{t}": st.column_config.NumberColumn(f"Proyeksi {t}", format="%.2f")
+        for t in tren.tahun_proyeksi
+    }
+    st.dataframe(
+        df_tren,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "kabupaten": "Kabupaten/Kota",
+            "arah": "Arah",
+            "per_tahun": st.column_config.NumberColumn("Δ/tahun", format="%+.2f"),
+            "r2": st.column_config.NumberColumn("R²", format="%.2f"),
+            "seri": st.column_config.LineChartColumn(
+                f"Tren {tren.tahun[0]}–{tren.tahun[-1]}", y_min=0, y_max=5
+            ),
+            **kolom_proyeksi,
+        },
+    )
+
+
+bagian_tren(indikator, kab_sel)
+
+# ===== Download Excel (dibuat hanya saat diminta, cache per versi data + filter) =====
+@st.fragment
+def bagian_ekspor(tahun_list, kabupaten):
+    st.subheader("💾 Download Data Filtered")
+    if not tahun_list:
+        st.info("ℹ️ Pilih minimal satu tahun untuk ekspor.")
+        return
+    kunci = (tuple(tahun_list), tuple(kabupaten))
+    if st.button("📦 Siapkan File Excel"):
+        st.session_state["ekspor_siap"] = kunci
+    if st.session_state.get("ekspor_siap") == kunci:
         st.download_button(
             "📥 Download Data Excel",
-            excel_data,
-            file_name=f"IDSD_NTT_{tahun}.xlsx",
-            mime="application/vnd.ms-excel",
+            service.ekspor_excel(tahun_list, kabupaten),
+            file_name=f"IDSD_NTT_{'_'.join(tahun_list)}.xlsx",
+            mime=service.MIME_XLSX,
         )
 
+
+bagian_ekspor(tahun_sel, kab_sel)
+
 # ===== Statistik Deskriptif =====
 st.markdown("---")
 st.subheader("📊 Statistik Deskriptif Pilar Terpilih")
@@ -0,0 +1,24 @@
+# =======================================
+# 📦 idsd_core - lapisan data bersama Dashboard IDSD NTT
+# =======================================
+from idsd_core.store import (
+    FOLDER_STORE,
+    SUMBER_CSV,
+    build_store,
+    dataset_version,
+    load_table,
+    load_tahun,
+    skema_tahun,
+)
+from idsd_core.validasi import DataTidakValid
+
+__all__ = [
+    "DataTidakValid",
+    "FOLDER_STORE",
+    "SUMBER_CSV",
+    "build_store",
+    "dataset_version",
+    "load_table",
+    "load_tahun",
+    "skema_tahun",
+]
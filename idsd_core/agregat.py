@@ -0,0 +1,91 @@
+# =======================================
+# 📈 Kubus agregat: ranking, persentil, statistik, delta
+# =======================================
+# Dihitung sekali per (versi dataset, tahun) langsung dari irisan panel
+# nilai[tahun] = [kabupaten, indikator], saat tahun itu pertama diminta.
+# View (grafik ranking, metrik Statistik Deskriptif) tinggal mengambil hasil
+# yang sudah jadi; tahun yang tidak pernah dilihat tidak dihitung.
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class KubusAgregat:
+    def __init__(self, panel):
+        self.panel = panel
+        self._per_tahun = {}
+        self._lock = threading.Lock()
+
+    def _hitung(self, tahun):
+        nilai = self.panel.irisan(tahun)  # [kabupaten, indikator]
+        with warnings.catch_warnings():
+            # Indikator tanpa data sama sekali di satu tahun -> NaN, bukan warning
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stat = {
+                "max": np.nanmax(nilai, axis=0),
+                "min": np.nanmin(nilai, axis=0),
+                "mean": np.nanmean(nilai, axis=0),
+                "median": np.nanmedian(nilai, axis=0),
+                "std": np.nanstd(nilai, axis=0, ddof=1),
+            }
+        stat["n"] = np.sum(~np.isnan(nilai), axis=0)
+
+        # Ranking semua indikator sekaligus: kabupaten jadi baris
+        datar = pd.DataFrame(nilai)
+        hasil = {
+            "stat": stat,
+            "peringkat": datar.rank(ascending=False, method="min").to_numpy(),
+            "persentil": (datar.rank(pct=True) * 100).to_numpy(),
+            # Urutan kabupaten untuk grafik ranking (terbesar dulu, NaN di akhir)
+            "urutan": np.argsort(np.where(np.isnan(nilai), np.inf, -nilai), axis=0, kind="stable"),
+        }
+        for arr in [hasil["peringkat"], hasil["persentil"], hasil["urutan"], *stat.values()]:
+            arr.flags.writeable = False
+        return hasil
+
+    def tahun(self, tahun):
+        t = self.panel._t(tahun)
+        with self._lock:
+            hasil = self._per_tahun.get(t)
+        if hasil is None:
+            hasil = self._hitung(tahun)
+            with self._lock:
+                hasil = self._per_tahun.setdefault(t, hasil)
+        return hasil
+
+    # ===== Lookup =====
+    def statistik(self, tahun, kolom):
+        i = self.panel._i(kolom)[0]
+        stat = self.tahun(tahun)["stat"]
+        return {nama: stat[nama][i] for nama in stat}
+
+    def ranking(self, tahun, kolom):
+        t, i = self.panel._t(tahun), self.panel._i(kolom)[0]
+        hasil = self.tahun(tahun)
+        urut = hasil["urutan"][:, i]
+        urut = urut[self.panel.ada[t, urut]]
+        return pd.DataFrame({
+            "kabupaten": self.panel.kabupaten[urut],
+            kolom: self.panel.irisan(tahun)[urut, i],
+            "peringkat": hasil["peringkat"][urut, i],
+            "persentil": hasil["persentil"][urut, i],
+        })
+
+    def delta(self, kolom, tahun, dari=None):
+        # Perubahan nilai & peringkat dari `dari` (default: tahun sebelumnya) ke `tahun`
+        t, i = self.panel._t(tahun), self.panel._i(kolom)[0]
+        if dari is None:
+            if t == 0:
+                raise ValueError(f"❌ Tidak ada tahun sebelum {tahun} untuk menghitung delta")
+            dari = self.panel.tahun[t - 1]
+        a = self.panel._t(dari)
+        baris = self.panel.ada[t] | self.panel.ada[a]
+        nilai = self.panel.irisan(tahun)[:, i] - self.panel.irisan(dari)[:, i]
+        peringkat = self.tahun(dari)["peringkat"][:, i] - self.tahun(tahun)["peringkat"][:, i]
+        return pd.DataFrame({
+            "kabupaten": self.panel.kabupaten[baris],
+            "delta": nilai[baris],
+            "delta_peringkat": peringkat[baris],
+        })
@@ -0,0 +1,62 @@
+# =======================================
+# 🧠 Cache LRU HTML peta yang sudah dirender
+# =======================================
+# Kunci = state tampilan (versi dataset, tahun, pilar, highlight, tema, ...).
+# Dibatasi total ukuran byte; entri paling lama tidak dipakai dibuang dulu.
+# Nilai boleh str (HTML) atau bytes (mis. file ekspor Excel).
+import threading
+from collections import OrderedDict
+
+MAKS_BYTES_DEFAULT = 64 * 1024 * 1024
+
+
+class CachePeta:
+    def __init__(self, maks_bytes=MAKS_BYTES_DEFAULT):
+        self.maks_bytes = maks_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hit = 0
+        self.miss = 0
+        self.evict = 0
+
+    def ambil(self, kunci, buat):
+        with self._lock:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hit += 1
+                return self._data[kunci][0]
+            self.miss += 1
+
+        nilai = buat()
+        ukuran = len(nilai) if isinstance(nilai, bytes) else len(nilai.encode("utf-8"))
+        with self._lock:
+            if kunci not in self._data:
+                self._data[kunci] = (nilai, ukuran)
+                self.bytes += ukuran
+            self._buang()
+        return nilai
+
+    def _buang(self):
+        # Entri tunggal yang lebih besar dari batas tetap dibuang
+        while self._data and self.bytes > self.maks_bytes:
+            _, (_, ukuran) = self._data.popitem(last=False)
+            self.bytes -= ukuran
+            self.evict += 1
+
+    def bersihkan(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def statistik(self):
+        with self._lock:
+            total = self.hit + self.miss
+            return {
+                "entri": len(self._data),
+                "bytes": self.bytes,
+                "hit": self.hit,
+                "miss": self.miss,
+                "evict": self.evict,
+                "hit_rate": self.hit / total if total else 0.0,
+            }
@@ -0,0 +1,379 @@
+# =======================================
+# 🎨 Builder choropleth satu layer
+# =======================================
+# Semua warna dihitung sekaligus (vektor NumPy) dari colormap branca, lalu
+# dikirim sebagai SATU FeatureCollection dengan properti gaya yang sudah
+# jadi. Geometri (fitur dasar) dibuat sekali per geometri dan dipakai ulang;
+# highlight kabupaten hanya mengganti properti, bukan geometri.
+import folium
+import numpy as np
+import pandas as pd
+from branca.colormap import linear
+from branca.element import MacroElement
+from folium.elements import JSCSSMixin
+from jinja2 import Template
+
+WARNA_KOSONG = "#d3d3d3"
+WARNA_HIGHLIGHT = "#ff6600"
+WARNA_DASAR = "#3388ff"
+
+PUSAT_NTT = [-8.6, 121.1]
+TILES = {"Light": "CartoDB positron", "Dark": "CartoDB dark_matter"}
+URL_VECTORGRID = "https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.js"
+
+
+# ===== Fitur dasar (geometri saja) =====
+def fitur_dasar(gdf):
+    # Dari GeoDataFrame; runtime dashboard memakai geometry.load_fitur (tanpa shapely)
+    import shapely
+
+    return [
+        {"type": "Feature", "geometry": shapely.geometry.mapping(geom), "properties": {"kabupaten": kab}}
+        for kab, geom in zip(gdf["kabupaten"], gdf.geometry.values)
+    ]
+
+
+# ===== Warna vektor =====
+def _posisi_step(nilai, index, jumlah_warna):
+    # Anak tangga tempat nilai berada; dipakai peta server maupun peta klien
+    return np.clip(np.searchsorted(index, nilai, side="right") - 1, 0, jumlah_warna - 1)
+
+
+def hitung_warna(nilai, colormap):
+    # Setara colormap(x) untuk setiap x, tapi dalam satu operasi array
+    nilai = np.asarray(nilai, dtype="float64")
+    index = np.asarray(colormap.index, dtype="float64")
+    colors = np.asarray(colormap.colors, dtype="float64")
+
+    if len(colors) == len(index):
+        # LinearColormap: interpolasi linier per kanal
+        rgba = np.column_stack([np.interp(nilai, index, colors[:, j]) for j in range(4)])
+    else:
+        # StepColormap: warna anak tangga tempat nilai berada
+        rgba = colors[_posisi_step(nilai, index, len(colors))]
+
+    byte = (np.nan_to_num(rgba) * 255.9999).astype("int64")
+    warna = np.array([f"#{r:02x}{g:02x}{b:02x}{a:02x}" for r, g, b, a in byte], dtype=object)
+    warna[np.isnan(nilai)] = WARNA_KOSONG
+    return warna
+
+
+# ===== Gaya fitur (dibaca dari properti, tanpa closure per kabupaten) =====
+def gaya_fitur(feature):
+    prop = feature["properties"]
+    if prop["_terpilih"]:
+        return {"fillColor": WARNA_HIGHLIGHT, "color": "black", "weight": 1.2, "fillOpacity": 0.75}
+    return {"fillColor": prop["_warna"], "color": "black", "weight": 1, "fillOpacity": 0.7}
+
+
+def _nilai_tooltip(kolom):
+    angka = pd.to_numeric(kolom, errors="coerce")
+    return [None if pd.isna(v) else round(float(v), 2) for v in angka]
+
+
+# ===== Layer choropleth =====
+def layer_choropleth(
+    fitur,
+    data,
+    kolom,
+    colormap=None,
+    alias=None,
+    highlight=(),
+    nama="IDSD NTT",
+    kolom_tooltip=None,
+):
+    kabupaten = [f["properties"]["kabupaten"] for f in fitur]
+    kolom_tooltip = kolom_tooltip or [kolom]
+    alias = alias or [f"{k}:" for k in kolom_tooltip]
+
+    tabel = data.drop_duplicates("kabupaten").set_index("kabupaten").reindex(kabupaten)
+    if colormap is not None:
+        warna = hitung_warna(pd.to_numeric(tabel[kolom], errors="coerce"), colormap)
+    else:
+        warna = np.full(len(kabupaten), WARNA_DASAR, dtype=object)
+    terpilih = np.isin(kabupaten, list(highlight))
+    tooltip = {k: _nilai_tooltip(tabel[k]) for k in kolom_tooltip}
+
+    features = []
+    for i, f in enumerate(fitur):
+        prop = {"kabupaten": kabupaten[i], "_warna": warna[i], "_terpilih": bool(terpilih[i])}
+        for k in kolom_tooltip:
+            prop[k] = tooltip[k][i]
+        # Geometri dipakai bersama (tidak disalin) antar render
+        features.append({"type": "Feature", "id": str(i), "geometry": f["geometry"], "properties": prop})
+
+    return folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name=nama,
+        style_function=gaya_fitur,
+        tooltip=folium.GeoJsonTooltip(
+            fields=["kabupaten"] + kolom_tooltip,
+            aliases=["Kabupaten/Kota:"] + list(alias),
+            localize=True,
+        ),
+    )
+
+
+# ===== Peta lengkap (HTML) =====
+def buat_colormap(nilai, caption, step=10):
+    nilai = pd.to_numeric(nilai, errors="coerce").dropna()
+    vmin, vmax = (nilai.min(), nilai.max()) if len(nilai) else (0.0, 1.0)
+    if vmin == vmax:
+        vmax = vmin + 0.01
+    colormap = linear.YlGnBu_09.scale(vmin, vmax)
+    if step:
+        colormap = colormap.to_step(n=step)
+    colormap.caption = caption
+    return colormap
+
+
+def buat_peta(fitur, data, kolom, label, tahun, highlight=(), tema="Light", step=10, zoom=7):
+    # Objek folium.Map (mis. untuk st_folium yang butuh state klik)
+    colormap = buat_colormap(data[kolom], f"Skor {label} ({tahun})", step)
+    m = folium.Map(location=PUSAT_NTT, zoom_start=zoom, tiles=TILES.get(tema, TILES["Light"]))
+    layer_choropleth(fitur, data, kolom, colormap, alias=[f"{label}:"], highlight=highlight).add_to(m)
+    colormap.add_to(m)
+    return m
+
+
+def render_peta(fitur, data, kolom, label, tahun, highlight=(), tema="Light", step=10, zoom=7):
+    return buat_peta(fitur, data, kolom, label, tahun, highlight, tema, step, zoom).get_root().render()
+
+
+# ===== Peta sisi klien (ganti pilar/tahun tanpa rerun) =====
+# Geometri dikirim SEKALI bersama tabel ringkas [tahun][kolom] -> nilai per
+# fitur (tooltip, dibulatkan) dan indeks anak tangga warna per fitur (dihitung
+# di server dari nilai utuh), plus ambang & warna anak tangga tiap kombinasi. Ganti
+# pilar/tahun di dropdown peta hanya mewarnai ulang layer dan legenda di
+# browser; tidak ada rerun Streamlit maupun payload peta baru.
+class KontrolPetaKlien(MacroElement):
+    _template = Template(
+        """
+{% macro script(this, kwargs) %}
+(function () {
+    var peta = {{ this._parent.get_name() }};
+    var data = {{ this.data|tojson }};
+    var state = {tahun: data.tahun_awal, kolom: data.kolom_awal};
+
+    function warna(i, skala) {
+        if (i === null || skala === null) { return data.warna_kosong; }
+        return skala.warna[i];
+    }
+
+    function gaya(fitur) {
+        var skala = data.skala[state.tahun][state.kolom];
+        var i = data.indeks[state.tahun][state.kolom][fitur.id];
+        return {fillColor: warna(i, skala), color: "black", weight: 1, fillOpacity: 0.7};
+    }
+
+    var layer = L.geoJson(data.fitur, {
+        style: gaya,
+        onEachFeature: function (fitur, lyr) {
+            lyr.bindTooltip(function () {
+                var nilai = data.nilai[state.tahun][state.kolom][fitur.id];
+                return "<b>" + fitur.properties.kabupaten + "</b><br>" + data.label[state.kolom] + ": "
+                    + (nilai === null ? "-" : nilai.toLocaleString());
+            }, {sticky: true});
+        }
+    }).addTo(peta);
+
+    var legenda = L.control({position: "bottomright"});
+    legenda.onAdd = function () {
+        this._div = L.DomUtil.create("div", "legenda-idsd");
+        this._div.style.cssText = "background:white;padding:6px 8px;border-radius:4px;font:12px sans-serif;";
+        return this._div;
+    };
+    legenda.perbarui = function () {
+        var skala = data.skala[state.tahun][state.kolom];
+        var isi = "<b>Skor " + data.label[state.kolom] + " (" + state.tahun + ")</b><br>";
+        if (skala === null) {
+            isi += "Tidak ada data";
+        } else {
+            isi += "<div style='display:flex'>";
+            for (var i = 0; i < skala.warna.length; i++) {
+                isi += "<span style='width:22px;height:10px;background:" + skala.warna[i] + "'></span>";
+            }
+            isi += "</div>" + skala.ambang[0].toFixed(1) + " &ndash; "
+                + skala.ambang[skala.ambang.length - 1].toFixed(1);
+        }
+        this._div.innerHTML = isi;
+    };
+    legenda.addTo(peta);
+
+    function pilihan(opsi, awal, label) {
+        var el = L.DomUtil.create("select");
+        el.style.cssText = "display:block;margin:2px 0;font:12px sans-serif;";
+        opsi.forEach(function (o) {
+            var op = document.createElement("option");
+            op.value = o;
+            op.text = label ? label[o] : o;
+            op.selected = o === awal;
+            el.appendChild(op);
+        });
+        return el;
+    }
+
+    var kontrol = L.control({position: "topright"});
+    kontrol.onAdd = function () {
+        var div = L.DomUtil.create("div");
+        div.style.cssText = "background:white;padding:6px;border-radius:4px;";
+        var selKolom = pilihan(data.kolom, state.kolom, data.label);
+        var selTahun = pilihan(data.daftar_tahun, state.tahun, null);
+        function ganti() {
+            state.kolom = selKolom.value;
+            state.tahun = selTahun.value;
+            layer.setStyle(gaya);
+            legenda.perbarui();
+        }
+        selKolom.onchange = ganti;
+        selTahun.onchange = ganti;
+        div.appendChild(selKolom);
+        div.appendChild(selTahun);
+        L.DomEvent.disableClickPropagation(div);
+        return div;
+    };
+    kontrol.addTo(peta);
+    legenda.perbarui();
+})();
+{% endmacro %}
+"""
+    )
+
+    def __init__(self, data):
+        super().__init__()
+        self._name = "KontrolPetaKlien"
+        self.data = data
+
+
+def _skala_step(nilai, step, nilai_fitur):
+    # -> (skala {ambang, warna} untuk legenda, indeks anak tangga per nilai_fitur).
+    # Indeks dihitung di sini dari nilai utuh, bukan di browser dari nilai tooltip
+    # yang sudah dibulatkan, supaya warnanya sama persis dengan peta server.
+    kosong = [None] * len(nilai_fitur)
+    if not pd.to_numeric(nilai, errors="coerce").notna().any():
+        return None, kosong
+    colormap = buat_colormap(nilai, "", step)
+    index = np.asarray(colormap.index, dtype="float64")
+    angka = pd.to_numeric(nilai_fitur, errors="coerce").to_numpy(dtype="float64")
+    posisi = _posisi_step(angka, index, len(index) - 1)
+    indeks = [None if np.isnan(v) else int(p) for v, p in zip(angka, posisi)]
+    # Warna tiap anak tangga = warna di ambang bawahnya (sama dengan hitung_warna)
+    skala = {"ambang": [round(float(x), 4) for x in index], "warna": list(hitung_warna(index[:-1], colormap))}
+    return skala, indeks
+
+
+def data_peta_klien(fitur, frames, kolom, label=None, step=10):
+    kabupaten = [f["properties"]["kabupaten"] for f in fitur]
+    label = label or {}
+    nilai, indeks, skala = {}, {}, {}
+    for tahun, df in frames.items():
+        tabel = df.drop_duplicates("kabupaten").set_index("kabupaten").reindex(kabupaten)
+        nilai[tahun], indeks[tahun], skala[tahun] = {}, {}, {}
+        for k in kolom:
+            nilai[tahun][k] = _nilai_tooltip(tabel[k])
+            skala[tahun][k], indeks[tahun][k] = _skala_step(df[k], step, tabel[k])
+    return {
+        "fitur": {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "id": i, "geometry": f["geometry"], "properties": {"kabupaten": kabupaten[i]}}
+                for i, f in enumerate(fitur)
+            ],
+        },
+        "daftar_tahun": list(frames),
+        "kolom": list(kolom),
+        "label": {k: label.get(k, k) for k in kolom},
+        "nilai": nilai,
+        "indeks": indeks,
+        "skala": skala,
+        "warna_kosong": WARNA_KOSONG,
+    }
+
+
+def render_peta_klien(
+    fitur, frames, kolom, label=None, tahun_awal=None, kolom_awal=None, tema="Light", step=10, zoom=7
+):
+    data = data_peta_klien(fitur, frames, kolom, label, step)
+    data["tahun_awal"] = str(tahun_awal or data["daftar_tahun"][-1])
+    data["kolom_awal"] = kolom_awal or data["kolom"][0]
+    m = folium.Map(location=PUSAT_NTT, zoom_start=zoom, tiles=TILES.get(tema, TILES["Light"]))
+    m.add_child(KontrolPetaKlien(data))
+    return m.get_root().render()
+
+
+# ===== Layer vector tile kecamatan (tile diminta sesuai layar) =====
+# Geometri tidak ikut di HTML: Leaflet.VectorGrid mengambil tile MVT dari
+# endpoint lokal (idsd_core/tiles.py) hanya untuk area & zoom yang terlihat.
+# Nilai per kecamatan dicari lewat properti tile `kunci` (default kabupaten
+# induk, karena skor IDSD tingkat kabupaten) lalu diwarnai dengan anak tangga
+# yang sama seperti layer choropleth biasa.
+class LayerVektorKecamatan(JSCSSMixin):
+    _template = Template(
+        """
+{% macro script(this, kwargs) %}
+(function () {
+    var peta = {{ this._parent.get_name() }};
+    var data = {{ this.data|tojson }};
+
+    function warna(i, skala) {
+        if (i === undefined || i === null || skala === null) { return data.warna_kosong; }
+        return skala.warna[i];
+    }
+
+    var gaya = {};
+    gaya[data.layer] = function (prop, zoom) {
+        return {
+            fill: true, fillColor: warna(data.indeks[prop[data.kunci]], data.skala), fillOpacity: 0.7,
+            color: "black", weight: zoom >= 10 ? 0.8 : 0.4
+        };
+    };
+    var layer = L.vectorGrid.protobuf(data.url, {
+        vectorTileLayerStyles: gaya,
+        maxNativeZoom: data.zoom_max,
+        minNativeZoom: data.zoom_min,
+        interactive: true,
+        attribution: "Batas wilayah: GeoJSON NTT"
+    }).addTo(peta);
+
+    layer.on("click", function (e) {
+        var prop = e.layer.properties;
+        var nilai = data.nilai[prop[data.kunci]];
+        L.popup().setLatLng(e.latlng).setContent(
+            (prop.kecamatan ? "<b>" + prop.kecamatan + "</b><br>" : "") + prop.kabupaten + "<br>"
+            + data.label + ": " + (nilai === undefined || nilai === null ? "-" : nilai.toLocaleString())
+        ).openOn(peta);
+    });
+})();
+{% endmacro %}
+"""
+    )
+
+    default_js = [("vectorgrid", URL_VECTORGRID)]
+
+    def __init__(self, data):
+        super().__init__()
+        self._name = "LayerVektorKecamatan"
+        self.data = data
+
+
+def render_peta_vektor(
+    meta_tiles, url, data, kolom, label, tahun, kunci="kabupaten", tema="Light", step=10, zoom=8
+):
+    tabel = data.drop_duplicates(kunci).set_index(kunci)[kolom]
+    colormap = buat_colormap(tabel, f"Skor {label} ({tahun})", step)
+    skala, indeks = _skala_step(tabel, step, tabel)
+    m = folium.Map(location=PUSAT_NTT, zoom_start=zoom, tiles=TILES.get(tema, TILES["Light"]))
+    m.add_child(LayerVektorKecamatan({
+        "url": url,
+        "layer": meta_tiles["layer"],
+        "zoom_min": meta_tiles["zoom_min"],
+        "zoom_max": meta_tiles["zoom_max"],
+        "kunci": kunci,
+        "nilai": dict(zip(tabel.index.astype(str), _nilai_tooltip(tabel))),
+        "indeks": dict(zip(tabel.index.astype(str), indeks)),
+        "skala": skala,
+        "label": label,
+        "warna_kosong": WARNA_KOSONG,
+    }))
+    colormap.add_to(m)
+    return m.get_root().render()
@@ -0,0 +1,93 @@
+# =======================================
+# 💾 Ekspor Excel multi-sheet (xlsxwriter, constant_memory)
+# =======================================
+# Workbook disusun langsung dari irisan panel per tahun, baris demi baris: dengan
+# constant_memory xlsxwriter menulis setiap baris ke file sementara begitu
+# baris berikutnya dimulai, jadi memori tidak tumbuh dengan ukuran sheet.
+# Isi:
+#   - "Data <tahun>"       : frame lebar per tahun (skor pilar + indikator)
+#   - "Skor Pilar"         : kabupaten × tahun × 12 pilar
+#   - "Detail Indikator"   : bentuk panjang kabupaten, tahun, pilar, indikator, nilai
+#   - "Info"               : versi dataset & filter yang dipakai
+# Filter kabupaten berlaku untuk semua sheet.
+import io
+
+import numpy as np
+import xlsxwriter
+
+
+def _baris(nilai):
+    # NaN -> None (sel kosong); write_number menolak NaN
+    return np.where(np.isnan(nilai), None, nilai.astype(object)).tolist()
+
+
+def _tulis_tabel(sheet, header, baris_iter, fmt_header):
+    sheet.write_row(0, 0, header, fmt_header)
+    sheet.freeze_panes(1, 1)
+    for r, baris in enumerate(baris_iter, start=1):
+        sheet.write_row(r, 0, baris)
+
+
+def workbook_excel(panel, tahun, kabupaten=(), versi=None):
+    tahun = [str(t) for t in tahun if str(t) in panel.tahun]
+    pilih_kab = np.isin(panel.kabupaten, list(kabupaten)) if kabupaten else np.ones(len(panel.kabupaten), bool)
+    kolom = list(panel.indikator)
+    idx_pilar = panel._i(panel.kolom_pilar())
+    idx_detail = np.flatnonzero([k.count("_") > 1 for k in kolom])
+
+    output = io.BytesIO()
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    fmt_header = wb.add_format({"bold": True, "bg_color": "#DDEBF7"})
+
+    # ===== Satu sheet per tahun =====
+    for t in tahun:
+        i = panel._t(t)
+        baris = np.flatnonzero(panel.ada[i] & pilih_kab)
+        nilai = panel.irisan(t)
+        _tulis_tabel(
+            wb.add_worksheet(f"Data {t}"),
+            ["kabupaten"] + kolom,
+            ([panel.kabupaten[k]] + _baris(nilai[k]) for k in baris),
+            fmt_header,
+        )
+
+    # ===== Skor pilar semua tahun terpilih =====
+    def baris_pilar():
+        for t in tahun:
+            i, nilai = panel._t(t), panel.irisan(t)
+            for k in np.flatnonzero(panel.ada[i] & pilih_kab):
+                yield [panel.kabupaten[k], t] + _baris(nilai[k, idx_pilar])
+
+    _tulis_tabel(
+        wb.add_worksheet("Skor Pilar"), ["kabupaten", "tahun"] + panel.kolom_pilar(), baris_pilar(), fmt_header
+    )
+
+    # ===== Detail indikator (bentuk panjang, hanya sel berisi) =====
+    def baris_detail():
+        for t in tahun:
+            i, irisan = panel._t(t), panel.irisan(t)
+            for k in np.flatnonzero(panel.ada[i] & pilih_kab):
+                nilai = irisan[k, idx_detail]
+                for j in np.flatnonzero(~np.isnan(nilai)):
+                    ind = idx_detail[j]
+                    yield [panel.kabupaten[k], t, int(panel.pilar[ind]), kolom[ind], float(nilai[j])]
+
+    _tulis_tabel(
+        wb.add_worksheet("Detail Indikator"),
+        ["kabupaten", "tahun", "pilar", "indikator", "nilai"],
+        baris_detail(),
+        fmt_header,
+    )
+
+    # ===== Info =====
+    info = wb.add_worksheet("Info")
+    for r, (kunci, nilai) in enumerate([
+        ("Sumber", "Indeks Daya Saing Daerah (IDSD) Nusa Tenggara Timur"),
+        ("Versi dataset", versi or "-"),
+        ("Tahun", ", ".join(tahun)),
+        ("Kabupaten/Kota", ", ".join(kabupaten) if kabupaten else "Semua"),
+    ]):
+        info.write_row(r, 0, [kunci, nilai])
+
+    wb.close()
+    return output.getvalue()
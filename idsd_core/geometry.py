@@ -0,0 +1,91 @@
+# =======================================
+# 🗺️ Cache geometri multi-resolusi kabupaten
+# =======================================
+# Batas kabupaten disederhanakan sekali saat build dengan coverage_simplify
+# (tepi bersama antar kabupaten disederhanakan bersama, jadi tidak ada celah
+# atau tumpang tindih), lalu koordinat dikuantisasi ke grid. Runtime cukup
+# membuka level yang sesuai dengan zoom peta sebagai JSON biasa; geopandas
+# hanya diperlukan saat build (idsd_core/geometry_build.py).
+import glob
+import json
+import os
+
+from idsd_core.kabupaten import indeks_kabupaten
+from idsd_core.store import FOLDER_STORE, ROOT_DIR
+
+SUMBER_GEOJSON = os.path.join(ROOT_DIR, "NTT_Kabupaten_All.geojson")
+FOLDER_GEOJSON_KABUPATEN = os.path.join(ROOT_DIR, "GeoJSON", "NTT_kabupaten")
+NAMA_MANIFEST_GEOMETRI = "geometri_manifest.json"
+
+# toleransi dalam derajat, presisi = jumlah digit desimal koordinat,
+# zoom_min = zoom Leaflet terkecil yang memakai level ini
+LEVEL_GEOMETRI = {
+    "ringkas": {"toleransi": 0.01, "presisi": 3, "zoom_min": 0},
+    "sedang": {"toleransi": 0.002, "presisi": 4, "zoom_min": 8},
+    "detail": {"toleransi": 0.0005, "presisi": 5, "zoom_min": 10},
+}
+
+KOLOM_NAMA = ["kabupaten_final", "kabupaten", "nm_dati2", "NAME_2"]
+
+
+# ===== Sumber geometri =====
+def daftar_sumber():
+    if os.path.exists(SUMBER_GEOJSON):
+        return [SUMBER_GEOJSON]
+    return sorted(glob.glob(os.path.join(FOLDER_GEOJSON_KABUPATEN, "*.geojson")))
+
+
+def _stat_sumber(paths):
+    return {os.path.relpath(p, ROOT_DIR): os.stat(p).st_mtime for p in paths}
+
+
+def _path_level(level, folder):
+    return os.path.join(folder, f"geometri_{level}.geojson")
+
+
+# ===== Loader =====
+def ensure_geometry(folder=FOLDER_STORE):
+    path = os.path.join(folder, NAMA_MANIFEST_GEOMETRI)
+    paths = daftar_sumber()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        segar = (
+            manifest["stat"] == _stat_sumber(paths)
+            and manifest.get("registri") == indeks_kabupaten().versi
+            and all(os.path.exists(_path_level(level, folder)) for level in LEVEL_GEOMETRI)
+        )
+        if segar:
+            return manifest
+    # Build (geopandas) hanya diimpor bila geometri belum ada / basi
+    from idsd_core.geometry_build import build_geometry
+
+    return build_geometry(paths, folder)
+
+
+def pilih_level(zoom):
+    cocok = [lv for lv, cfg in LEVEL_GEOMETRI.items() if zoom >= cfg["zoom_min"]]
+    return max(cocok, key=lambda lv: LEVEL_GEOMETRI[lv]["zoom_min"])
+
+
+def load_fitur(zoom=7, folder=FOLDER_STORE):
+    # Fitur GeoJSON siap pakai (geometri + kabupaten) tanpa geopandas/shapely
+    ensure_geometry(folder)
+    with open(_path_level(pilih_level(zoom), folder), encoding="utf-8") as f:
+        fc = json.load(f)
+    return [
+        {
+            "type": "Feature",
+            "geometry": fitur["geometry"],
+            "properties": {"kabupaten": fitur["properties"]["kabupaten"]},
+        }
+        for fitur in fc["features"]
+    ]
+
+
+def load_geometry(zoom=7, folder=FOLDER_STORE):
+    # GeoDataFrame untuk view yang memang butuh operasi spasial
+    import geopandas as gpd
+
+    ensure_geometry(folder)
+    return gpd.read_file(_path_level(pilih_level(zoom), folder))
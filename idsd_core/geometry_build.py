@@ -0,0 +1,131 @@
+# =======================================
+# 🔧 Build geometri multi-resolusi kabupaten (butuh geopandas/shapely)
+# =======================================
+# Hanya dipakai saat build_geometry.py / sumber GeoJSON berubah. Runtime
+# dashboard cukup idsd_core.geometry yang membaca hasil build sebagai JSON
+# biasa, jadi geopandas/pyproj/shapely tidak ikut diimpor di worker.
+import hashlib
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from idsd_core.geometry import (
+    KOLOM_NAMA,
+    LEVEL_GEOMETRI,
+    NAMA_MANIFEST_GEOMETRI,
+    _path_level,
+    _stat_sumber,
+    daftar_sumber,
+)
+from idsd_core.kabupaten import indeks_kabupaten, laporan
+from idsd_core.store import FOLDER_STORE, ROOT_DIR
+
+
+# ===== Sumber geometri =====
+def _baca_sumber(paths):
+    if not paths:
+        raise FileNotFoundError("Tidak ada GeoJSON kabupaten (NTT_Kabupaten_All.geojson / GeoJSON/NTT_kabupaten/)")
+
+    frames = []
+    for path in paths:
+        gdf = gpd.read_file(path)
+        kolom_nama = next((c for c in KOLOM_NAMA if c in gdf.columns), None)
+        if kolom_nama is None:
+            raise ValueError(f"❌ Kolom nama kabupaten tidak ditemukan di {path}")
+
+        hasil = gpd.GeoDataFrame(
+            {"nama_sumber": gdf[kolom_nama].astype(str)},
+            geometry=shapely.force_2d(gdf.geometry.values),
+            crs=gdf.crs,
+        )
+        hasil["kode"] = None
+        if "kd_propinsi" in gdf.columns and "kd_dati2" in gdf.columns:
+            hasil["kode"] = gdf["kd_propinsi"].astype(str) + "." + gdf["kd_dati2"].astype(str)
+        frames.append(hasil.to_crs(4326) if hasil.crs is not None else hasil.set_crs(4326))
+
+    gdf = gpd.GeoDataFrame(
+        pd.concat(frames, ignore_index=True), geometry="geometry", crs=4326
+    )
+
+    # Nama/kode kotor (KOTA SOE, KECAMATAN, ...) -> kabupaten kanonik registri.
+    # Fitur kecamatan/kelurahan memang berulang per kabupaten, jadi "ganda"
+    # di sini wajar; yang tidak cocok/ambigu dibuang dan dilaporkan.
+    hasil = indeks_kabupaten().cocokkan(gdf["nama_sumber"], gdf["kode"])
+    cocok = hasil["kode_bps"].notna().to_numpy()
+    gdf = gdf[cocok].assign(
+        kabupaten=hasil.loc[cocok, "kabupaten"].to_numpy(),
+        kode_bps=hasil.loc[cocok, "kode_bps"].to_numpy(),
+    )
+    lapor = laporan(hasil)
+    del lapor["ganda"]
+
+    # Satu fitur per kabupaten (sumber tingkat kecamatan ikut digabung)
+    gdf = gdf.drop(columns=["nama_sumber", "kode"]).dissolve(by="kabupaten", as_index=False, aggfunc="first")
+    return gdf, lapor
+
+
+# ===== Simplifikasi & kuantisasi =====
+def sederhanakan(geoms, toleransi, presisi):
+    hasil = shapely.coverage_simplify(geoms, toleransi)
+    # Snap ke grid: vertex bersama jatuh ke titik grid yang sama di kedua sisi
+    hasil = shapely.set_precision(hasil, 10.0 ** -presisi)
+    return shapely.transform(hasil, lambda xy: np.round(xy, presisi))
+
+
+def _feature_collection(gdf, geoms):
+    properti = gdf.drop(columns="geometry").to_dict(orient="records")
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": prop, "geometry": shapely.geometry.mapping(geom)}
+            for prop, geom in zip(properti, geoms)
+        ],
+    }
+
+
+# ===== Build =====
+def _tulis_atomik(path, teks):
+    # Worker supervisor bisa membangun bersamaan: tmp unik per proses lalu
+    # os.replace, jadi pembaca hanya melihat file lama atau file baru yang utuh
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(teks)
+    os.replace(tmp, path)
+
+
+def build_geometry(paths=None, folder=FOLDER_STORE):
+    paths = paths or daftar_sumber()
+    gdf, laporan_kab = _baca_sumber(paths)
+    os.makedirs(folder, exist_ok=True)
+
+    asli = shapely.get_num_coordinates(gdf.geometry.values).sum()
+    manifest = {
+        "sumber": [os.path.relpath(p, ROOT_DIR) for p in paths],
+        "stat": _stat_sumber(paths),
+        "registri": indeks_kabupaten().versi,
+        "vertex_asli": int(asli),
+        "kabupaten": laporan_kab,
+        "level": {},
+    }
+    for level, cfg in LEVEL_GEOMETRI.items():
+        geoms = sederhanakan(gdf.geometry.values, cfg["toleransi"], cfg["presisi"])
+        fc = _feature_collection(gdf, geoms)
+        teks = json.dumps(fc, separators=(",", ":"))
+        _tulis_atomik(_path_level(level, folder), teks)
+        manifest["level"][level] = {
+            **cfg,
+            "vertex": int(shapely.get_num_coordinates(geoms).sum()),
+            "bytes": len(teks.encode()),
+        }
+
+    versi_teks = json.dumps(
+        [manifest["sumber"], manifest["stat"], manifest["registri"], LEVEL_GEOMETRI], sort_keys=True
+    )
+    manifest["versi"] = hashlib.sha256(versi_teks.encode()).hexdigest()[:12]
+    # Manifest terakhir: baru menunjuk level setelah semua file level terganti
+    _tulis_atomik(os.path.join(folder, NAMA_MANIFEST_GEOMETRI), json.dumps(manifest, indent=2))
+    return manifest
@@ -0,0 +1,164 @@
+# =======================================
+# 📥 Ingest rilis Excel tahunan -> CSV lengkap -> store Arrow
+# =======================================
+# Menggantikan rantai main.py + fix_kabupaten_*.py: Excel dibaca SEKALI,
+# angka format Indonesia ("3,89", "1.234,5") diparse dalam satu operasi
+# vektor, kolom dipetakan ke skema indikator kanonik (pilar_N_MM_...), dan
+# kabupaten ditentukan registri dari kode wilayah 53xx di baris yang sama
+# (bukan ditempel berdasarkan urutan baris). Jika hash file Excel tidak
+# berubah sejak ingest terakhir, tidak ada yang dikerjakan. Store dibangun
+# ulang langsung (build_store): bila validasi menolak data baru, DataTidakValid
+# diteruskan dan manifest ingest tidak diubah, jadi run berikutnya mencoba lagi.
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from idsd_core.kabupaten import indeks_kabupaten, laporan
+from idsd_core import store
+from idsd_core.store import FOLDER_STORE, ROOT_DIR, _hash_file, _tulis_json
+
+NAMA_MANIFEST_INGEST = "ingest_manifest.json"
+
+# ===== Tata letak lembar Excel IDSD (sama dengan ekstraktor dashboard.py) =====
+KOLOM_KODE = 3  # kode wilayah BPS, NTT = 53xx
+KOLOM_NAMA = 4  # nama kabupaten/kota
+BARIS_NAMA_INDIKATOR = 3  # baris header berisi nama indikator
+PREFIX_PROVINSI = "53"
+
+# Kolom "Indeks Pilar" (skor agregat per pilar)
+KOLOM_INDEKS_PILAR = {
+    15: "pilar_1",
+    24: "pilar_2",
+    28: "pilar_3",
+    34: "pilar_4",
+    36: "pilar_5",
+    43: "pilar_6",
+    45: "pilar_7",
+    49: "pilar_8",
+    53: "pilar_9",
+    55: "pilar_10",
+    58: "pilar_11",
+    66: "pilar_12",
+}
+
+# Kolom indikator detail per pilar
+KOLOM_INDIKATOR = {
+    "pilar_1": list(range(5, 16)),
+    "pilar_2": list(range(16, 25)),
+    "pilar_3": list(range(25, 29)),
+    "pilar_4": list(range(30, 35)),
+    "pilar_5": [35, 36],
+    "pilar_6": list(range(37, 44)),
+    "pilar_7": [44, 45],
+    "pilar_8": list(range(46, 50)),
+    "pilar_9": list(range(50, 54)),
+    "pilar_10": [54, 55],
+    "pilar_11": list(range(56, 59)),
+    "pilar_12": list(range(59, 67)),
+}
+
+
+# ===== Parsing angka (vektor) =====
+def parse_angka(blok):
+    # Seluruh blok sel diparse sekaligus: sel yang sudah numerik dipakai
+    # langsung, sel teks dibersihkan dengan satu rantai operasi string.
+    # Jika ada koma, titik dianggap pemisah ribuan ("1.234,5" -> 1234.5).
+    teks = pd.Series(np.asarray(blok, dtype=object).ravel())
+    angka = pd.to_numeric(teks, errors="coerce")
+
+    perlu = angka.isna() & teks.notna()
+    if perlu.any():
+        s = teks[perlu].astype(str).str.strip().str.replace(r"\s", "", regex=True)
+        ada_koma = s.str.contains(",", regex=False)
+        s = s.where(~ada_koma, s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        s = s.replace({"-": None, "": None})
+        angka[perlu] = pd.to_numeric(s, errors="coerce")
+
+    return angka.to_numpy(dtype="float64").reshape(np.shape(blok))
+
+
+# ===== Skema kolom =====
+def nama_kolom_indikator(pilar, urutan, nama_excel):
+    # Konvensi kolom CSV lengkap: pilar_N_MM_<nama indikator, 30 huruf>.
+    # Nama diambil dari header Excel tahun itu sendiri; indikator yang sama
+    # bisa berganti posisi/nama antar tahun, jadi tidak ditebak dari tahun lain.
+    return f"{pilar}_{urutan:02d}_{nama_excel[:30]}"
+
+
+def excel_ke_frame(path_excel, sheet=0):
+    raw = pd.read_excel(path_excel, sheet_name=sheet, header=None, dtype=object)
+    if raw.shape[1] <= max(KOLOM_INDEKS_PILAR):
+        raise ValueError(f"❌ {path_excel}: hanya {raw.shape[1]} kolom, format lembar IDSD tidak dikenali")
+
+    kode = raw.iloc[:, KOLOM_KODE].astype(str).str.strip()
+    ntt = raw[kode.str.startswith(PREFIX_PROVINSI).to_numpy()]
+    if ntt.empty:
+        raise ValueError(f"❌ {path_excel}: tidak ada baris dengan kode wilayah {PREFIX_PROVINSI}xx")
+
+    header = raw.iloc[BARIS_NAMA_INDIKATOR]
+    # Urutan kolom: skor pilar_1..pilar_12, lalu indikator detail per pilar
+    posisi, nama_kolom = list(KOLOM_INDEKS_PILAR), list(KOLOM_INDEKS_PILAR.values())
+    for pilar, kolom_list in KOLOM_INDIKATOR.items():
+        for i, idx_ind in enumerate(kolom_list):
+            nama = header.iloc[idx_ind]
+            nama = str(nama).strip() if pd.notna(nama) and str(nama).strip() else f"indikator_{idx_ind}"
+            posisi.append(idx_ind)
+            nama_kolom.append(nama_kolom_indikator(pilar, i + 1, nama))
+
+    nilai = parse_angka(ntt.iloc[:, posisi].to_numpy())
+    df = pd.DataFrame(nilai, columns=nama_kolom)
+    # Kode wilayah di baris yang sama menentukan kabupaten (KUPANG vs KOTA KUPANG)
+    kabupaten, hasil = indeks_kabupaten().kanonik(ntt.iloc[:, KOLOM_NAMA].to_numpy(), kode[ntt.index])
+    df.insert(0, "kabupaten", kabupaten.to_numpy())
+    return df, laporan(hasil)
+
+
+# ===== Manifest ingest =====
+def _path_manifest(folder):
+    return os.path.join(folder, NAMA_MANIFEST_INGEST)
+
+
+def _baca_manifest(folder):
+    path = _path_manifest(folder)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def path_csv_tahun(tahun, folder=ROOT_DIR):
+    return os.path.join(folder, f"data_{tahun}_lengkap.csv")
+
+
+def ingest_excel(path_excel, tahun, sheet=0, paksa=False, folder=FOLDER_STORE):
+    tahun = str(tahun)
+    os.makedirs(folder, exist_ok=True)
+    sha = _hash_file(path_excel)
+    path_csv = path_csv_tahun(tahun)
+
+    manifest = _baca_manifest(folder)
+    info = manifest.get(tahun)
+    if not paksa and info and info["sha256"] == sha and os.path.exists(path_csv):
+        return {"tahun": tahun, "dilewati": True, **info}
+
+    df, laporan_kab = excel_ke_frame(path_excel, sheet)
+    tmp = path_csv + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path_csv)
+
+    # Store Arrow dibangun ulang sekarang (bukan ensure_store, yang diam-diam tetap
+    # menyajikan store lama bila data baru ditolak validasi)
+    versi = store.build_store(folder=folder, lama=store._baca_manifest(folder))["versi"]
+
+    manifest[tahun] = {
+        "excel": os.path.relpath(os.path.abspath(path_excel), ROOT_DIR),
+        "sha256": sha,
+        "csv": os.path.relpath(path_csv, ROOT_DIR),
+        "baris": len(df),
+        "kolom": df.shape[1],
+        "kabupaten": laporan_kab,
+    }
+    _tulis_json(_path_manifest(folder), manifest, indent=2)
+    return {"tahun": tahun, "dilewati": False, "versi": versi, **manifest[tahun]}
@@ -0,0 +1,214 @@
+# =======================================
+# 🏛 Registri kanonik kabupaten/kota NTT + indeks pencocokan nama
+# =======================================
+# Satu sumber kebenaran untuk nama kabupaten: dikunci kode BPS, dengan kode
+# Kemendagri (kd_propinsi.kd_dati2 di GeoJSON), alias, dan ibu kota. Nama
+# kotor dari Excel/CSV/GeoJSON dicocokkan sekaligus (per nama unik):
+#   1. kode wilayah (BPS 53xx / Kemendagri 53.xx) jika tersedia
+#   2. alias persis setelah normalisasi
+#   3. kemiripan trigram (Dice) lewat indeks terbalik
+# Setiap baris yang tidak cocok, ambigu, atau ganda dilaporkan, bukan ditebak.
+# Salah tulis yang sudah diperiksa diselesaikan lewat KOREKSI_SUMBER (eksplisit
+# per file & baris), bukan dengan membuang baris ganda.
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# kode BPS, kode Kemendagri, nama kanonik (konvensi data IDSD), ibu kota, alias lain
+REGISTRI = [
+    ("5301", "53.12", "SUMBA BARAT", "WAIKABUBAK", []),
+    ("5302", "53.11", "SUMBA TIMUR", "WAINGAPU", []),
+    ("5303", "53.01", "KUPANG", "OELAMASI", []),
+    ("5304", "53.02", "TIMOR TENGAH SELATAN", "SOE", ["TTS"]),
+    ("5305", "53.03", "TIMOR TENGAH UTARA", "KEFAMENANU", ["TTU"]),
+    ("5306", "53.04", "BELU", "ATAMBUA", []),
+    ("5307", "53.05", "ALOR", "KALABAHI", []),
+    ("5308", "53.13", "LEMBATA", "LEWOLEBA", []),
+    ("5309", "53.06", "FLORES TIMUR", "LARANTUKA", ["FLOTIM"]),
+    ("5310", "53.07", "SIKKA", "MAUMERE", []),
+    ("5311", "53.08", "ENDE", "ENDE", []),
+    ("5312", "53.09", "NGADA", "BAJAWA", []),
+    ("5313", "53.10", "MANGGARAI", "RUTENG", []),
+    ("5314", "53.14", "ROTE NDAO", "BAA", ["ROTE"]),
+    ("5315", "53.15", "MANGGARAI BARAT", "LABUAN BAJO", ["MABAR"]),
+    ("5316", "53.17", "SUMBA TENGAH", "WAIBAKUL", []),
+    ("5317", "53.18", "SUMBA BARAT DAYA", "TAMBOLAKA", ["SBD"]),
+    ("5318", "53.16", "NAGEKEO", "MBAY", []),
+    ("5319", "53.19", "MANGGARAI TIMUR", "BORONG", ["MATIM"]),
+    ("5320", "53.20", "SABU RAIJUA", "SEBA", ["SAVU RAIJUA", "SABU"]),
+    ("5321", "53.21", "MALAKA", "BETUN", []),
+    ("5371", "53.71", "KOTA KUPANG", None, []),
+]
+
+# (file sumber, baris data ke-) -> (nama tertulis, kode BPS sebenarnya).
+# Hanya berlaku bila nama di baris itu persis sama dengan yang tertulis di sini:
+# bila sumbernya diperbaiki/diubah, koreksi tidak dipakai lagi.
+KOREKSI_SUMBER = {
+    # Urutan baris 2024 sama dengan 2023; baris ke-22 (KOTA KUPANG) tertulis "KUPANG"
+    ("data_2024_lengkap.csv", 22): ("KUPANG", "5371"),
+}
+
+AMBANG_FUZZY = 0.6  # skor Dice minimum untuk dianggap cocok
+MARGIN_AMBIGU = 0.1  # kandidat kedua sedekat ini dengan yang terbaik -> ambigu
+
+POLA_PREFIX = re.compile(r"^(KABUPATEN|KAB)\s+")
+POLA_BPS = re.compile(r"^(53\d{2})(?:\.0+)?$")
+POLA_KEMENDAGRI = re.compile(r"^53\.(\d{1,2})$")
+
+
+# ===== Normalisasi =====
+def normalisasi(nama):
+    # Vektor: huruf besar, non-huruf -> spasi, buang prefix KAB./KABUPATEN.
+    # "KOTA " dipertahankan: KUPANG dan KOTA KUPANG adalah dua wilayah berbeda.
+    return (
+        pd.Series(nama, dtype=object).fillna("").astype(str).str.upper()
+        .str.replace(r"[^A-Z]+", " ", regex=True)
+        .str.strip()
+        .str.replace(POLA_PREFIX, "", regex=True)
+    )
+
+
+def normalisasi_kode(kode):
+    teks = str(kode).strip()
+    cocok = POLA_BPS.match(teks)
+    if cocok:
+        return ("bps", cocok.group(1))
+    cocok = POLA_KEMENDAGRI.match(teks)
+    if cocok:
+        return ("kemendagri", f"53.{int(cocok.group(1)):02d}")
+    return None
+
+
+def _trigram(teks):
+    teks = f"  {teks} "
+    return {teks[i:i + 3] for i in range(len(teks) - 2)}
+
+
+# ===== Indeks =====
+class IndeksKabupaten:
+    def __init__(self, registri=REGISTRI):
+        self.registri = pd.DataFrame(
+            [(bps, kmd, nama) for bps, kmd, nama, _, _ in registri],
+            columns=["kode_bps", "kode_kemendagri", "kabupaten"],
+        )
+        self._nama = dict(zip(self.registri["kode_bps"], self.registri["kabupaten"]))
+        self._kode = {("bps", b): b for b in self.registri["kode_bps"]}
+        self._kode.update(
+            {("kemendagri", k): b for k, b in zip(self.registri["kode_kemendagri"], self.registri["kode_bps"])}
+        )
+
+        # Alias persis (setelah normalisasi) -> kode BPS; alias bentrok dibuang
+        alias = defaultdict(set)
+        for bps, _, nama, ibukota, lain in registri:
+            for a in [nama, f"KABUPATEN {nama}", *lain]:
+                alias[normalisasi([a])[0]].add(bps)
+            if ibukota:
+                alias[f"KOTA {ibukota}"].add(bps)
+        self.alias = {a: next(iter(kode)) for a, kode in alias.items() if len(kode) == 1}
+
+        # Indeks terbalik trigram -> id alias
+        self._alias_teks = list(self.alias)
+        self._alias_kode = np.array([self.alias[a] for a in self._alias_teks])
+        self._alias_n = np.array([len(_trigram(a)) for a in self._alias_teks])
+        posting = defaultdict(list)
+        for i, a in enumerate(self._alias_teks):
+            for g in _trigram(a):
+                posting[g].append(i)
+        self._posting = {g: np.array(ids) for g, ids in posting.items()}
+
+        self.versi = hashlib.sha256(
+            json.dumps([registri, sorted(KOREKSI_SUMBER.items()), AMBANG_FUZZY, MARGIN_AMBIGU]).encode()
+        ).hexdigest()[:12]
+
+    def _fuzzy(self, teks):
+        gram = _trigram(teks)
+        ids = [self._posting[g] for g in gram if g in self._posting]
+        if not ids:
+            return None, 0.0, None
+        sama = np.bincount(np.concatenate(ids), minlength=len(self._alias_teks))
+        dice = 2 * sama / (len(gram) + self._alias_n)
+        # Skor terbaik per kabupaten (beberapa alias bisa menunjuk kode yang sama)
+        skor = pd.Series(dice).groupby(self._alias_kode).max().sort_values(ascending=False)
+        kedua = skor.iloc[1] if len(skor) > 1 else 0.0
+        return skor.index[0], float(skor.iloc[0]), float(kedua)
+
+    def cocokkan(self, nama, kode=None, koreksi=None):
+        # Hasil satu baris per input: kode_bps, kabupaten kanonik, metode, skor, status
+        # koreksi = {posisi baris: (nama tertulis, kode BPS)} (lihat koreksi_sumber)
+        input_ = pd.Series(nama, dtype=object).reset_index(drop=True)
+        bersih = normalisasi(input_)
+        kode = pd.Series([None] * len(bersih) if kode is None else list(kode), dtype=object)
+
+        hasil_kode = kode.map(lambda k: None if pd.isna(k) else self._kode.get(normalisasi_kode(k)))
+
+        # Nama unik cukup dicocokkan sekali
+        per_nama = {}
+        for teks in bersih.unique():
+            if teks in self.alias:
+                per_nama[teks] = (self.alias[teks], "alias", 1.0, "cocok")
+            elif not teks:
+                per_nama[teks] = (None, "-", 0.0, "tidak_cocok")
+            else:
+                bps, skor, kedua = self._fuzzy(teks)
+                if bps is None or skor < AMBANG_FUZZY:
+                    per_nama[teks] = (None, "fuzzy", skor, "tidak_cocok")
+                elif skor - kedua < MARGIN_AMBIGU:
+                    per_nama[teks] = (None, "fuzzy", skor, "ambigu")
+                else:
+                    per_nama[teks] = (bps, "fuzzy", skor, "cocok")
+
+        koreksi = koreksi or {}
+        baris = []
+        for i, (teks, bps_kode) in enumerate(zip(bersih, hasil_kode)):
+            tertulis, bps_koreksi = koreksi.get(i, (None, None))
+            if tertulis is not None and str(input_[i]).strip() == tertulis:
+                baris.append((bps_koreksi, "koreksi", 1.0, "cocok"))
+            elif pd.notna(bps_kode):
+                baris.append((bps_kode, "kode", 1.0, "cocok"))
+            else:
+                baris.append(per_nama[teks])
+        hasil = pd.DataFrame(baris, columns=["kode_bps", "metode", "skor", "status"])
+        hasil.insert(0, "input", input_)
+        hasil.insert(2, "kabupaten", hasil["kode_bps"].map(self._nama))
+
+        # Dua baris berbeda yang jatuh ke kabupaten yang sama
+        ganda = hasil["kode_bps"].notna() & hasil.duplicated("kode_bps", keep="first")
+        hasil.loc[ganda, "status"] = "ganda"
+        return hasil
+
+    def kanonik(self, nama, kode=None, koreksi=None):
+        # Nama kanonik; yang tidak cocok/ambigu tetap nama ternormalisasi
+        hasil = self.cocokkan(nama, kode, koreksi)
+        return hasil["kabupaten"].fillna(normalisasi(hasil["input"])), hasil
+
+
+def koreksi_sumber(path):
+    # {posisi baris 0-based: (nama tertulis, kode BPS)} untuk satu file sumber
+    nama_file = os.path.basename(path)
+    return {baris - 1: isi for (file, baris), isi in KOREKSI_SUMBER.items() if file == nama_file}
+
+
+def laporan(hasil):
+    # Ringkasan untuk manifest / log build: baris bermasalah + baris yang dikoreksi
+    lapor = {
+        status: hasil.loc[hasil["status"] == status, "input"].astype(str).tolist()
+        for status in ["tidak_cocok", "ambigu", "ganda"]
+    }
+    koreksi = hasil[hasil["metode"] == "koreksi"]
+    lapor["koreksi"] = [f"{i} -> {k}" for i, k in zip(koreksi["input"], koreksi["kabupaten"])]
+    return lapor
+
+
+_INDEKS = None
+
+
+def indeks_kabupaten():
+    global _INDEKS
+    if _INDEKS is None:
+        _INDEKS = IndeksKabupaten()
+    return _INDEKS
@@ -0,0 +1,256 @@
+# =======================================
+# 🧮 Mesin indeks komposit: indikator -> skor pilar -> skor IDSD
+# =======================================
+# Semua tahun dihitung sekaligus dari kubus panel nilai[tahun, kabupaten, indikator]:
+#   1. normalisasi indikator (asli = skala 0-5 rilis, atau min-max per tahun)
+#   2. skor pilar  = rata-rata berbobot indikator yang terisi
+#                  = (X·w) @ M / (A·w) @ M   (M = matriks keanggotaan indikator -> pilar)
+#   3. skor IDSD   = rata-rata berbobot skor pilar yang terisi
+# Bobot nol mengeluarkan indikator/pilar. Satu hitung ulang hanya beberapa
+# perkalian matriks kecil, jadi cukup cepat untuk slider interaktif.
+import numpy as np
+import pandas as pd
+
+SKALA_MAKS = 5.0  # skala skor IDSD (0-5)
+TOLERANSI_VERIFIKASI = 0.01  # nilai rilis dibulatkan 2 desimal
+NORMALISASI = ["asli", "minmax"]
+
+
+class MesinKomposit:
+    def __init__(self, panel):
+        self.panel = panel
+        self.tahun = list(panel.tahun)
+        self.kabupaten = panel.kabupaten
+        self.kolom_pilar = panel.kolom_pilar()
+
+        # Kolom indikator detail (bukan skor pilar) dan pilar induknya
+        detail = np.array([k.count("_") > 1 for k in panel.indikator])
+        self.indikator = panel.indikator[detail]
+        self._idx_detail = np.flatnonzero(detail)
+        self._idx_pilar = panel._i(self.kolom_pilar)
+        nomor = panel.pilar[self._idx_detail]
+        nomor_pilar = panel.pilar[self._idx_pilar]
+        self.M = (nomor[:, None] == nomor_pilar[None, :]).astype("float64")  # [indikator, pilar]
+
+        self.X = panel.nilai[:, :, self._idx_detail]  # [tahun, kabupaten, indikator]
+        self.A = ~np.isnan(self.X)
+        self.ada = panel.ada
+        self._dasar = None
+        self._dasar_rilis = None
+        # Dibagi semua sesi (lihat Skenario): read-only
+        for arr in [self.M, self.X, self.A, self._idx_detail, self._idx_pilar]:
+            arr.flags.writeable = False
+
+    # ===== Bobot =====
+    def _vektor_bobot(self, bobot, kolom):
+        w = np.ones(len(kolom))
+        if bobot:
+            index = pd.Index(kolom)
+            posisi = index.get_indexer(list(bobot))
+            if (posisi < 0).any():
+                tidak_ada = [k for k, p in zip(bobot, posisi) if p < 0]
+                raise KeyError(f"❌ Kolom bobot tidak dikenal: {', '.join(tidak_ada)}")
+            w[posisi] = list(bobot.values())
+        if (w < 0).any():
+            raise ValueError("❌ Bobot tidak boleh negatif")
+        return w
+
+    # ===== Normalisasi =====
+    def normalisasi(self, metode="asli"):
+        if metode == "asli":
+            return self.X
+        if metode == "minmax":
+            # Per tahun per indikator, lintas kabupaten, ke 0..SKALA_MAKS
+            with np.errstate(invalid="ignore", divide="ignore"):
+                lo = np.nanmin(np.where(self.A, self.X, np.inf), axis=1, keepdims=True)
+                hi = np.nanmax(np.where(self.A, self.X, -np.inf), axis=1, keepdims=True)
+                rentang = hi - lo
+                hasil = (self.X - lo) / np.where(rentang > 0, rentang, np.nan) * SKALA_MAKS
+            # Indikator konstan di satu tahun: semua kabupaten dapat nilai tengah
+            return np.where(self.A & ~(rentang > 0), SKALA_MAKS / 2, hasil)
+        raise ValueError(f"❌ Normalisasi tidak dikenal: {metode} (pilihan: {', '.join(NORMALISASI)})")
+
+    # ===== Hitung =====
+    def hitung(self, bobot_indikator=None, bobot_pilar=None, metode="asli"):
+        w = self._vektor_bobot(bobot_indikator, self.indikator)
+        v = self._vektor_bobot(bobot_pilar, self.kolom_pilar)
+        X = np.nan_to_num(self.normalisasi(metode))
+
+        pembilang = (X * w) @ self.M  # [tahun, kabupaten, pilar]
+        penyebut = (self.A * w) @ self.M
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pilar = pembilang / penyebut
+            ada_pilar = ~np.isnan(pilar)
+            idsd = (np.nan_to_num(pilar) @ v) / (ada_pilar @ v)
+        # Kabupaten yang tidak tercatat di tahun itu tetap kosong
+        pilar[~self.ada] = np.nan
+        idsd[~self.ada] = np.nan
+        return {"pilar": pilar, "idsd": idsd}
+
+    def _susun_dasar(self, hasil):
+        # + skor [pilar..., idsd] dan skor terurut per tahun/kolom; read-only (dibagi semua sesi)
+        skor = np.concatenate([hasil["pilar"], hasil["idsd"][:, :, None]], axis=2)
+        urut = []
+        for t in range(len(self.tahun)):
+            per_tahun = skor[t, self.ada[t]]
+            urut.append([np.sort(kolom[~np.isnan(kolom)]) for kolom in per_tahun.T])
+        for arr in [*hasil.values(), skor, *(u for per_tahun in urut for u in per_tahun)]:
+            arr.flags.writeable = False
+        return {**hasil, "skor": skor, "urut": urut}
+
+    def dasar(self):
+        # Hasil hitung ulang bobot sama
+        if self._dasar is None:
+            self._dasar = self._susun_dasar(self.hitung())
+        return self._dasar
+
+    def dasar_rilis(self):
+        # Titik awal skenario: skor pilar RILIS (yang tampil di peta & tabel), IDSD =
+        # rata-rata pilar rilis. Hitung ulang dari indikator tidak selalu sama dengan
+        # rilis (lihat verifikasi), jadi hanya dipakai sebagai selisih (lihat Skenario).
+        if self._dasar_rilis is None:
+            pilar = self.panel.nilai[:, :, self._idx_pilar]  # indeks array -> salinan
+            pilar[~self.ada] = np.nan
+            ada_pilar = ~np.isnan(pilar)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                idsd = np.nan_to_num(pilar).sum(axis=2) / ada_pilar.sum(axis=2)
+            idsd[~self.ada] = np.nan
+            self._dasar_rilis = self._susun_dasar({"pilar": pilar, "idsd": idsd})
+        return self._dasar_rilis
+
+    # ===== Bentuk frame =====
+    def frame(self, hasil, tahun):
+        # Frame lebar satu tahun: kabupaten, pilar_1..pilar_12, idsd
+        t = self.tahun.index(str(tahun))
+        baris = self.ada[t]
+        df = pd.DataFrame(hasil["pilar"][t][baris], columns=self.kolom_pilar)
+        df.insert(0, "kabupaten", self.kabupaten[baris])
+        df["idsd"] = hasil["idsd"][t][baris]
+        return df
+
+    # ===== Verifikasi terhadap skor pilar rilis =====
+    def verifikasi(self, hasil=None, toleransi=TOLERANSI_VERIFIKASI):
+        hasil = hasil or self.hitung()
+        rilis = self.panel.nilai[:, :, self._idx_pilar]
+        selisih = np.abs(hasil["pilar"] - rilis)
+        berpasangan = ~np.isnan(selisih)
+        baris = []
+        for t, tahun in enumerate(self.tahun):
+            for p, pilar in enumerate(self.kolom_pilar):
+                s = selisih[t, :, p][berpasangan[t, :, p]]
+                baris.append({
+                    "tahun": tahun,
+                    "pilar": pilar,
+                    "n": len(s),
+                    "selisih_maks": float(s.max()) if len(s) else np.nan,
+                    "selisih_rata": float(s.mean()) if len(s) else np.nan,
+                    "tidak_cocok": int((s > toleransi).sum()),
+                })
+        df = pd.DataFrame(baris)
+        df["cocok"] = (df["n"] > 0) & (df["tidak_cocok"] == 0)
+        return df
+
+
+# ===== Skenario what-if (per sesi) =====
+# Hanya menyimpan nilai indikator yang diubah + skor baris (tahun, kabupaten)
+# yang tersentuh; kubus dasar & skor terurut dipakai bersama (tidak disalin).
+# Dasar = skor pilar rilis (mesin.dasar_rilis), jadi tanpa perubahan skenario
+# sama persis dengan peta & tabel. Satu perubahan = hitung ulang SATU pilar
+# kabupaten itu dari indikator, lalu selisihnya terhadap hitung ulang dasar
+# ditambahkan ke skor rilis; skor IDSD ikut dihitung ulang;
+# peringkat = searchsorted pada skor dasar terurut + koreksi kabupaten lain
+# yang juga diubah.
+class Skenario:
+    def __init__(self, mesin):
+        self.mesin = mesin
+        self.dasar = mesin.dasar_rilis()
+        self._hitung_dasar = mesin.dasar()["pilar"]
+        self.ubah = {}  # (t, k, i) -> nilai indikator baru
+        self._skor = {}  # (t, k) -> salinan baris skor [12 pilar + idsd]
+        # Bobot sama dengan hasil dasar
+        self._w = np.ones(len(mesin.indikator))
+        self._v = np.ones(len(mesin.kolom_pilar))
+
+    def _posisi(self, tahun, kabupaten, indikator=None):
+        t = self.mesin.tahun.index(str(tahun))
+        k = self.mesin.kabupaten.get_loc(kabupaten)
+        i = None if indikator is None else self.mesin.indikator.get_loc(indikator)
+        return t, k, i
+
+    def nilai(self, tahun, kabupaten, indikator):
+        t, k, i = self._posisi(tahun, kabupaten, indikator)
+        return self.ubah.get((t, k, i), self.mesin.X[t, k, i])
+
+    def _hitung_pilar(self, t, k, p):
+        anggota = np.flatnonzero(self.mesin.M[:, p])
+        x = self.mesin.X[t, k, anggota].copy()
+        for j, i in enumerate(anggota):
+            if (t, k, i) in self.ubah:
+                x[j] = self.ubah[(t, k, i)]
+        isi = ~np.isnan(x)
+        w = self._w[anggota][isi]
+        return float(x[isi] @ w / w.sum()) if w.sum() > 0 else np.nan
+
+    def _perbarui(self, t, k, i):
+        baris = self._skor.get((t, k))
+        if baris is None:
+            baris = self.dasar["skor"][t, k].copy()
+        p = int(np.flatnonzero(self.mesin.M[i])[0])
+        selisih = self._hitung_pilar(t, k, p) - self._hitung_dasar[t, k, p]
+        baris[p] = self.dasar["pilar"][t, k, p] + np.nan_to_num(selisih)
+        pilar = baris[:-1]
+        isi = ~np.isnan(pilar)
+        v = self._v[isi]
+        baris[-1] = float(pilar[isi] @ v / v.sum()) if v.sum() > 0 else np.nan
+        if not any(kunci[:2] == (t, k) for kunci in self.ubah):
+            self._skor.pop((t, k), None)
+        else:
+            self._skor[(t, k)] = baris
+
+    def atur(self, tahun, kabupaten, indikator, nilai):
+        t, k, i = self._posisi(tahun, kabupaten, indikator)
+        dasar = self.mesin.X[t, k, i]
+        # None/NaN atau sama dengan nilai dasar = kembali ke data rilis
+        if nilai is None or np.isnan(nilai) or (not np.isnan(dasar) and np.isclose(nilai, dasar)):
+            self.ubah.pop((t, k, i), None)
+        else:
+            self.ubah[(t, k, i)] = float(nilai)
+        self._perbarui(t, k, i)
+
+    def reset(self, tahun=None, kabupaten=None):
+        for t, k, i in list(self.ubah):
+            if (tahun is None or self.mesin.tahun[t] == str(tahun)) and (
+                kabupaten is None or self.mesin.kabupaten[k] == kabupaten
+            ):
+                del self.ubah[(t, k, i)]
+                self._perbarui(t, k, i)
+
+    def skor(self, tahun, kabupaten):
+        # Baris skor (pilar_1..pilar_12, idsd) skenario dan dasarnya
+        t, k, _ = self._posisi(tahun, kabupaten)
+        kolom = self.mesin.kolom_pilar + ["idsd"]
+        dasar = self.dasar["skor"][t, k]
+        return pd.DataFrame({"dasar": dasar, "skenario": self._skor.get((t, k), dasar)}, index=kolom)
+
+    def peringkat(self, tahun, kabupaten, kolom="idsd"):
+        # (peringkat skenario, peringkat dasar, jumlah kabupaten); 1 = skor tertinggi
+        t, k, _ = self._posisi(tahun, kabupaten)
+        j = len(self.mesin.kolom_pilar) if kolom == "idsd" else self.mesin.kolom_pilar.index(kolom)
+        urut = self.dasar["urut"][t][j]
+        dasar = self.dasar["skor"][t, :, j]
+
+        def lebih_tinggi(nilai):
+            # Jumlah kabupaten lain (versi skenario) dengan skor > nilai
+            n = len(urut) - np.searchsorted(urut, nilai, side="right")
+            n -= dasar[k] > nilai
+            for (t2, k2), baris in self._skor.items():
+                if t2 == t and k2 != k:
+                    n += int(baris[j] > nilai) - int(dasar[k2] > nilai)
+            return int(n)
+
+        nilai = self._skor.get((t, k), self.dasar["skor"][t, k])[j]
+        if np.isnan(nilai):
+            return None, None, len(urut)
+        baru = 1 + lebih_tinggi(nilai)
+        lama = 1 + len(urut) - np.searchsorted(urut, dasar[k], side="right")
+        return baru, int(lama), len(urut)
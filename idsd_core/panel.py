@@ -0,0 +1,233 @@
+# =======================================
+# 🧮 Panel multi-tahun IDSD (kabupaten × tahun × indikator)
+# =======================================
+# Sumbu panel (tahun, kabupaten, indikator) disusun dari skema partisi di
+# manifest store, tanpa membaca data. Nilai satu tahun (irisan
+# [kabupaten, indikator] dari kubus nilai[tahun, kabupaten, indikator]) baru
+# dimuat saat tahun itu pertama kali diakses, jadi memori hanya sebanyak
+# tahun yang benar-benar dilihat. Kolom tiap tahun dipetakan ke label
+# indikator kanonik lewat artefak penyelarasan (idsd_core/selaras.py) saat
+# irisan dimuat, jadi indikator yang berganti nama/nomor antar tahun tetap
+# satu kolom; view cukup mengiris lewat accessor di bawah.
+# Semua array yang dibagi antar sesi bersifat read-only: frame dari wide()
+# adalah bingkai baru per panggilan di atas buffer bersama (tanpa salin), jadi
+# sesi boleh menambah kolom di frame-nya sendiri, tapi tulis in-place ke nilai
+# gagal (ValueError) alih-alih diam-diam mengubah data sesi lain.
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from idsd_core.selaras import peta_label
+from idsd_core.store import FOLDER_STORE, baca_selaras, ensure_store, load_tahun
+
+POLA_PILAR = re.compile(r"^pilar_(\d+)(?:_|$)")
+
+
+def nomor_pilar(kolom):
+    cocok = POLA_PILAR.match(kolom)
+    return int(cocok.group(1)) if cocok else None
+
+
+def _urutan_kolom(kolom):
+    # pilar_1, indikator pilar_1, pilar_2, indikator pilar_2, ...
+    return (nomor_pilar(kolom), kolom.count("_") > 1, kolom)
+
+
+class PanelIDSD:
+    def __init__(self, tahun, kabupaten, indikator, ada, muat, label=None, id_indikator=None):
+        self.tahun = list(tahun)
+        self.kabupaten = pd.Index(kabupaten, name="kabupaten")
+        self.indikator = pd.Index(indikator, name="indikator")
+        self.pilar = np.array([nomor_pilar(k) for k in self.indikator], dtype="int16")
+        self.pilar.flags.writeable = False
+        self.ada = ada  # bool [tahun, kabupaten]: kabupaten tercatat di tahun itu
+        self.ada.flags.writeable = False
+        self._muat = muat  # tahun -> DataFrame lebar partisi tahun itu
+        self._label = label or {}  # tahun -> {kolom asli: label kanonik}
+        self.id_indikator = id_indikator or {}  # label kanonik -> ID indikator stabil
+        self._irisan = {}
+        self._lebar = {}  # t -> baris kabupaten yang tercatat saja (read-only)
+        self._kubus = None
+        self._lock = threading.Lock()
+
+    # ===== Konstruksi =====
+    @classmethod
+    def dari_skema(cls, skema, muat, selaras=None):
+        # skema: {tahun: {"kabupaten": [...], "kolom": [...]}}; selaras: artefak penyelarasan
+        tahun = sorted(skema)
+        label = peta_label(selaras) if selaras else {}
+        kabupaten, indikator = {}, set()
+        for t in tahun:
+            kabupaten.update(dict.fromkeys(skema[t]["kabupaten"]))
+            nama = label.get(t, {})
+            indikator.update(nama.get(c, c) for c in skema[t]["kolom"] if nomor_pilar(c) is not None)
+        kabupaten = list(kabupaten)
+        indikator = sorted(indikator, key=_urutan_kolom)
+
+        idx_kab = pd.Index(kabupaten)
+        ada = np.zeros((len(tahun), len(kabupaten)), dtype=bool)
+        for i, t in enumerate(tahun):
+            ada[i, idx_kab.get_indexer(skema[t]["kabupaten"])] = True
+        id_indikator = {info["label"]: id_ for id_, info in (selaras or {}).get("indikator", {}).items()}
+        return cls(tahun, kabupaten, indikator, ada, muat, label, id_indikator)
+
+    @classmethod
+    def dari_frames(cls, frames):
+        skema = {
+            str(t): {"kabupaten": df["kabupaten"].tolist(), "kolom": list(df.columns.drop("kabupaten"))}
+            for t, df in frames.items()
+        }
+        frames = {str(t): df for t, df in frames.items()}
+        return cls.dari_skema(skema, frames.__getitem__)
+
+    # ===== Partisi per tahun (lazy) =====
+    def irisan(self, tahun):
+        # nilai[tahun] : float64 [kabupaten, indikator], dimuat saat pertama diakses
+        t = self._t(tahun)
+        with self._lock:
+            hasil = self._irisan.get(t)
+        if hasil is not None:
+            return hasil
+
+        # Nama kabupaten ganda: baris pertama yang dipakai
+        df = self._muat(self.tahun[t]).drop_duplicates("kabupaten")
+        df = df.rename(columns=self._label.get(self.tahun[t], {}))
+        kolom = [c for c in df.columns if nomor_pilar(c) is not None]
+        baris = self.kabupaten.get_indexer(df["kabupaten"])
+        posisi = self.indikator.get_indexer(kolom)
+        # Partisi yang berubah setelah panel dibuat: kabupaten/kolom baru diabaikan
+        pilih_baris, pilih_kolom = baris >= 0, posisi >= 0
+        hasil = np.full((len(self.kabupaten), len(self.indikator)), np.nan)
+        hasil[np.ix_(baris[pilih_baris], posisi[pilih_kolom])] = (
+            df[kolom].to_numpy(dtype="float64")[np.ix_(pilih_baris, pilih_kolom)]
+        )
+        hasil.flags.writeable = False
+        with self._lock:
+            return self._irisan.setdefault(t, hasil)
+
+    def _baris_tercatat(self, tahun):
+        # irisan[ada[t]] sekali per tahun; wide()/skor() memakai buffer yang sama
+        t = self._t(tahun)
+        with self._lock:
+            hasil = self._lebar.get(t)
+        if hasil is None:
+            hasil = self.irisan(tahun)[self.ada[t]]
+            hasil.flags.writeable = False
+            with self._lock:
+                hasil = self._lebar.setdefault(t, hasil)
+        return hasil
+
+    def tahun_dimuat(self):
+        with self._lock:
+            return [self.tahun[t] for t in sorted(self._irisan)]
+
+    @property
+    def nilai(self):
+        # Kubus penuh [tahun, kabupaten, indikator]: memuat SEMUA partisi.
+        # Hanya untuk analisis lintas seluruh tahun (indeks komposit, verifikasi).
+        # Disusun sekali; mesin komposit & tren memakai kubus yang sama.
+        with self._lock:
+            kubus = self._kubus
+        if kubus is None:
+            kubus = np.stack([self.irisan(t) for t in self.tahun])
+            kubus.flags.writeable = False
+            with self._lock:
+                if self._kubus is None:
+                    self._kubus = kubus
+                kubus = self._kubus
+        return kubus
+
+    # ===== Index helper =====
+    def _t(self, tahun):
+        return self.tahun.index(str(tahun))
+
+    def _i(self, kolom):
+        return self.indikator.get_indexer(kolom if isinstance(kolom, list) else [kolom])
+
+    def kolom_pilar(self):
+        return [k for k in self.indikator if k.count("_") == 1]
+
+    def kolom_indikator(self, pilar):
+        return [k for k in self.indikator if k.startswith(f"{pilar}_")]
+
+    # ===== Bentuk panjang (kanonik) =====
+    @property
+    def long(self):
+        nilai = self.nilai
+        t, k, i = np.indices(nilai.shape).reshape(3, -1)
+        isi = ~np.isnan(nilai.ravel())
+        return pd.DataFrame({
+            "kabupaten": pd.Categorical.from_codes(k[isi], self.kabupaten),
+            "tahun": pd.Categorical.from_codes(t[isi], self.tahun),
+            "indikator": pd.Categorical.from_codes(i[isi], self.indikator),
+            "pilar": self.pilar[i[isi]],
+            "nilai": nilai.ravel()[isi],
+        })
+
+    # ===== Accessor =====
+    def wide(self, tahun):
+        # Frame lebar dengan kolom yang sudah disamakan antar tahun; bingkai baru
+        # tiap panggilan, nilai tetap view read-only ke buffer bersama
+        baris = self.ada[self._t(tahun)]
+        df = pd.DataFrame(self._baris_tercatat(tahun), columns=list(self.indikator), copy=False)
+        df.insert(0, "kabupaten", self.kabupaten[baris])
+        return df
+
+    def skor(self, tahun, kolom):
+        baris = self.ada[self._t(tahun)]
+        nilai = self._baris_tercatat(tahun)[:, self._i(kolom)[0]]
+        return pd.Series(nilai, index=self.kabupaten[baris], name=kolom, copy=False)
+
+    def tahun_pilar(self, tahun, pilar):
+        # Satu tahun, satu pilar: skor pilar + indikator penyusunnya
+        t = self._t(tahun)
+        kolom = [pilar] + self.kolom_indikator(pilar)
+        baris = self.ada[t]
+        return pd.DataFrame(
+            self.irisan(tahun)[np.ix_(baris, self._i(kolom))], index=self.kabupaten[baris], columns=kolom
+        )
+
+    def profil_kabupaten(self, kabupaten, pilar=None, tahun=None):
+        # Satu kabupaten, semua indikator (opsional dibatasi satu pilar), kolom = tahun
+        # (default semua tahun; `tahun` membatasi partisi yang dimuat)
+        k = self.kabupaten.get_loc(kabupaten)
+        tahun = self.tahun if tahun is None else [str(t) for t in tahun]
+        kolom = list(self.indikator) if pilar is None else self.kolom_indikator(pilar)
+        i = self._i(kolom)
+        return pd.DataFrame(
+            np.column_stack([self.irisan(t)[k, i] for t in tahun]) if tahun else np.empty((len(kolom), 0)),
+            index=pd.Index(kolom, name="Indikator"),
+            columns=tahun,
+        )
+
+    def seri(self, kolom, tahun=None):
+        # Satu kolom untuk beberapa tahun: baris = kabupaten yang tercatat di salah satunya
+        tahun = self.tahun if tahun is None else [str(t) for t in tahun]
+        t = [self._t(th) for th in tahun]
+        i = self._i(kolom)[0]
+        baris = self.ada[t].any(axis=0)
+        return pd.DataFrame(
+            {th: self.irisan(th)[baris, i] for th in tahun}, index=self.kabupaten[baris]
+        )
+
+    def delta(self, kolom, dari, ke):
+        dari, ke = str(dari), str(ke)
+        a, b = self._t(dari), self._t(ke)
+        i = self._i(kolom)[0]
+        baris = self.ada[a] | self.ada[b]
+        df = pd.DataFrame({
+            "kabupaten": self.kabupaten[baris],
+            dari: self.irisan(dari)[baris, i],
+            ke: self.irisan(ke)[baris, i],
+        })
+        df["delta"] = df[ke] - df[dari]
+        return df
+
+
+def load_panel(folder=FOLDER_STORE):
+    # Hanya manifest yang dibaca; partisi tahun dimuat saat diakses
+    manifest = ensure_store(folder=folder)
+    skema = {tahun: info["skema"] for tahun, info in manifest["tahun"].items()}
+    return PanelIDSD.dari_skema(skema, lambda tahun: load_tahun(tahun, folder), baca_selaras(folder))
@@ -0,0 +1,154 @@
+# =======================================
+# 🪪 Kartu profil kabupaten + jejak radar 12 pilar
+# =======================================
+# Per (versi dataset, tahun), saat tahun itu pertama diminta, untuk SEMUA
+# kabupaten sekaligus dari irisan panel & kubus agregat:
+#   - vektor 12 skor pilar, persentil & peringkat tiap pilar di provinsi
+#   - pilar terkuat / terlemah (argmax / argmin per baris)
+#   - perubahan peringkat dari tahun sebelumnya (positif = naik)
+#   - rata-rata 12 pilar + peringkatnya
+# Jejak radar (dict plotly per kabupaten) juga dibuat sekali per tahun;
+# memilih kabupaten di view hanya merangkai jejak yang sudah jadi, tanpa
+# loop iterrows / go.Scatterpolar per rerun.
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from idsd_core.komposit import SKALA_MAKS
+
+
+class ProfilKabupaten:
+    def __init__(self, panel, agregat):
+        self.panel = panel
+        self.agregat = agregat
+        self.kolom_pilar = panel.kolom_pilar()
+        self._i = panel._i(self.kolom_pilar)
+        self._i.flags.writeable = False
+        self._per_tahun = {}
+        self._jejak = {}  # (t, label) -> {kabupaten: jejak radar}
+        self._lock = threading.Lock()
+
+    def _hitung(self, tahun):
+        t = self.panel._t(tahun)
+        nilai = self.panel.irisan(tahun)[:, self._i]  # [kabupaten, pilar]
+        isi = ~np.isnan(nilai)
+        ada_isi = isi.any(axis=1)
+        agregat = self.agregat.tahun(tahun)
+        peringkat = agregat["peringkat"][:, self._i]
+
+        with warnings.catch_warnings():
+            # Kabupaten tanpa skor pilar sama sekali -> NaN, bukan warning
+            warnings.simplefilter("ignore", RuntimeWarning)
+            rata = np.nanmean(nilai, axis=1)
+        rata[~self.panel.ada[t]] = np.nan
+        hasil = {
+            "nilai": nilai,
+            "persentil": agregat["persentil"][:, self._i],
+            "peringkat": peringkat,
+            "terkuat": np.where(ada_isi, np.argmax(np.where(isi, nilai, -np.inf), axis=1), -1),
+            "terlemah": np.where(ada_isi, np.argmin(np.where(isi, nilai, np.inf), axis=1), -1),
+            "rata": rata,
+            "peringkat_rata": pd.Series(rata).rank(ascending=False, method="min").to_numpy(),
+        }
+        if t > 0:
+            sebelum = self.tahun(self.panel.tahun[t - 1])
+            hasil["delta_peringkat"] = sebelum["peringkat"] - peringkat
+            hasil["delta_peringkat_rata"] = sebelum["peringkat_rata"] - hasil["peringkat_rata"]
+        else:
+            hasil["delta_peringkat"] = np.full(nilai.shape, np.nan)
+            hasil["delta_peringkat_rata"] = np.full(len(rata), np.nan)
+        for arr in hasil.values():
+            arr.flags.writeable = False
+        return hasil
+
+    def tahun(self, tahun):
+        t = self.panel._t(tahun)
+        with self._lock:
+            hasil = self._per_tahun.get(t)
+        if hasil is None:
+            hasil = self._hitung(tahun)
+            with self._lock:
+                hasil = self._per_tahun.setdefault(t, hasil)
+        return hasil
+
+    # ===== Kartu =====
+    def kartu(self, tahun, kabupaten):
+        # Satu kabupaten: ringkasan + tabel per pilar
+        hasil = self.tahun(tahun)
+        k = self.panel.kabupaten.get_loc(kabupaten)
+        pilar = pd.DataFrame(
+            {nama: hasil[nama][k] for nama in ["nilai", "persentil", "peringkat", "delta_peringkat"]},
+            index=pd.Index(self.kolom_pilar, name="pilar"),
+        )
+        return {
+            "kabupaten": kabupaten,
+            "tahun": str(tahun),
+            "rata": hasil["rata"][k],
+            "peringkat_rata": hasil["peringkat_rata"][k],
+            "delta_peringkat_rata": hasil["delta_peringkat_rata"][k],
+            "terkuat": self._nama_pilar(hasil["terkuat"][k]),
+            "terlemah": self._nama_pilar(hasil["terlemah"][k]),
+            "jumlah_kabupaten": int(np.isfinite(hasil["rata"]).sum()),
+            "pilar": pilar,
+        }
+
+    def frame(self, tahun, kabupaten=None):
+        # Satu baris per kabupaten (yang tercatat di tahun itu, atau `kabupaten`)
+        hasil = self.tahun(tahun)
+        baris = self.panel.ada[self.panel._t(tahun)].copy()
+        if kabupaten is not None:
+            baris &= self.panel.kabupaten.isin(kabupaten)
+        return pd.DataFrame({
+            "kabupaten": self.panel.kabupaten[baris],
+            "rata": hasil["rata"][baris],
+            "peringkat": hasil["peringkat_rata"][baris],
+            "delta_peringkat": hasil["delta_peringkat_rata"][baris],
+            "terkuat": [self._nama_pilar(p) for p in hasil["terkuat"][baris]],
+            "terlemah": [self._nama_pilar(p) for p in hasil["terlemah"][baris]],
+        }).sort_values("peringkat", na_position="last", ignore_index=True)
+
+    def _nama_pilar(self, p):
+        return self.kolom_pilar[p] if p >= 0 else None
+
+    # ===== Radar =====
+    def _jejak_tahun(self, tahun, label):
+        kunci = (self.panel._t(tahun), label)
+        with self._lock:
+            jejak = self._jejak.get(kunci)
+        if jejak is None:
+            hasil = self.tahun(tahun)
+            baris = np.flatnonzero(self.panel.ada[kunci[0]])
+            # Poligon ditutup: titik pertama diulang di akhir
+            theta = list(label) + [label[0]]
+            r = np.concatenate([hasil["nilai"], hasil["nilai"][:, :1]], axis=1)
+            jejak = {
+                self.panel.kabupaten[k]: {
+                    "type": "scatterpolar",
+                    "r": [None if np.isnan(v) else float(v) for v in r[k]],
+                    "theta": theta,
+                    "fill": "toself",
+                    "name": self.panel.kabupaten[k],
+                }
+                for k in baris
+            }
+            with self._lock:
+                jejak = self._jejak.setdefault(kunci, jejak)
+        return jejak
+
+    def radar(self, tahun, kabupaten=None, label=None, tinggi=550):
+        # Dict figure plotly siap pakai (st.plotly_chart menerima dict)
+        label = tuple(label or self.kolom_pilar)
+        jejak = self._jejak_tahun(tahun, label)
+        pilih = jejak if kabupaten is None else [k for k in kabupaten if k in jejak]
+        # Tanpa kabupaten: satu jejak kosong, karena plotly menolak figure tanpa data
+        data = [jejak[k] for k in pilih] or [{"type": "scatterpolar", "r": [], "theta": list(label)}]
+        return {
+            "data": data,
+            "layout": {
+                "polar": {"radialaxis": {"visible": True, "range": [0, SKALA_MAKS]}},
+                "showlegend": True,
+                "height": tinggi,
+            },
+        }
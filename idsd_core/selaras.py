@@ -0,0 +1,250 @@
+# =======================================
+# 🔗 Penyelarasan indikator lintas tahun
+# =======================================
+# Kolom indikator antar tahun tidak bisa dicocokkan lewat nama saja: nomor
+# urut bergeser (pilar_12_02_Publikasi ilmiah -> pilar_12_03_Publikasi Ilmiah),
+# nama terpotong / beda huruf besar, dan sebagian hanya placeholder
+# (pilar_10_02_indikator_52). Setiap kolom tahun baru dicocokkan ke rantai
+# indikator yang sudah ada (wakil = kolom tahun terakhirnya) dalam pilar yang
+# sama dengan skor gabungan:
+#   nama     : kemiripan token nama ternormalisasi (tahan nama terpotong)
+#   kode     : nomor urut indikator sama
+#   korelasi : korelasi nilai antar kabupaten (semua pasangan sekaligus lewat
+#              jumlah-jumlah bermasker, bukan loop per pasangan)
+# lalu dipasangkan secara greedy dari skor tertinggi. Nama persis sama selalu
+# dipasangkan. Hasilnya artefak berversi (ID indikator stabil -> kolom per
+# tahun) yang dipakai panel untuk menyatukan kolom sebelum delta/tren.
+import hashlib
+import json
+import re
+
+import numpy as np
+
+POLA_KOLOM = re.compile(r"^pilar_(\d+)(?:_(\d+)_(.*))?$")
+POLA_PLACEHOLDER = re.compile(r"^indikator_\d+$")
+
+BOBOT = {"nama": 0.5, "kode": 0.15, "korelasi": 0.35}
+AMBANG = 0.55  # skor gabungan minimum supaya dua kolom dianggap indikator yang sama
+MIN_KABUPATEN_KORELASI = 5
+NAMA_PLACEHOLDER = 0.5  # kemiripan nama bila kedua kolom placeholder (netral)
+ALGORITMA = hashlib.sha256(
+    json.dumps([BOBOT, AMBANG, MIN_KABUPATEN_KORELASI, NAMA_PLACEHOLDER, 1]).encode()
+).hexdigest()[:8]
+
+
+# ===== Nama kolom =====
+def urai_kolom(kolom):
+    # -> (pilar, kode, nama ternormalisasi, placeholder?) ; kode None = kolom skor pilar
+    cocok = POLA_KOLOM.match(kolom)
+    if not cocok:
+        return None
+    pilar, kode, nama = cocok.groups()
+    if kode is None:
+        return int(pilar), None, "", False
+    nama = nama.strip()
+    placeholder = bool(POLA_PLACEHOLDER.match(nama))
+    return int(pilar), int(kode), re.sub(r"[^a-z0-9]+", " ", nama.lower()).strip(), placeholder
+
+
+def _token_sama(a, b, a_terakhir, b_terakhir):
+    # Token terakhir nama bisa terpotong: cukup jadi prefiks token lawannya
+    if a == b:
+        return True
+    return (a_terakhir and b.startswith(a)) or (b_terakhir and a.startswith(b))
+
+
+def kemiripan_nama(a, b):
+    # Koefisien Dice token kata (0-1); placeholder tidak punya nama bermakna
+    _, _, nama_a, ph_a = a
+    _, _, nama_b, ph_b = b
+    if ph_a or ph_b:
+        return NAMA_PLACEHOLDER if ph_a and ph_b else 0.0
+    token_a, token_b = nama_a.split(), nama_b.split()
+    if not token_a or not token_b:
+        return 0.0
+    sisa = list(range(len(token_b)))
+    sama = 0
+    for i, ta in enumerate(token_a):
+        for j in sisa:
+            if _token_sama(ta, token_b[j], i == len(token_a) - 1, j == len(token_b) - 1):
+                sisa.remove(j)
+                sama += 1
+                break
+    return 2 * sama / (len(token_a) + len(token_b))
+
+
+# ===== Korelasi semua pasangan kolom =====
+def korelasi_berpasangan(A, B):
+    # A [kabupaten, m], B [kabupaten, n] (NaN = kosong) -> korelasi Pearson [m, n]
+    # memakai kabupaten yang terisi di kedua kolom
+    Ma, Mb = (~np.isnan(A)).astype("float64"), (~np.isnan(B)).astype("float64")
+    A0, B0 = np.nan_to_num(A), np.nan_to_num(B)
+    n = Ma.T @ Mb
+    with np.errstate(invalid="ignore", divide="ignore"):
+        Sa, Sb = A0.T @ Mb, Ma.T @ B0
+        kov = A0.T @ B0 - Sa * Sb / n
+        var_a = (A0 ** 2).T @ Mb - Sa ** 2 / n
+        var_b = Ma.T @ (B0 ** 2) - Sb ** 2 / n
+        r = kov / np.sqrt(var_a * var_b)
+    return np.where((n >= MIN_KABUPATEN_KORELASI) & (var_a > 1e-12) & (var_b > 1e-12), r, np.nan)
+
+
+def _matriks(df, kolom, kabupaten):
+    df = df.drop_duplicates("kabupaten").set_index("kabupaten").reindex(kabupaten)
+    return df[kolom].to_numpy(dtype="float64")
+
+
+# ===== Penyelarasan =====
+def _skor_pasangan(wakil, kolom_baru, frame_wakil, frame_baru):
+    # Skor gabungan [wakil, kolom_baru]; -inf = beda pilar
+    info_w = [urai_kolom(k) for _, k in wakil]
+    info_b = [urai_kolom(k) for k in kolom_baru]
+    skor = np.full((len(wakil), len(kolom_baru)), -np.inf)
+    komponen = {}
+    # Korelasi dihitung per tahun asal wakil (satu perkalian matriks per tahun)
+    r = np.full(skor.shape, np.nan)
+    for tahun in {t for t, _ in wakil}:
+        baris = [j for j, (t, _) in enumerate(wakil) if t == tahun]
+        df_w = frame_wakil[tahun]
+        kabupaten = sorted(set(df_w["kabupaten"]) & set(frame_baru["kabupaten"]))
+        A = _matriks(df_w, [wakil[j][1] for j in baris], kabupaten)
+        B = _matriks(frame_baru, kolom_baru, kabupaten)
+        r[baris] = korelasi_berpasangan(A, B)
+
+    for j, a in enumerate(info_w):
+        for k, b in enumerate(info_b):
+            if a[0] != b[0] or (a[1] is None) != (b[1] is None):
+                continue
+            if wakil[j][1] == kolom_baru[k]:
+                skor[j, k] = np.inf  # nama persis sama: selalu dipasangkan
+                komponen[(j, k)] = {"nama": 1.0, "kode": 1.0, "korelasi": None}
+                continue
+            if a[1] is None:
+                continue  # kolom skor pilar hanya cocok dengan namanya sendiri
+            bagian = {"nama": kemiripan_nama(a, b), "kode": float(a[1] == b[1])}
+            bobot = dict(BOBOT)
+            if np.isnan(r[j, k]):
+                # Korelasi tak tersedia: bobotnya dibagi ke komponen lain
+                del bobot["korelasi"]
+                bagian["korelasi"] = None
+            else:
+                bagian["korelasi"] = float(max(r[j, k], 0.0))
+            skor[j, k] = sum(bobot[c] * bagian[c] for c in bobot) / sum(bobot.values())
+            komponen[(j, k)] = bagian
+    return skor, komponen
+
+
+def _pasangkan(skor):
+    # Greedy dari skor tertinggi; satu kolom paling banyak satu pasangan
+    pasangan = []
+    pakai_w, pakai_b = set(), set()
+    urut = np.argsort(-skor, axis=None, kind="stable")
+    for posisi in urut:
+        j, k = np.unravel_index(posisi, skor.shape)
+        if skor[j, k] < AMBANG:
+            break
+        if j in pakai_w or k in pakai_b:
+            continue
+        pakai_w.add(j)
+        pakai_b.add(k)
+        pasangan.append((int(j), int(k)))
+    return pasangan
+
+
+def selaraskan(frames, lama=None):
+    # frames: {tahun: DataFrame lebar partisi}; lama: artefak sebelumnya (ID dipakai ulang)
+    tahun_urut = sorted(frames)
+    rantai = []  # {"kolom": {tahun: kolom}, "cocok": {tahun: {...}}}
+    for tahun in tahun_urut:
+        kolom = [c for c in frames[tahun].columns if urai_kolom(c) is not None]
+        wakil = [(max(r["kolom"]), r["kolom"][max(r["kolom"])]) for r in rantai]
+        pasangan, komponen = [], {}
+        if wakil and kolom:
+            skor, komponen = _skor_pasangan(wakil, kolom, frames, frames[tahun])
+            pasangan = _pasangkan(skor)
+        terpasang = set()
+        for j, k in pasangan:
+            r = rantai[j]
+            bagian = komponen[(j, k)]
+            r["cocok"][tahun] = {
+                "dari": wakil[j][0],
+                "skor": None if np.isinf(skor[j, k]) else round(float(skor[j, k]), 3),
+                **{c: None if v is None else round(v, 3) for c, v in bagian.items()},
+            }
+            r["kolom"][tahun] = kolom[k]
+            terpasang.add(k)
+        for k, nama in enumerate(kolom):
+            if k not in terpasang:
+                rantai.append({"kolom": {tahun: nama}, "cocok": {}})
+
+    return _beri_id(rantai, tahun_urut, lama)
+
+
+def _beri_id(rantai, tahun_urut, lama):
+    # ID stabil: "P<pilar>" untuk skor pilar, "P<pilar>-<nomor>" untuk indikator.
+    # Rantai yang salah satu kolomnya sudah punya ID di artefak lama memakai ID itu.
+    id_lama = {}
+    for id_, info in ((lama or {}).get("indikator") or {}).items():
+        for tahun, kolom in info["kolom"].items():
+            id_lama[(tahun, kolom)] = id_
+    terpakai = set()
+    nomor_maks = {}
+    for id_ in id_lama.values():
+        if "-" in id_:
+            p, n = id_[1:].split("-")
+            nomor_maks[int(p)] = max(nomor_maks.get(int(p), 0), int(n))
+
+    hasil = {}
+    baru = []
+    for r in rantai:
+        pilar, kode, _, _ = urai_kolom(next(iter(r["kolom"].values())))
+        if kode is None:
+            hasil[f"P{pilar:02d}"] = r
+            continue
+        id_ = next(
+            (id_lama[(t, k)] for t, k in r["kolom"].items() if id_lama.get((t, k)) not in (None, *terpakai)),
+            None,
+        )
+        if id_ is None:
+            baru.append((pilar, r))
+        else:
+            terpakai.add(id_)
+            hasil[id_] = r
+    for pilar, r in baru:
+        nomor_maks[pilar] = nomor_maks.get(pilar, 0) + 1
+        hasil[f"P{pilar:02d}-{nomor_maks[pilar]:03d}"] = r
+
+    # Label = nama kolom terbaru yang bukan placeholder (kalau ada); harus unik
+    label_terpakai = set()
+    for r in hasil.values():
+        urut = [r["kolom"][t] for t in sorted(r["kolom"], reverse=True)]
+        bermakna = [k for k in urut if not urai_kolom(k)[3]]
+        label = (bermakna or urut)[0]
+        r["label"] = label if label not in label_terpakai else urut[0]
+        label_terpakai.add(r["label"])
+
+    artefak = {
+        "algoritma": ALGORITMA,
+        "tahun": tahun_urut,
+        "indikator": {
+            id_: {"label": r["label"], "kolom": r["kolom"], "cocok": r["cocok"]}
+            for id_, r in sorted(hasil.items(), key=lambda x: _urutan_id(x[0]))
+        },
+    }
+    isi = json.dumps({id_: info["kolom"] for id_, info in artefak["indikator"].items()}, sort_keys=True)
+    artefak["versi"] = hashlib.sha256((ALGORITMA + isi).encode()).hexdigest()[:12]
+    return artefak
+
+
+def _urutan_id(id_):
+    pilar, _, nomor = id_[1:].partition("-")
+    return int(pilar), int(nomor or 0)
+
+
+def peta_label(artefak):
+    # {tahun: {kolom asli: label kanonik}} untuk panel
+    peta = {}
+    for info in artefak["indikator"].values():
+        for tahun, kolom in info["kolom"].items():
+            peta.setdefault(tahun, {})[kolom] = info["label"]
+    return peta
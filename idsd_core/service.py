@@ -0,0 +1,242 @@
+# =======================================
+# 🔌 Layanan data bersama untuk semua dashboard
+# =======================================
+# Semua entry point Streamlit mengambil data lewat modul ini. Cache-nya
+# tingkat proses (variabel modul), dikunci dengan versi dataset/geometri:
+# beberapa dashboard di satu server memakai SATU salinan panel & geometri,
+# dan cache otomatis diganti ketika CSV/GeoJSON sumber berubah. Versi itu
+# sendiri (glob sumber + baca manifest + os.stat) dicek penuh paling sering
+# sekali per INTERVAL_CEK_VERSI detik; di antaranya cukup satu lookup dict.
+# Modul berat (folium/branca untuk render peta, geopandas untuk GeoDataFrame)
+# baru diimpor saat fungsi yang membutuhkannya dipanggil pertama kali.
+import threading
+import time
+
+from idsd_core.agregat import KubusAgregat
+from idsd_core.cache_peta import CachePeta
+from idsd_core.geometry import ensure_geometry, load_fitur, load_geometry, pilih_level
+from idsd_core.komposit import MesinKomposit
+from idsd_core.panel import load_panel
+from idsd_core.profil import ProfilKabupaten
+from idsd_core.store import dataset_version
+from idsd_core.tiles import NAMA_LAYER, ZOOM_MAX, ZOOM_MIN, ensure_tiles, mulai_server_latar, url_tiles
+from idsd_core.tren import MesinTren
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+INTERVAL_CEK_VERSI = 2.0  # detik; sumber yang berubah terlihat paling lambat selang ini
+
+_CACHE = {}
+_VERSI = {}  # nama -> (waktu cek terakhir, versi)
+_LOCK = threading.Lock()
+
+# HTML peta jadi, dibagi semua sesi & dashboard di proses ini
+cache_peta = CachePeta()
+# File Excel ekspor, dibuat hanya saat diminta
+cache_ekspor = CachePeta(maks_bytes=32 * 1024 * 1024)
+
+
+def _ambil(kunci, versi, buat):
+    with _LOCK:
+        entri = _CACHE.get(kunci)
+        if entri is not None and entri[0] == versi:
+            return entri[1]
+    nilai = buat()
+    with _LOCK:
+        _CACHE[kunci] = (versi, nilai)
+    return nilai
+
+
+def bersihkan_cache():
+    with _LOCK:
+        _CACHE.clear()
+        _VERSI.clear()
+
+
+def info_cache():
+    with _LOCK:
+        return {kunci: versi for kunci, (versi, _) in _CACHE.items()}
+
+
+# ===== Versi =====
+def _versi(nama, cek):
+    # Cek penuh (ensure_* -> rebuild bila basi) hanya bila hasil terakhir sudah lewat interval
+    sekarang = time.monotonic()
+    with _LOCK:
+        entri = _VERSI.get(nama)
+        if entri is not None and sekarang - entri[0] < INTERVAL_CEK_VERSI:
+            return entri[1]
+    versi = cek()
+    with _LOCK:
+        _VERSI[nama] = (sekarang, versi)
+    return versi
+
+
+def versi_data():
+    return _versi("data", dataset_version)
+
+
+def versi_geometri():
+    return _versi("geometri", lambda: ensure_geometry()["versi"])
+
+
+def versi_tiles():
+    return _versi("tiles", lambda: ensure_tiles()["versi"])
+
+
+# ===== Data skor =====
+def get_panel():
+    return _ambil("panel", versi_data(), load_panel)
+
+
+def get_tahun(tahun):
+    # Frame lebar per tahun (kolom sudah disamakan antar tahun); partisi tahun
+    # itu baru dimuat dari store saat pertama diminta
+    return get_panel().wide(tahun)
+
+
+def daftar_tahun():
+    # Dari manifest store, tanpa memuat data tahun mana pun
+    return list(get_panel().tahun)
+
+
+# ===== Geometri =====
+def get_geometri(zoom=7):
+    level = pilih_level(zoom)
+    return _ambil(("geometri", level), versi_geometri(), lambda: load_geometry(zoom))
+
+
+def get_fitur_peta(zoom=7):
+    level = pilih_level(zoom)
+    return _ambil(("fitur", level), versi_geometri(), lambda: load_fitur(zoom))
+
+
+def get_indeks_wilayah(zoom=10):
+    # STRtree kabupaten dari level geometri paling detail, dibuat sekali per versi geometri
+    level = pilih_level(zoom)
+
+    def buat():
+        from idsd_core.spasial import IndeksWilayah
+
+        return IndeksWilayah(get_fitur_peta(zoom))
+
+    return _ambil(("indeks", level), versi_geometri(), buat)
+
+
+def cari_kabupaten(lat, lon):
+    return get_indeks_wilayah().cari(lat, lon)
+
+
+# ===== Agregat =====
+def get_agregat():
+    return _ambil("agregat", versi_data(), lambda: KubusAgregat(get_panel()))
+
+
+def get_komposit():
+    # Mesin indeks komposit (matriks indikator semua tahun disiapkan sekali)
+    return _ambil("komposit", versi_data(), lambda: MesinKomposit(get_panel()))
+
+
+def get_tren():
+    # Tren linear + proyeksi semua kabupaten × indikator (satu pass per versi dataset)
+    return _ambil("tren", versi_data(), lambda: MesinTren(get_panel()))
+
+
+def get_profil():
+    # Kartu profil kabupaten & jejak radar 12 pilar (per tahun, dibuat saat pertama diminta)
+    return _ambil("profil", versi_data(), lambda: ProfilKabupaten(get_panel(), get_agregat()))
+
+
+# ===== Peta jadi (HTML) =====
+def peta_html(tahun, kolom, label=None, highlight=(), tema="Light", step=10, zoom=7):
+    highlight = tuple(sorted(highlight))
+    kunci = (versi_data(), versi_geometri(), str(tahun), kolom, label, highlight, tema, step, zoom)
+
+    def buat():
+        from idsd_core.choropleth import render_peta
+
+        return render_peta(
+            get_fitur_peta(zoom), get_tahun(tahun), kolom, label or kolom, tahun, highlight, tema, step, zoom
+        )
+
+    return cache_peta.ambil(kunci, buat)
+
+
+def peta_objek(tahun, kolom, label=None, highlight=(), tema="Light", step=10, zoom=7):
+    # Objek folium.Map untuk st_folium (peta yang state kliknya dibaca); tidak di-cache
+    # karena komponen merender ulang objeknya sendiri
+    from idsd_core.choropleth import buat_peta
+
+    return buat_peta(
+        get_fitur_peta(zoom), get_tahun(tahun), kolom, label or kolom, tahun, tuple(highlight), tema, step, zoom
+    )
+
+
+def peta_klien_html(kolom=None, label=None, tahun_awal=None, kolom_awal=None, tema="Light", step=10, zoom=7):
+    # Satu peta untuk SEMUA tahun × kolom (default: 12 pilar); ganti pilar/tahun
+    # terjadi di browser. HTML-nya tidak bergantung pada pilihan di sidebar,
+    # jadi rerun Streamlit tidak mengirim ulang peta.
+    panel = get_panel()
+    kolom = tuple(kolom or panel.kolom_pilar())
+    label = dict(label or {})
+    kunci = (
+        "klien", versi_data(), versi_geometri(), kolom, tuple(sorted(label.items())),
+        tahun_awal, kolom_awal, tema, step, zoom,
+    )
+
+    def buat():
+        from idsd_core.choropleth import render_peta_klien
+
+        frames = {tahun: get_tahun(tahun) for tahun in panel.tahun}
+        return render_peta_klien(get_fitur_peta(zoom), frames, kolom, label, tahun_awal, kolom_awal, tema, step, zoom)
+
+    return cache_peta.ambil(kunci, buat)
+
+
+def peta_kecamatan_html(tahun, kolom, label=None, tema="Light", step=10, zoom=8):
+    # Batas kecamatan lewat vector tile; HTML hanya berisi nilai + URL tile.
+    # Server tile lokal dijalankan sekali per proses (atau dipakai bersama bila sudah ada).
+    versi = versi_tiles()
+    url = url_tiles(mulai_server_latar(), versi)
+    kunci = ("kecamatan", versi_data(), versi, url, str(tahun), kolom, label, tema, step, zoom)
+
+    def buat():
+        from idsd_core.choropleth import render_peta_vektor
+
+        meta = {"layer": NAMA_LAYER, "zoom_min": ZOOM_MIN, "zoom_max": ZOOM_MAX}
+        return render_peta_vektor(
+            meta, url, get_tahun(tahun), kolom, label or kolom, tahun, tema=tema, step=step, zoom=zoom
+        )
+
+    return cache_peta.ambil(kunci, buat)
+
+
+# ===== Ekspor Excel =====
+def ekspor_excel(tahun, kabupaten=()):
+    # Dikunci versi dataset + filter; xlsxwriter baru diimpor saat ekspor pertama
+    tahun = tuple(str(t) for t in tahun)
+    kabupaten = tuple(sorted(k for k in kabupaten if k != "Semua"))
+    versi = versi_data()
+
+    def buat():
+        from idsd_core.ekspor import workbook_excel
+
+        return workbook_excel(get_panel(), tahun, kabupaten, versi)
+
+    return cache_ekspor.ambil((versi, tahun, kabupaten), buat)
+
+
+# ===== Pemanasan cache worker =====
+def hangatkan(zoom=7):
+    # Dipanggil worker sebelum server Streamlit menerima koneksi (idsd_core/worker.py):
+    # sesi pertama langsung memakai panel, agregat, mesin & fitur peta yang sudah jadi
+    panel = get_panel()
+    agregat = get_agregat()
+    profil = get_profil()
+    for tahun in panel.tahun:
+        agregat.tahun(tahun)
+        profil.tahun(tahun)
+    get_komposit().dasar()
+    get_tren()
+    get_fitur_peta(zoom=zoom)
+    return info_cache()
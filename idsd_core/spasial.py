@@ -0,0 +1,39 @@
+# =======================================
+# 📍 Indeks spasial wilayah (STRtree) untuk klik peta
+# =======================================
+# Poligon wilayah (kabupaten; kecamatan memakai kelas yang sama) dimuat sekali
+# per versi geometri ke STRtree dengan geometri yang sudah di-prepare. Satu
+# klik = query kotak R-tree + uji point-in-polygon pada kandidat saja.
+# shapely baru diimpor saat indeks pertama dibuat, bukan saat worker start.
+
+
+class IndeksWilayah:
+    def __init__(self, fitur, kunci="kabupaten"):
+        import numpy as np
+        import shapely
+
+        self._shapely = shapely
+        self.label = np.array([f["properties"][kunci] for f in fitur], dtype=object)
+        self.geoms = np.array([shapely.geometry.shape(f["geometry"]) for f in fitur], dtype=object)
+        shapely.prepare(self.geoms)
+        # Dibagi semua sesi lewat service: read-only
+        self.label.flags.writeable = False
+        self.geoms.flags.writeable = False
+        self.pohon = shapely.STRtree(self.geoms)
+
+    def cari(self, lat, lon):
+        # Label wilayah yang memuat titik, atau None (laut / di luar NTT)
+        idx = self.pohon.query(self._shapely.Point(lon, lat), predicate="intersects")
+        return self.label[idx.min()] if len(idx) else None
+
+    def cari_banyak(self, lat, lon):
+        # Vektor: banyak titik sekaligus, hasil sejajar input (None bila di luar)
+        import numpy as np
+
+        titik = self._shapely.points(np.asarray(lon, dtype="float64"), np.asarray(lat, dtype="float64"))
+        i_titik, i_geom = self.pohon.query(titik, predicate="intersects")
+        hasil = np.full(len(titik), None, dtype=object)
+        # Titik tepat di batas dua wilayah: wilayah dengan indeks terkecil
+        urut = np.lexsort((i_geom, i_titik))[::-1]
+        hasil[i_titik[urut]] = self.label[i_geom[urut]]
+        return hasil
@@ -0,0 +1,294 @@
+# =======================================
+# 🗄️ Store kolumnar skor IDSD (Arrow IPC)
+# =======================================
+# CSV lebar (data_<tahun>_lengkap.csv) dikompilasi sekali menjadi file Arrow IPC
+# bertipe tetap. Saat runtime file dibuka lewat memory-map sehingga tidak ada
+# lagi tokenizing CSV maupun inferensi dtype / pd.to_numeric di setiap rerun.
+# Satu file per tahun (partisi): tahun baru cukup ditambah CSV-nya, hanya
+# partisi yang berubah yang dikompilasi ulang, dan skema tiap partisi
+# (kabupaten + kolom) dicatat di manifest supaya panel bisa disusun tanpa
+# membaca datanya. Setiap CSV yang dikompilasi divalidasi dulu (validasi.py);
+# bila ada galat, build ditolak sebelum satu partisi pun diganti.
+import glob
+import hashlib
+import json
+import os
+import re
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from idsd_core.kabupaten import indeks_kabupaten, koreksi_sumber, laporan
+from idsd_core.selaras import ALGORITMA as ALGORITMA_SELARAS
+from idsd_core.selaras import selaraskan
+from idsd_core.validasi import DataTidakValid, susun_laporan, validasi_tahun
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POLA_SUMBER = re.compile(r"^data_(\d{4})_lengkap\.csv$")
+FOLDER_STORE = os.path.join(ROOT_DIR, "data", "compiled")
+NAMA_MANIFEST = "manifest.json"
+NAMA_SELARAS = "selaras_indikator.json"
+NAMA_LAPORAN = "laporan_validasi.json"
+
+
+# ===== Sumber CSV =====
+def cari_sumber(folder=ROOT_DIR):
+    # Setiap data_<tahun>_lengkap.csv di root proyek otomatis menjadi satu tahun
+    sumber = {}
+    for path in sorted(glob.glob(os.path.join(folder, "data_*_lengkap.csv"))):
+        cocok = POLA_SUMBER.match(os.path.basename(path))
+        if cocok:
+            sumber[cocok.group(1)] = path
+    return sumber
+
+
+SUMBER_CSV = cari_sumber()
+
+
+# ===== Helper =====
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 16), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _path_tahun(tahun, folder):
+    return os.path.join(folder, f"idsd_{tahun}.arrow")
+
+
+def _path_tmp(path):
+    # Unik per proses: worker supervisor bisa membangun store bersamaan
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def _tulis_json(path, isi, **opsi):
+    with open(_path_tmp(path), "w", encoding="utf-8") as f:
+        json.dump(isi, f, **opsi)
+    os.replace(_path_tmp(path), path)
+
+
+def _stat_sumber(path):
+    st_ = os.stat(path)
+    return {"size": st_.st_size, "mtime": st_.st_mtime}
+
+
+# ===== Kompilasi CSV -> Arrow =====
+def csv_to_table(path_csv, tahun=None):
+    # Satu-satunya tempat CSV diparse: kabupaten dipetakan ke nama kanonik
+    # registri, blok nilai divalidasi & dipaksa float64 sekaligus. NaN disimpan
+    # apa adanya (bukan null Arrow) supaya konversi ke pandas bisa zero-copy.
+    df = pd.read_csv(path_csv)
+    kabupaten, hasil = indeks_kabupaten().kanonik(df["kabupaten"], koreksi=koreksi_sumber(path_csv))
+    nilai, temuan = validasi_tahun(tahun, df, hasil)
+
+    arrays = [pa.array(kabupaten.to_numpy(dtype=object), type=pa.string())]
+    names = ["kabupaten"]
+    for j, col in enumerate(c for c in df.columns if c != "kabupaten"):
+        arrays.append(pa.array(nilai[:, j], type=pa.float64()))
+        names.append(col)
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table, laporan(hasil), temuan
+
+
+def _kompilasi_tahun(tahun, path_csv):
+    # Parse + validasi saja; partisi baru ditulis setelah semua tahun lolos
+    table, laporan_kab, temuan = csv_to_table(path_csv, tahun)
+    info = {
+        "file": os.path.basename(_path_tahun(tahun, "")),
+        "sumber": os.path.relpath(path_csv, ROOT_DIR),
+        "sha256": _hash_file(path_csv),
+        "stat": _stat_sumber(path_csv),
+        "baris": table.num_rows,
+        "kolom": table.num_columns,
+        "kabupaten": laporan_kab,
+        "validasi": temuan,
+        "skema": {
+            "kabupaten": list(dict.fromkeys(table.column("kabupaten").to_pylist())),
+            "kolom": table.column_names[1:],
+        },
+    }
+    return table, info
+
+
+def _tulis_partisi(table, tahun, folder):
+    path_out = _path_tahun(tahun, folder)
+    tmp = _path_tmp(path_out)
+    # Tanpa kompresi: file IPC mentah bisa di-memory-map langsung
+    with pa.OSFile(tmp, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path_out)
+
+
+def _tulis_laporan(laporan_validasi, sumber, folder):
+    # Sidik sumber ikut dicatat: sumber yang sama tidak divalidasi ulang tiap request
+    laporan_validasi = {**laporan_validasi, "sumber": {t: _stat_sumber(p) for t, p in sorted(sumber.items())}}
+    _tulis_json(os.path.join(folder, NAMA_LAPORAN), laporan_validasi, indent=1, ensure_ascii=False)
+    return laporan_validasi
+
+
+def _partisi_segar(info, path_csv, folder):
+    if info is None or "skema" not in info:
+        return False
+    if not os.path.exists(os.path.join(folder, info["file"])):
+        return False
+    # Cukup os.stat: CSV tidak perlu dibaca ulang untuk cek kesegaran
+    if "validasi" not in info:
+        return False
+    return not os.path.exists(path_csv) or _stat_sumber(path_csv) == info["stat"]
+
+
+def build_store(sumber=None, folder=FOLDER_STORE, lama=None):
+    # `lama` = manifest sebelumnya; partisi yang masih segar dipakai ulang
+    sumber = sumber or cari_sumber()
+    os.makedirs(folder, exist_ok=True)
+    if lama is None or lama.get("registri") != indeks_kabupaten().versi:
+        lama = {"tahun": {}}
+
+    # Tahap 1: kompilasi + validasi tahun yang basi di memori
+    manifest = {"tahun": {}}
+    baru = {}
+    for tahun, path_csv in sorted(sumber.items()):
+        info = lama["tahun"].get(tahun)
+        if not _partisi_segar(info, path_csv, folder):
+            baru[tahun], info = _kompilasi_tahun(tahun, path_csv)
+        manifest["tahun"][tahun] = info
+
+    # Laporan mencakup semua tahun (temuan partisi segar diambil dari manifest)
+    laporan_validasi = susun_laporan({t: info["validasi"] for t, info in manifest["tahun"].items()})
+    laporan_validasi = _tulis_laporan(laporan_validasi, sumber, folder)
+    if laporan_validasi["status"] != "lulus":
+        raise DataTidakValid(laporan_validasi)
+
+    # Tahap 2: baru sekarang partisi diganti
+    for tahun, table in baru.items():
+        _tulis_partisi(table, tahun, folder)
+
+    # Partisi tahun yang CSV-nya sudah dihapus ikut dibuang
+    for tahun in set(lama["tahun"]) - set(sumber):
+        path = _path_tahun(tahun, folder)
+        if os.path.exists(path):
+            os.remove(path)
+
+    manifest["selaras"] = _build_selaras(manifest, folder)
+
+    # Versi ikut berubah bila registri kabupaten berubah (nama kanonik beda)
+    # atau pemetaan indikator lintas tahun berubah
+    gabungan = "".join(manifest["tahun"][t]["sha256"] for t in sorted(manifest["tahun"]))
+    gabungan += indeks_kabupaten().versi + manifest["selaras"]["versi"]
+    manifest["versi"] = hashlib.sha256(gabungan.encode()).hexdigest()[:12]
+    manifest["registri"] = indeks_kabupaten().versi
+    manifest["validasi"] = {"file": NAMA_LAPORAN, "status": laporan_validasi["status"]}
+
+    _tulis_json(os.path.join(folder, NAMA_MANIFEST), manifest, indent=2)
+    return manifest
+
+
+def _build_selaras(manifest, folder):
+    # Artefak pemetaan indikator lintas tahun; ID artefak lama dipakai ulang supaya stabil
+    frames = {
+        tahun: ipc.open_file(pa.memory_map(os.path.join(folder, info["file"]), "r")).read_pandas()
+        for tahun, info in manifest["tahun"].items()
+    }
+    lama = baca_selaras(folder)
+    artefak = selaraskan(frames, lama)
+    _tulis_json(os.path.join(folder, NAMA_SELARAS), artefak, indent=2, ensure_ascii=False)
+
+    lintas = sum(len(info["kolom"]) > 1 for info in artefak["indikator"].values())
+    return {
+        "file": NAMA_SELARAS,
+        "versi": artefak["versi"],
+        "algoritma": artefak["algoritma"],
+        "indikator": len(artefak["indikator"]),
+        "lintas_tahun": lintas,
+    }
+
+
+def baca_selaras(folder=FOLDER_STORE):
+    path = os.path.join(folder, NAMA_SELARAS)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ===== Manifest & versi dataset =====
+def _baca_manifest(folder):
+    path = os.path.join(folder, NAMA_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def baca_laporan_validasi(folder=FOLDER_STORE):
+    path = os.path.join(folder, NAMA_LAPORAN)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _store_basi(manifest, sumber, folder):
+    if manifest is None or set(manifest["tahun"]) != set(sumber):
+        return True
+    if manifest.get("registri") != indeks_kabupaten().versi:
+        return True
+    selaras = manifest.get("selaras")
+    if not selaras or selaras["algoritma"] != ALGORITMA_SELARAS:
+        return True
+    if not os.path.exists(os.path.join(folder, selaras["file"])):
+        return True
+    return not all(_partisi_segar(manifest["tahun"][t], path, folder) for t, path in sumber.items())
+
+
+def ensure_store(sumber=None, folder=FOLDER_STORE):
+    sumber = sumber or cari_sumber()
+    manifest = _baca_manifest(folder)
+    if not _store_basi(manifest, sumber, folder):
+        return manifest
+    if manifest is not None:
+        # Sumber yang sama sudah pernah ditolak: tetap sajikan store terakhir yang lolos
+        ditolak = baca_laporan_validasi(folder)
+        stat = {t: _stat_sumber(p) for t, p in sorted(sumber.items()) if os.path.exists(p)}
+        if ditolak and ditolak["status"] == "ditolak" and ditolak.get("sumber") == stat:
+            return manifest
+    try:
+        return build_store(sumber, folder, lama=manifest)
+    except DataTidakValid as e:
+        if manifest is None:
+            raise
+        warnings.warn(f"{e} -- store lama (versi {manifest['versi']}) tetap dipakai; lihat {NAMA_LAPORAN}")
+        return manifest
+
+
+def daftar_tahun_store(folder=FOLDER_STORE):
+    return sorted(ensure_store(folder=folder)["tahun"])
+
+
+def skema_tahun(tahun, folder=FOLDER_STORE):
+    # Kabupaten & kolom satu partisi, dari manifest (file Arrow tidak disentuh)
+    return ensure_store(folder=folder)["tahun"][str(tahun)]["skema"]
+
+
+def dataset_version(folder=FOLDER_STORE):
+    return ensure_store(folder=folder)["versi"]
+
+
+# ===== Loader zero-copy =====
+def load_table(tahun, folder=FOLDER_STORE):
+    ensure_store(folder=folder)
+    source = pa.memory_map(_path_tahun(tahun, folder), "r")
+    return ipc.open_file(source).read_all()
+
+
+def load_tahun(tahun, folder=FOLDER_STORE):
+    table = load_table(tahun, folder)
+    # split_blocks menghindari konsolidasi blok; kolom float tanpa null
+    # menjadi view langsung ke buffer memory-map (read-only)
+    return table.to_pandas(split_blocks=True)
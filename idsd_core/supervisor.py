@@ -0,0 +1,361 @@
+# =======================================
+# 🧭 Supervisor multi-worker + reverse proxy lokal
+# =======================================
+# N worker Streamlit (idsd_core/worker.py, cache data sudah hangat) di port
+# lokal 127.0.0.1, di belakang satu reverse proxy asyncio ringan:
+#   - sticky session: cookie idsd_worker=<slot>. Sesi Streamlit (websocket,
+#     file media/upload) hidup di satu proses, jadi semua request satu browser
+#     harus ke worker yang sama. Tanpa cookie (atau worker-nya tidak sehat):
+#     worker sehat dengan koneksi aktif paling sedikit.
+#   - health check /_stcore/health berkala; worker yang gagal GAGAL_HEALTH kali
+#     berturut-turut dikeluarkan dari rotasi lalu dimatikan
+#   - worker yang mati dinyalakan ulang dengan backoff eksponensial
+#     (BACKOFF_AWAL, 2x, 4x, ... maks BACKOFF_MAKS); hitungan direset bila
+#     worker sempat hidup stabil
+#   - rolling restart (SIGHUP): satu slot per giliran, pengganti dinyalakan di
+#     port baru dan ditunggu sehat sebelum worker lama dikuras & dihentikan;
+#     browser yang tersambung ke worker lama tersambung ulang ke penggantinya
+#   - /tiles/... diteruskan ke server tile kecamatan (idsd_core/tiles.py) yang
+#     dijalankan supervisor; worker menanam URL tile relatif, jadi peta
+#     kecamatan tetap jalan dari browser di mesin lain / lewat ngrok
+# Setelah kepala request dibaca, proxy hanya meneruskan byte dua arah, jadi
+# websocket /_stcore/stream ikut lewat tanpa parser HTTP penuh. Karena itu
+# request HTTP biasa dikirim dengan Connection: close: setiap request baru
+# membuka koneksi baru dan dirutekan ulang (tile vs worker).
+import asyncio
+import os
+import re
+import secrets
+import signal
+import socket
+import sys
+import time
+
+from idsd_core.store import ROOT_DIR
+from idsd_core.tiles import HOST_TILES, mulai_server_latar, port_server
+
+HOST_WORKER = "127.0.0.1"
+NAMA_COOKIE = "idsd_worker"
+POLA_COOKIE = re.compile(rb"^cookie:.*?\b" + NAMA_COOKIE.encode() + rb"=(\d+)", re.IGNORECASE | re.MULTILINE)
+POLA_TILES = re.compile(rb"^[A-Z]+ /tiles/")
+POLA_UPGRADE = re.compile(rb"^upgrade:", re.IGNORECASE | re.MULTILINE)
+POLA_CONNECTION = re.compile(rb"^connection:[^\r\n]*\r\n", re.IGNORECASE | re.MULTILINE)
+
+INTERVAL_HEALTH = 5.0  # detik antar health check
+BATAS_HEALTH = 3.0  # timeout satu health check
+GAGAL_HEALTH = 3  # gagal berturut-turut sebelum worker dikeluarkan
+BATAS_SIAP = 120.0  # worker baru harus sehat dalam waktu ini (termasuk pemanasan cache)
+BACKOFF_AWAL = 1.0
+BACKOFF_MAKS = 60.0
+STABIL = 60.0  # worker yang hidup selama ini dianggap stabil: backoff direset
+BATAS_KURAS = 30.0  # rolling restart: tunggu koneksi worker lama selesai
+BATAS_KEPALA = 30.0  # timeout membaca kepala request dari browser
+
+
+def port_kosong(host=HOST_WORKER):
+    # Port dipilih kernel (bind port 0), bukan scan connect_ex
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def _log(pesan):
+    print(f"{time.strftime('%H:%M:%S')} {pesan}", flush=True)
+
+
+def _tanpa_keepalive(kepala):
+    # Websocket (Upgrade) dibiarkan; request HTTP biasa: satu request per koneksi
+    if POLA_UPGRADE.search(kepala):
+        return kepala
+    return POLA_CONNECTION.sub(b"", kepala)[:-2] + b"Connection: close\r\n\r\n"
+
+
+def _respons(status, teks):
+    isi = teks.encode()
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(isi)}\r\nRetry-After: 2\r\nConnection: close\r\n\r\n"
+    ).encode() + isi
+
+
+class Worker:
+    def __init__(self, slot, port, proses):
+        self.slot = slot
+        self.port = port
+        self.proses = proses
+        self.mulai = time.monotonic()
+        self.sehat = False
+        self.gagal = 0
+        self.koneksi = 0
+        self.dihentikan = False  # dihentikan supervisor (bukan crash)
+
+    async def cek_health(self):
+        try:
+            sambung = asyncio.open_connection(HOST_WORKER, self.port)
+            reader, writer = await asyncio.wait_for(sambung, BATAS_HEALTH)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            writer.write(
+                f"GET /_stcore/health HTTP/1.1\r\nHost: {HOST_WORKER}\r\nConnection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+            baris = await asyncio.wait_for(reader.readline(), BATAS_HEALTH)
+            return baris.split(b" ")[1:2] == [b"200"]
+        except (OSError, asyncio.TimeoutError, IndexError):
+            return False
+        finally:
+            writer.close()
+
+    async def hentikan(self, batas=10.0):
+        self.dihentikan = True
+        self.sehat = False
+        if self.proses.returncode is not None:
+            return
+        self.proses.terminate()
+        try:
+            await asyncio.wait_for(self.proses.wait(), batas)
+        except asyncio.TimeoutError:
+            self.proses.kill()
+            await self.proses.wait()
+
+
+class Supervisor:
+    def __init__(self, app, jumlah, host="0.0.0.0", port=8501, opsi_streamlit=()):
+        self.app = os.path.abspath(app)
+        self.jumlah = jumlah
+        self.host = host
+        self.port = port
+        # Semua worker memakai secret cookie yang sama: cookie XSRF tetap sah
+        # ketika browser pindah worker setelah failover
+        # (opsi ini hanya boleh lewat environment, bukan flag CLI)
+        self.env = {**os.environ, "STREAMLIT_SERVER_COOKIE_SECRET": secrets.token_hex(16)}
+        # URL tile relatif (lewat proxy ini), kecuali IDSD_TILE_URL sudah di-set
+        self.env.setdefault("IDSD_TILE_URL", "")
+        self.port_tiles = port_server()
+        self.opsi_streamlit = list(opsi_streamlit)
+        self.aktif = [None] * jumlah  # slot -> Worker yang menerima koneksi baru
+        self._berhenti = asyncio.Event()
+        self._restart = None
+
+    # ===== Worker =====
+    async def _nyalakan(self, slot):
+        # Worker baru di port kosong; None bila tidak sehat dalam BATAS_SIAP
+        port = port_kosong()
+        proses = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "idsd_core.worker", self.app, "--port", str(port), *self.opsi_streamlit,
+            cwd=ROOT_DIR, env=self.env,
+        )
+        worker = Worker(slot, port, proses)
+        batas = time.monotonic() + BATAS_SIAP
+        try:
+            while time.monotonic() < batas and proses.returncode is None:
+                if await worker.cek_health():
+                    worker.sehat = True
+                    _log(f"✅ worker {slot} siap di :{port} (pid {proses.pid}, "
+                         f"{time.monotonic() - worker.mulai:.1f} s)")
+                    return worker
+                await asyncio.sleep(0.5)
+        except asyncio.CancelledError:
+            await worker.hentikan()
+            raise
+        if proses.returncode is None:
+            _log(f"❌ worker {slot} tidak sehat dalam {BATAS_SIAP:.0f} s")
+        else:
+            _log(f"❌ worker {slot} berhenti sebelum siap (kode {proses.returncode})")
+        await worker.hentikan()
+        return None
+
+    async def _jaga(self, slot):
+        # Satu task per slot: nyalakan, tunggu mati, nyalakan ulang dengan backoff
+        gagal = 0
+        while not self._berhenti.is_set():
+            worker = self.aktif[slot]
+            if worker is None:
+                worker = await self._nyalakan(slot)
+                if worker is None:
+                    gagal += 1
+                    await self._tunda(slot, gagal)
+                    continue
+                if self.aktif[slot] is not None:
+                    # Rolling restart sudah memasang pengganti selama worker ini dinyalakan
+                    await worker.hentikan()
+                    continue
+                self.aktif[slot] = worker
+            kode = await worker.proses.wait()
+            if self._berhenti.is_set():
+                return
+            if self.aktif[slot] is not worker:
+                continue  # diganti saat rolling restart, bukan crash
+            self.aktif[slot] = None
+            worker.sehat = False
+            umur = time.monotonic() - worker.mulai
+            gagal = 1 if umur >= STABIL else gagal + 1
+            _log(f"⚠️ worker {slot} (:{worker.port}) berhenti, kode {kode}, umur {umur:.0f} s")
+            await self._tunda(slot, gagal)
+
+    async def _tunda(self, slot, gagal):
+        jeda = min(BACKOFF_MAKS, BACKOFF_AWAL * 2 ** (gagal - 1))
+        _log(f"⏳ worker {slot} dinyalakan ulang dalam {jeda:.0f} s (percobaan ke-{gagal})")
+        try:
+            await asyncio.wait_for(self._berhenti.wait(), jeda)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _pantau_health(self):
+        while not self._berhenti.is_set():
+            for worker in list(self.aktif):
+                if worker is None or worker.dihentikan:
+                    continue
+                if await worker.cek_health():
+                    worker.gagal = 0
+                    worker.sehat = True
+                    continue
+                worker.gagal += 1
+                if worker.gagal >= GAGAL_HEALTH and worker.sehat:
+                    # Keluar dari rotasi; proses dimatikan supaya _jaga menyalakan ulang
+                    _log(f"🚑 worker {worker.slot} (:{worker.port}) gagal health check {worker.gagal}x")
+                    worker.sehat = False
+                    worker.proses.terminate()
+            try:
+                await asyncio.wait_for(self._berhenti.wait(), INTERVAL_HEALTH)
+            except asyncio.TimeoutError:
+                pass
+
+    async def restart_bergulir(self):
+        # Satu slot per giliran: kapasitas tidak pernah turun lebih dari satu worker
+        _log("🔄 Rolling restart dimulai")
+        for slot in range(self.jumlah):
+            if self._berhenti.is_set():
+                return
+            baru = await self._nyalakan(slot)
+            if baru is None:
+                _log(f"❌ Rolling restart dihentikan: pengganti worker {slot} gagal, "
+                     "worker lama dipertahankan")
+                return
+            lama, self.aktif[slot] = self.aktif[slot], baru
+            if lama is not None:
+                batas = time.monotonic() + BATAS_KURAS
+                while lama.koneksi and time.monotonic() < batas:
+                    await asyncio.sleep(0.5)
+                await lama.hentikan()
+        _log("✅ Rolling restart selesai")
+
+    def minta_restart(self):
+        if self._restart is None or self._restart.done():
+            self._restart = asyncio.ensure_future(self.restart_bergulir())
+
+    # ===== Proxy =====
+    def _pilih(self, kepala):
+        cocok = POLA_COOKIE.search(kepala)
+        if cocok:
+            slot = int(cocok.group(1))
+            if 0 <= slot < self.jumlah and self.aktif[slot] is not None and self.aktif[slot].sehat:
+                return self.aktif[slot], True
+        sehat = [w for w in self.aktif if w is not None and w.sehat]
+        if not sehat:
+            return None, False
+        return min(sehat, key=lambda w: w.koneksi), False
+
+    async def _layani(self, reader, writer):
+        worker = None
+        upstream = None
+        try:
+            try:
+                kepala = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), BATAS_KEPALA)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, OSError):
+                return
+            kepala = _tanpa_keepalive(kepala)
+            if POLA_TILES.match(kepala):
+                # Tile kecamatan lewat origin yang sama, bukan ke worker
+                try:
+                    r_up, upstream = await asyncio.open_connection(HOST_TILES, self.port_tiles)
+                except OSError:
+                    writer.write(_respons("503 Service Unavailable", "Server tile tidak tersedia."))
+                    await writer.drain()
+                    return
+                lengket = True  # tile tidak butuh cookie worker
+            while upstream is None:
+                worker, lengket = self._pilih(kepala)
+                if worker is None:
+                    writer.write(_respons("503 Service Unavailable", "Dashboard sedang dinyalakan ulang."))
+                    await writer.drain()
+                    return
+                # Dihitung sebelum connect supaya koneksi serentak tersebar merata
+                worker.koneksi += 1
+                try:
+                    r_up, upstream = await asyncio.open_connection(HOST_WORKER, worker.port)
+                except OSError:
+                    # Worker mati di antara dua health check: keluarkan, coba worker sehat lain
+                    _log(f"🚑 worker {worker.slot} (:{worker.port}) menolak koneksi")
+                    worker.sehat = False
+                    worker.koneksi -= 1
+                    worker = None
+            upstream.write(kepala)
+            if not lengket:
+                await self._sisipkan_cookie(r_up, writer, worker.slot)
+            await asyncio.gather(_salurkan(reader, upstream), _salurkan(r_up, writer), return_exceptions=True)
+        finally:
+            if worker is not None:
+                worker.koneksi -= 1
+            if upstream is not None:
+                upstream.close()
+            writer.close()
+
+    async def _sisipkan_cookie(self, r_up, writer, slot):
+        # Set-Cookie ditambahkan ke kepala respons pertama koneksi ini
+        try:
+            kepala = await r_up.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            return
+        cookie = f"Set-Cookie: {NAMA_COOKIE}={slot}; Path=/; HttpOnly; SameSite=Lax\r\n".encode()
+        writer.write(kepala[:-2] + cookie + b"\r\n")
+        await writer.drain()
+
+    # ===== Jalankan =====
+    async def jalankan(self):
+        loop = asyncio.get_running_loop()
+        for sinyal in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sinyal, self._berhenti.set)
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, self.minta_restart)
+
+        # Server tile dipegang supervisor (bukan worker) supaya tetap hidup saat worker
+        # dinyalakan ulang; worker mendapati port-nya terpakai (dan menjawab TileJSON)
+        # sehingga tidak membuat sendiri. Bila port default dipakai proses lain, server
+        # pindah port: proxy & worker (IDSD_TILE_PORT) mengikuti port sebenarnya.
+        try:
+            await loop.run_in_executor(None, mulai_server_latar)
+        except (ImportError, FileNotFoundError) as e:
+            _log(f"⚠️ Server tile kecamatan tidak dijalankan: {e}")
+        else:
+            self.port_tiles = port_server()
+            self.env["IDSD_TILE_PORT"] = str(self.port_tiles)
+
+        server = await asyncio.start_server(self._layani, self.host, self.port)
+        nama = os.path.basename(self.app)
+        _log(f"🧭 Proxy di http://{self.host}:{self.port} -> {self.jumlah} worker ({nama})")
+        tugas = [asyncio.ensure_future(self._jaga(slot)) for slot in range(self.jumlah)]
+        tugas.append(asyncio.ensure_future(self._pantau_health()))
+        try:
+            await self._berhenti.wait()
+        finally:
+            _log("👋 Menghentikan proxy & worker...")
+            server.close()
+            await asyncio.gather(*(w.hentikan() for w in self.aktif if w is not None))
+            for t in tugas:
+                t.cancel()
+            await asyncio.gather(*tugas, return_exceptions=True)
+
+
+async def _salurkan(sumber, tujuan):
+    try:
+        while True:
+            data = await sumber.read(1 << 16)
+            if not data:
+                break
+            tujuan.write(data)
+            await tujuan.drain()
+    finally:
+        # Satu arah selesai: sisi lain ikut ditutup supaya pasangan task berakhir
+        tujuan.close()
@@ -0,0 +1,248 @@
+# =======================================
+# 🧱 Vector tile kecamatan: MBTiles + endpoint tile lokal
+# =======================================
+# Batas kecamatan terlalu berat untuk dikirim utuh lewat folium. Saat build
+# (idsd_core/tiles_build.py) batas dipotong menjadi Mapbox Vector Tiles per
+# zoom dan disimpan di satu file MBTiles (SQLite). Runtime cukup modul ini:
+# pembaca MBTiles + server HTTP kecil (stdlib) yang melayani
+#   /tiles/{z}/{x}/{y}.pbf   tile gzip, Cache-Control + ETag per versi
+#   /tiles/metadata.json     TileJSON (bounds, zoom, layer)
+# Browser hanya meminta tile yang terlihat di layar, di zoom berapa pun.
+# URL tile yang ditanam di HTML peta:
+#   - IDSD_TILE_URL di-set   -> dipakai apa adanya (mis. https://tiles.contoh.id);
+#     string kosong = path relatif /tiles/..., lewat origin dashboard itu sendiri
+#   - run_idsd_dashboard.py  -> relatif: proxy supervisor meneruskan /tiles/ ke
+#     server tile, jadi tetap jalan dari browser lain / lewat ngrok
+#   - streamlit run biasa    -> http://127.0.0.1:<IDSD_TILE_PORT>, hanya untuk
+#     browser di mesin yang sama
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import warnings
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from idsd_core.kabupaten import indeks_kabupaten
+from idsd_core.store import FOLDER_STORE, ROOT_DIR
+
+SUMBER_KECAMATAN = os.path.join(ROOT_DIR, "data", "geojson_kecamatan_ntt_official.geojson")
+FOLDER_GEOJSON_KABUPATEN = os.path.join(ROOT_DIR, "GeoJSON", "NTT_kabupaten")
+NAMA_MBTILES = "kecamatan.mbtiles"
+NAMA_MANIFEST_TILES = "tiles_manifest.json"
+
+NAMA_LAYER = "kecamatan"
+ZOOM_MIN = 5
+ZOOM_MAX = 13  # di atas ini Leaflet memperbesar tile zoom 13 (overzoom)
+EXTENT = 4096
+BUFFER = 64  # unit tile di luar tepi, supaya garis batas tidak terpotong
+
+HOST_TILES = "127.0.0.1"
+PORT_TILES = int(os.environ.get("IDSD_TILE_PORT", "8765"))
+
+MIME_MVT = "application/vnd.mapbox-vector-tile"
+POLA_URL = re.compile(r"^/tiles/(\d+)/(\d+)/(\d+)\.pbf$")
+
+
+# ===== Sumber =====
+def daftar_sumber():
+    # File kosong ("{}") tetap didaftar; build yang melaporkan dan melewatinya
+    paths = [SUMBER_KECAMATAN] if os.path.exists(SUMBER_KECAMATAN) else []
+    return paths + sorted(glob.glob(os.path.join(FOLDER_GEOJSON_KABUPATEN, "*.geojson")))
+
+
+def _stat_sumber(paths):
+    return {os.path.relpath(p, ROOT_DIR): os.stat(p).st_mtime for p in paths}
+
+
+def path_mbtiles(folder=FOLDER_STORE):
+    return os.path.join(folder, NAMA_MBTILES)
+
+
+def ensure_tiles(folder=FOLDER_STORE):
+    path = os.path.join(folder, NAMA_MANIFEST_TILES)
+    paths = daftar_sumber()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        segar = (
+            manifest["stat"] == _stat_sumber(paths)
+            and manifest.get("registri") == indeks_kabupaten().versi
+            and os.path.exists(path_mbtiles(folder))
+        )
+        if segar:
+            return manifest
+    # Build (geopandas + mapbox_vector_tile) hanya diimpor bila tiles belum ada / basi
+    from idsd_core.tiles_build import build_tiles
+
+    return build_tiles(paths, folder)
+
+
+# ===== Pembaca MBTiles =====
+class PembacaMBTiles:
+    def __init__(self, path):
+        self.path = path
+        self._lokal = threading.local()
+
+    def _koneksi(self):
+        # Satu koneksi read-only per thread; dibuka ulang bila file diganti build baru
+        mtime = os.stat(self.path).st_mtime
+        koneksi = getattr(self._lokal, "koneksi", None)
+        if koneksi is None or self._lokal.mtime != mtime:
+            if koneksi is not None:
+                koneksi.close()
+            koneksi = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._lokal.koneksi, self._lokal.mtime = koneksi, mtime
+        return koneksi
+
+    def tile(self, z, x, y):
+        # MBTiles memakai baris TMS (y dari bawah)
+        baris = self._koneksi().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone()
+        return baris[0] if baris else None
+
+    def metadata(self):
+        return dict(self._koneksi().execute("SELECT name, value FROM metadata").fetchall())
+
+
+# ===== Server tile =====
+def _buat_handler(pembaca):
+    class HandlerTiles(BaseHTTPRequestHandler):
+        def _kirim(self, status, isi=b"", header=None):
+            self.send_response(status)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            for kunci, nilai in (header or {}).items():
+                self.send_header(kunci, nilai)
+            self.send_header("Content-Length", str(len(isi)))
+            self.end_headers()
+            if isi and self.command != "HEAD":
+                self.wfile.write(isi)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            meta = pembaca.metadata()
+            versi = meta.get("versi", "")
+            # URL dengan ?v=<versi> tidak pernah berubah isinya -> boleh di-cache selamanya
+            abadi = parse_qs(url.query).get("v", [None])[0] == versi
+            cache = "public, max-age=31536000, immutable" if abadi else "public, max-age=3600"
+
+            if url.path == "/tiles/metadata.json":
+                isi = json.dumps(tilejson(meta, _url_dasar(self.headers.get("Host")))).encode()
+                return self._kirim(200, isi, {"Content-Type": "application/json", "Cache-Control": "no-cache"})
+
+            cocok = POLA_URL.match(url.path)
+            if not cocok:
+                return self._kirim(404)
+            z, x, y = (int(v) for v in cocok.groups())
+            etag = f'"{versi}-{z}-{x}-{y}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._kirim(304, header={"ETag": etag, "Cache-Control": cache})
+
+            data = pembaca.tile(z, x, y) if 0 <= x < (1 << z) and 0 <= y < (1 << z) else None
+            if data is None:
+                # Laut / di luar NTT: kosong, tetap boleh di-cache
+                return self._kirim(204, header={"Cache-Control": cache})
+
+            header = {"Content-Type": MIME_MVT, "Cache-Control": cache, "ETag": etag}
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                header["Content-Encoding"] = "gzip"
+            else:
+                data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+            return self._kirim(200, data, header)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    return HandlerTiles
+
+
+def _url_dasar(host=None):
+    url = os.environ.get("IDSD_TILE_URL")
+    if url is not None:
+        return url.rstrip("/")
+    return f"http://{host or f'{HOST_TILES}:{PORT_TILES}'}"
+
+
+def tilejson(meta, url_dasar=None):
+    return {
+        "tilejson": "2.2.0",
+        "name": meta.get("name"),
+        "version": meta.get("versi"),
+        "scheme": "xyz",
+        "tiles": [f"{url_dasar or _url_dasar()}/tiles/{{z}}/{{x}}/{{y}}.pbf?v={meta.get('versi')}"],
+        "minzoom": int(meta.get("minzoom", ZOOM_MIN)),
+        "maxzoom": int(meta.get("maxzoom", ZOOM_MAX)),
+        "bounds": [float(v) for v in meta.get("bounds", "-180,-85,180,85").split(",")],
+        "vector_layers": json.loads(meta.get("json", "{}")).get("vector_layers", []),
+    }
+
+
+def buat_server(host=HOST_TILES, port=PORT_TILES, folder=FOLDER_STORE):
+    ensure_tiles(folder)
+    return ThreadingHTTPServer((host, port), _buat_handler(PembacaMBTiles(path_mbtiles(folder))))
+
+
+_SERVER = None
+_PORT = {}  # port tempat server tile proses ini sebenarnya melayani
+_LOCK = threading.Lock()
+
+
+def cek_server_tiles(host=HOST_TILES, port=PORT_TILES, timeout=1.0):
+    # Versi tile bila port itu benar-benar server tile (TileJSON di /tiles/metadata.json), else None.
+    # urllib.request (~45 ms impor) hanya dibutuhkan bila port sudah terpakai
+    from urllib.request import urlopen
+
+    try:
+        with urlopen(f"http://{host}:{port}/tiles/metadata.json", timeout=timeout) as respons:
+            meta = json.loads(respons.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or "tilejson" not in meta:
+        return None
+    return meta.get("version") or ""
+
+
+def mulai_server_latar(host=HOST_TILES, port=PORT_TILES, folder=FOLDER_STORE):
+    # Sekali per proses. Port yang sudah dipakai hanya dianggap server tile bersama
+    # (worker lain / serve_tiles.py) bila /tiles/metadata.json-nya menjawab TileJSON;
+    # kalau bukan, server tile dijalankan di port lain pilihan kernel.
+    global _SERVER
+    with _LOCK:
+        if _SERVER is None:
+            versi = ensure_tiles(folder)["versi"]
+            try:
+                _SERVER = buat_server(host, port, folder)
+            except OSError as e:
+                versi_lain = cek_server_tiles(host, port)
+                if versi_lain is None:
+                    _SERVER = buat_server(host, 0, folder)
+                    warnings.warn(
+                        f"❌ Port {port} dipakai proses lain yang bukan server tile ({e}); "
+                        f"server tile dijalankan di port {_SERVER.server_address[1]}"
+                    )
+                else:
+                    _SERVER = False
+                    _PORT[(host, port)] = port
+                    if versi_lain != versi:
+                        warnings.warn(f"⚠️ Server tile di port {port} melayani versi {versi_lain}, bukan {versi}")
+            if _SERVER:
+                _PORT[(host, port)] = _SERVER.server_address[1]
+                threading.Thread(target=_SERVER.serve_forever, name="server-tiles", daemon=True).start()
+    return _url_dasar(f"{host}:{_PORT.get((host, port), port)}")
+
+
+def port_server(host=HOST_TILES, port=PORT_TILES):
+    # Port sebenarnya setelah mulai_server_latar (bisa berbeda bila port diminta terpakai)
+    with _LOCK:
+        return _PORT.get((host, port), port)
+
+
+def url_tiles(url_dasar, versi):
+    return f"{url_dasar}/tiles/{{z}}/{{x}}/{{y}}.pbf?v={versi}"
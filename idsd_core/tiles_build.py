@@ -0,0 +1,221 @@
+# =======================================
+# 🔧 Build vector tile kecamatan -> MBTiles (butuh geopandas/shapely/mapbox_vector_tile)
+# =======================================
+# Hanya dipakai saat build_tiles.py / sumber GeoJSON berubah. Per zoom:
+# geometri (EPSG:3857) disederhanakan sekali dengan toleransi ~1 unit tile,
+# lalu untuk setiap tile yang bersinggungan (STRtree) fitur dipotong ke kotak
+# tile + buffer, dienkode MVT, di-gzip, dan ditulis ke SQLite MBTiles.
+import gzip
+import hashlib
+import json
+import math
+import os
+import sqlite3
+
+import geopandas as gpd
+import mapbox_vector_tile
+import pandas as pd
+import shapely
+
+from idsd_core.kabupaten import indeks_kabupaten, laporan
+from idsd_core.store import FOLDER_STORE, ROOT_DIR
+from idsd_core.tiles import (
+    BUFFER,
+    EXTENT,
+    NAMA_LAYER,
+    NAMA_MANIFEST_TILES,
+    ZOOM_MAX,
+    ZOOM_MIN,
+    _stat_sumber,
+    daftar_sumber,
+    path_mbtiles,
+)
+
+KOLOM_KECAMATAN = ["nm_kecamatan", "kecamatan", "WADMKC", "NAME_3", "nama_kec"]
+KOLOM_KODE_KECAMATAN = ["kd_kecamatan", "kode_kec", "KDCPUM", "GID_3"]
+KOLOM_KABUPATEN = ["kabupaten_final", "kabupaten", "nm_dati2", "WADMKK", "NAME_2"]
+
+R_BUMI = 6378137.0
+SETENGAH_DUNIA = math.pi * R_BUMI
+
+
+# ===== Sumber =====
+def _kolom(gdf, kandidat):
+    return next((c for c in kandidat if c in gdf.columns), None)
+
+
+def _baca_sumber(paths):
+    frames, dilewati = [], []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            isi = json.load(f)
+        if not isi.get("features"):
+            dilewati.append(os.path.relpath(path, ROOT_DIR))
+            continue
+        gdf = gpd.read_file(path)
+        kolom_kab = _kolom(gdf, KOLOM_KABUPATEN)
+        kolom_kec = _kolom(gdf, KOLOM_KECAMATAN)
+        kolom_kode = _kolom(gdf, KOLOM_KODE_KECAMATAN)
+        hasil = gpd.GeoDataFrame(
+            {
+                "nama_kabupaten": gdf[kolom_kab].astype(str) if kolom_kab else None,
+                "kecamatan": gdf[kolom_kec].astype(str) if kolom_kec else None,
+                "kode_kecamatan": gdf[kolom_kode].astype(str) if kolom_kode else None,
+                "kode": None,
+            },
+            geometry=shapely.force_2d(gdf.geometry.values),
+            crs=gdf.crs,
+        )
+        if "kd_propinsi" in gdf.columns and "kd_dati2" in gdf.columns:
+            hasil["kode"] = gdf["kd_propinsi"].astype(str) + "." + gdf["kd_dati2"].astype(str)
+        frames.append(hasil.to_crs(4326) if hasil.crs is not None else hasil.set_crs(4326))
+
+    if not frames:
+        raise FileNotFoundError(f"❌ Semua sumber batas kecamatan kosong: {', '.join(dilewati)}")
+
+    gdf = gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), geometry="geometry", crs=4326)
+    # Kabupaten induk lewat registri (kode Kemendagri lebih dulu, lalu nama)
+    hasil = indeks_kabupaten().cocokkan(gdf["nama_kabupaten"], gdf["kode"])
+    gdf["kabupaten"] = hasil["kabupaten"].to_numpy()
+    gdf["kode_bps"] = hasil["kode_bps"].to_numpy()
+    lapor = laporan(hasil)
+    del lapor["ganda"]  # banyak kecamatan per kabupaten memang wajar
+    return gdf.drop(columns=["nama_kabupaten", "kode"]), lapor, dilewati
+
+
+# ===== Matematika tile (Web Mercator, skema XYZ) =====
+def rentang_tile(bounds_4326, z):
+    minx, miny, maxx, maxy = bounds_4326
+    n = 1 << z
+
+    def xy(lon, lat):
+        lat = max(min(lat, 85.0511), -85.0511)
+        x = (lon + 180.0) / 360.0 * n
+        y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+        return min(max(int(x), 0), n - 1), min(max(int(y), 0), n - 1)
+
+    x0, y0 = xy(minx, maxy)
+    x1, y1 = xy(maxx, miny)
+    return range(x0, x1 + 1), range(y0, y1 + 1)
+
+
+def kotak_tile(z, x, y):
+    ukuran = 2 * SETENGAH_DUNIA / (1 << z)
+    minx = -SETENGAH_DUNIA + x * ukuran
+    maxy = SETENGAH_DUNIA - y * ukuran
+    return minx, maxy - ukuran, minx + ukuran, maxy
+
+
+# ===== Build =====
+def _tulis_tiles(koneksi, gdf, zoom_min, zoom_max):
+    geom_3857 = gdf.to_crs(3857).geometry.values
+    bounds = gdf.total_bounds
+    properti = [
+        {k: v for k, v in prop.items() if v is not None and not (isinstance(v, float) and math.isnan(v))}
+        for prop in gdf[["kabupaten", "kode_bps", "kecamatan", "kode_kecamatan"]].to_dict(orient="records")
+    ]
+    for i, prop in enumerate(properti):
+        prop["id"] = i
+
+    statistik = {}
+    for z in range(zoom_min, zoom_max + 1):
+        ukuran = 2 * SETENGAH_DUNIA / (1 << z)
+        # Toleransi ~1 unit tile: detail di bawah resolusi tile tidak terlihat
+        geoms = shapely.coverage_simplify(geom_3857, ukuran / EXTENT)
+        pohon = shapely.STRtree(geoms)
+        margin = ukuran * BUFFER / EXTENT
+        jumlah, total = 0, 0
+        xs, ys = rentang_tile(bounds, z)
+        for x in xs:
+            for y in ys:
+                minx, miny, maxx, maxy = kotak_tile(z, x, y)
+                kotak = (minx - margin, miny - margin, maxx + margin, maxy + margin)
+                idx = pohon.query(shapely.box(*kotak), predicate="intersects")
+                if not len(idx):
+                    continue
+                potong = shapely.clip_by_rect(geoms[idx], *kotak)
+                fitur = [
+                    {"geometry": g, "properties": properti[i], "id": int(i)}
+                    for i, g in zip(idx, potong)
+                    if not g.is_empty
+                ]
+                if not fitur:
+                    continue
+                pbf = mapbox_vector_tile.encode(
+                    [{"name": NAMA_LAYER, "features": fitur}],
+                    default_options={"quantize_bounds": (minx, miny, maxx, maxy), "extents": EXTENT},
+                )
+                data = gzip.compress(pbf, 6)
+                koneksi.execute(
+                    "INSERT INTO tiles VALUES (?, ?, ?, ?)", (z, x, (1 << z) - 1 - y, sqlite3.Binary(data))
+                )
+                jumlah += 1
+                total += len(data)
+        statistik[str(z)] = {"tiles": jumlah, "bytes": total}
+    return statistik
+
+
+def build_tiles(paths=None, folder=FOLDER_STORE, zoom_min=ZOOM_MIN, zoom_max=ZOOM_MAX):
+    paths = paths or daftar_sumber()
+    gdf, laporan_kab, dilewati = _baca_sumber(paths)
+    os.makedirs(folder, exist_ok=True)
+
+    manifest = {
+        "sumber": [os.path.relpath(p, ROOT_DIR) for p in paths],
+        "dilewati": dilewati,
+        "stat": _stat_sumber(paths),
+        "registri": indeks_kabupaten().versi,
+        "fitur": len(gdf),
+        "kabupaten": laporan_kab,
+    }
+    versi_teks = json.dumps(
+        [manifest["sumber"], manifest["stat"], manifest["registri"], zoom_min, zoom_max, EXTENT, BUFFER],
+        sort_keys=True,
+    )
+    manifest["versi"] = hashlib.sha256(versi_teks.encode()).hexdigest()[:12]
+
+    # Tulis ke file sementara lalu ganti atomik (server yang sedang jalan tetap membaca file lama);
+    # tmp unik per proses karena beberapa worker bisa membangun bersamaan
+    path = path_mbtiles(folder)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    koneksi = sqlite3.connect(tmp)
+    with koneksi:
+        koneksi.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+        koneksi.execute(
+            "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)"
+        )
+        koneksi.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+        manifest["zoom"] = _tulis_tiles(koneksi, gdf, zoom_min, zoom_max)
+
+        minx, miny, maxx, maxy = (round(float(v), 5) for v in gdf.total_bounds)
+        kolom_properti = {"id": "Number", "kabupaten": "String", "kode_bps": "String"}
+        kolom_properti.update({k: "String" for k in ["kecamatan", "kode_kecamatan"] if gdf[k].notna().any()})
+        metadata = {
+            "name": "Batas kecamatan NTT",
+            "format": "pbf",
+            "type": "overlay",
+            "versi": manifest["versi"],
+            "minzoom": str(zoom_min),
+            "maxzoom": str(zoom_max),
+            "bounds": f"{minx},{miny},{maxx},{maxy}",
+            "center": f"{(minx + maxx) / 2:.5f},{(miny + maxy) / 2:.5f},{zoom_min + 3}",
+            "json": json.dumps({
+                "vector_layers": [
+                    {"id": NAMA_LAYER, "fields": kolom_properti, "minzoom": zoom_min, "maxzoom": zoom_max}
+                ]
+            }),
+        }
+        koneksi.executemany("INSERT INTO metadata VALUES (?, ?)", list(metadata.items()))
+    koneksi.close()
+    os.replace(tmp, path)
+
+    manifest["bytes"] = os.path.getsize(path)
+    manifest["bounds"] = [minx, miny, maxx, maxy]
+    path_manifest = os.path.join(folder, NAMA_MANIFEST_TILES)
+    tmp = f"{path_manifest}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path_manifest)
+    return manifest
@@ -0,0 +1,93 @@
+# =======================================
+# 📈 Tren linear & proyeksi semua kabupaten × indikator
+# =======================================
+# Satu regresi kuadrat terkecil per seri (kabupaten, indikator) terhadap
+# tahun, dihitung SEKALI untuk seluruh kubus panel nilai[tahun, kabupaten,
+# indikator] lewat jumlah-jumlah berbobot (tanpa loop per seri):
+#   b = (n·Σxy - Σx·Σy) / (n·Σx² - (Σx)²),   a = (Σy - b·Σx) / n
+# dengan bobot 0 untuk tahun yang kosong. x dipusatkan supaya stabil secara
+# numerik; tahun yang tidak berurutan (mis. 2021, 2023, 2024) tetap benar.
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from idsd_core.komposit import SKALA_MAKS
+
+HORIZON = 2  # jumlah tahun proyeksi setelah tahun terakhir
+AMBANG_STABIL = 0.05  # |kemiringan| per tahun di bawah ini dianggap stabil
+ARAH = {1: "▲ Naik", 0: "▶ Stabil", -1: "▼ Turun"}
+
+
+class MesinTren:
+    def __init__(self, panel, horizon=HORIZON):
+        self.panel = panel
+        self.tahun = list(panel.tahun)
+        self.kabupaten = panel.kabupaten
+        x = np.array([int(t) for t in self.tahun], dtype="float64")
+        self._x_tengah = x.mean()
+        xc = x - self._x_tengah
+
+        self.nilai = Y = panel.nilai  # [tahun, kabupaten, indikator]
+        W = ~np.isnan(Y)
+        Y0 = np.where(W, Y, 0.0)
+        n = W.sum(axis=0)
+        Sx = np.tensordot(xc, W, axes=(0, 0))
+        Sxx = np.tensordot(xc ** 2, W, axes=(0, 0))
+        Sy = Y0.sum(axis=0)
+        Sxy = np.tensordot(xc, Y0, axes=(0, 0))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            penyebut = n * Sxx - Sx ** 2
+            # Seri dengan < 2 tahun terisi tidak punya tren
+            valid = (n >= 2) & (penyebut > 0)
+            self.kemiringan = np.where(valid, (n * Sxy - Sx * Sy) / penyebut, np.nan)  # per tahun
+            self.intersep = np.where(valid, (Sy - self.kemiringan * Sx) / n, np.nan)  # di x tengah
+
+            ramalan = self.intersep + self.kemiringan * xc[:, None, None]
+            ss_res = (W * (Y0 - ramalan) ** 2).sum(axis=0)
+            ss_tot = (W * (Y0 - Sy / n) ** 2).sum(axis=0)
+            self.r2 = np.where(valid & (ss_tot > 0), 1 - ss_res / ss_tot, np.nan)
+        self.n = n
+
+        # Proyeksi HORIZON tahun ke depan, dibatasi skala skor rilis
+        self.tahun_proyeksi = [str(int(x[-1]) + h) for h in range(1, horizon + 1)]
+        xp = np.array([int(t) for t in self.tahun_proyeksi], dtype="float64") - self._x_tengah
+        self.proyeksi = np.clip(self.intersep + self.kemiringan * xp[:, None, None], 0, SKALA_MAKS)
+
+        self.arah = np.where(
+            np.isnan(self.kemiringan), 0,
+            np.where(self.kemiringan >= AMBANG_STABIL, 1, np.where(self.kemiringan <= -AMBANG_STABIL, -1, 0)),
+        ).astype("int8")
+        for arr in [self.kemiringan, self.intersep, self.r2, self.proyeksi, self.arah, self.n]:
+            arr.flags.writeable = False
+
+    # ===== Bentuk frame =====
+    def ringkas(self, kolom):
+        # Satu baris per kabupaten: arah, kemiringan, R², seri (untuk sparkline), proyeksi
+        i = self.panel._i(kolom)[0]
+        nilai = self.nilai[:, :, i].T  # [kabupaten, tahun]
+        baris = self.panel.ada.any(axis=0)
+        df = pd.DataFrame({
+            "kabupaten": self.kabupaten[baris],
+            "arah": [ARAH[a] if n >= 2 else "–" for a, n in zip(self.arah[baris, i], self.n[baris, i])],
+            "per_tahun": self.kemiringan[baris, i],
+            "r2": self.r2[baris, i],
+            "seri": [[None if np.isnan(v) else float(v) for v in s] for s in nilai[baris]],
+        })
+        for h, tahun in enumerate(self.tahun_proyeksi):
+            df[f"proyeksi_{tahun}"] = self.proyeksi[h, baris, i]
+        return df.sort_values("per_tahun", ascending=False, na_position="last", ignore_index=True)
+
+    def provinsi(self, kolom):
+        # Rata-rata lintas kabupaten per kolom: nilai tahun terakhir & kemiringan per tahun
+        i = self.panel._i(kolom)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return pd.DataFrame(
+                {
+                    "terakhir": np.nanmean(self.nilai[-1][:, i], axis=0),
+                    "per_tahun": np.nanmean(self.kemiringan[:, i], axis=0),
+                },
+                index=pd.Index(kolom, name="indikator"),
+            )
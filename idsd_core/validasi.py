@@ -0,0 +1,128 @@
+# =======================================
+# 🧪 Validasi data saat build (sebelum store dipublikasikan)
+# =======================================
+# Seluruh blok nilai satu CSV [kabupaten, kolom] diperiksa sekaligus sebagai
+# matriks (tanpa loop per sel): teks non-numerik, nilai di luar skala 0-5,
+# kolom kosong / banyak yang kosong, pencilan (robust z = median/MAD), kolom
+# skor pilar yang hilang, dan kabupaten yang tidak cocok / ganda.
+#   galat      -> store TIDAK dipublikasikan (build_store menolak)
+#   peringatan -> dicatat di laporan, data tetap dipakai
+# Karena data yang lolos sudah dijamin numerik & lengkap strukturnya, view
+# tidak perlu lagi pd.to_numeric(errors="coerce") atau cek kolom kosong.
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from idsd_core.komposit import SKALA_MAKS
+from idsd_core.selaras import urai_kolom
+
+AMBANG_KOSONG = 0.3  # fraksi kabupaten kosong per kolom di atas ini -> peringatan
+AMBANG_PENCILAN = 3.5  # |robust z| di atas ini -> pencilan
+JUMLAH_PILAR = 12
+MAKS_CONTOH = 5
+TINGKAT = ["galat", "peringatan"]
+
+
+class DataTidakValid(ValueError):
+    def __init__(self, laporan):
+        self.laporan = laporan
+        galat = [t for t in laporan["temuan"] if t["tingkat"] == "galat"]
+        ringkas = "; ".join(
+            f"{t['tahun']} {t['cek']}" + (f" {t['kolom']}" if t.get("kolom") else "") for t in galat[:MAKS_CONTOH]
+        )
+        super().__init__(f"❌ Data ditolak: {len(galat)} galat validasi ({ringkas})")
+
+
+def _temuan(tahun, tingkat, cek, jumlah, kolom=None, contoh=()):
+    hasil = {"tahun": tahun, "tingkat": tingkat, "cek": cek, "jumlah": int(jumlah)}
+    if kolom is not None:
+        hasil["kolom"] = kolom
+    contoh = [str(c) for c in contoh][:MAKS_CONTOH]
+    if contoh:
+        hasil["contoh"] = contoh
+    return hasil
+
+
+def _per_kolom(temuan, tahun, tingkat, cek, masker, kolom, kabupaten):
+    # Satu temuan per kolom yang punya sel bermasalah (masker [kabupaten, kolom])
+    jumlah = masker.sum(axis=0)
+    for j in np.flatnonzero(jumlah):
+        temuan.append(_temuan(tahun, tingkat, cek, jumlah[j], kolom[j], kabupaten[masker[:, j]]))
+
+
+# ===== Validasi satu tahun =====
+def validasi_tahun(tahun, df, hasil_kabupaten):
+    # df = CSV mentah (belum dipaksa numerik); hasil_kabupaten = IndeksKabupaten.cocokkan
+    # -> (nilai float64 [kabupaten, kolom], temuan)
+    temuan = []
+    kolom = np.array([c for c in df.columns if c != "kabupaten"], dtype=object)
+    kabupaten = hasil_kabupaten["input"].astype(str).to_numpy()
+
+    # --- Struktur kolom ---
+    dikenal = np.array([urai_kolom(c) is not None for c in kolom], dtype=bool)
+    if (~dikenal).any():
+        temuan.append(_temuan(tahun, "peringatan", "kolom_tak_dikenal", (~dikenal).sum(), contoh=kolom[~dikenal]))
+    hilang = [f"pilar_{p}" for p in range(1, JUMLAH_PILAR + 1) if f"pilar_{p}" not in set(kolom)]
+    if hilang:
+        temuan.append(_temuan(tahun, "galat", "pilar_hilang", len(hilang), contoh=hilang))
+
+    # --- Kabupaten ---
+    # ganda juga galat: panel hanya memakai baris pertama, jadi baris kedua (sering
+    # kabupaten lain yang salah tulis) akan hilang diam-diam. Salah tulis yang sudah
+    # diperiksa diselesaikan lewat kabupaten.KOREKSI_SUMBER.
+    for status in ["tidak_cocok", "ambigu", "ganda"]:
+        masker = (hasil_kabupaten["status"] == status).to_numpy()
+        if masker.any():
+            temuan.append(_temuan(tahun, "galat", f"kabupaten_{status}", masker.sum(), contoh=kabupaten[masker]))
+    masker = (hasil_kabupaten["metode"] == "koreksi").to_numpy()
+    if masker.any():
+        koreksi = hasil_kabupaten.loc[masker, "kabupaten"]
+        contoh = [f"{i} -> {k}" for i, k in zip(kabupaten[masker], koreksi)]
+        temuan.append(_temuan(tahun, "peringatan", "kabupaten_koreksi", masker.sum(), contoh=contoh))
+
+    # --- Nilai: semua kolom sekaligus ---
+    mentah = df[kolom].to_numpy(dtype=object)
+    teks = pd.Series(mentah.ravel())
+    nilai = pd.to_numeric(teks, errors="coerce").to_numpy(dtype="float64").reshape(mentah.shape)
+    terisi = (teks.notna() & (teks.astype(str).str.strip() != "")).to_numpy().reshape(mentah.shape)
+    kosong = np.isnan(nilai)
+
+    _per_kolom(temuan, tahun, "galat", "teks_non_numerik", terisi & kosong, kolom, kabupaten)
+    with np.errstate(invalid="ignore"):
+        luar = ~kosong & ((nilai < 0) | (nilai > SKALA_MAKS) | ~np.isfinite(nilai))
+    _per_kolom(temuan, tahun, "galat", "di_luar_skala", luar, kolom, kabupaten)
+
+    n_kosong = kosong.sum(axis=0)
+    pilar = np.array([urai_kolom(c) is not None and urai_kolom(c)[1] is None for c in kolom], dtype=bool)
+    for j in np.flatnonzero(n_kosong == len(kabupaten)):
+        # Skor pilar wajib terisi; indikator detail boleh kosong (tidak dihitung)
+        tingkat = "galat" if pilar[j] else "peringatan"
+        temuan.append(_temuan(tahun, tingkat, "kolom_kosong", n_kosong[j], kolom[j]))
+    sebagian = (n_kosong > AMBANG_KOSONG * len(kabupaten)) & (n_kosong < len(kabupaten))
+    _per_kolom(temuan, tahun, "peringatan", "banyak_kosong", kosong & sebagian, kolom, kabupaten)
+
+    # --- Pencilan: robust z per kolom lintas kabupaten ---
+    bersih = np.where(luar, np.nan, nilai)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # Kolom tanpa data sama sekali -> median NaN, bukan warning
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(bersih, axis=0)
+        mad = np.nanmedian(np.abs(bersih - median), axis=0)
+        z = 0.6745 * (bersih - median) / np.where(mad > 0, mad, np.nan)
+        pencilan = np.abs(z) > AMBANG_PENCILAN
+    _per_kolom(temuan, tahun, "peringatan", "pencilan", pencilan, kolom, kabupaten)
+
+    return nilai, temuan
+
+
+# ===== Laporan gabungan =====
+def susun_laporan(temuan_per_tahun):
+    # {tahun: [temuan]} -> laporan ringkas; status "ditolak" bila ada galat
+    temuan = [t for tahun in sorted(temuan_per_tahun) for t in temuan_per_tahun[tahun]]
+    ringkasan = {
+        tahun: {tingkat: sum(t["tingkat"] == tingkat for t in daftar) for tingkat in TINGKAT}
+        for tahun, daftar in sorted(temuan_per_tahun.items())
+    }
+    galat = any(t["tingkat"] == "galat" for t in temuan)
+    return {"status": "ditolak" if galat else "lulus", "ringkasan": ringkasan, "temuan": temuan}
@@ -0,0 +1,41 @@
+# =======================================
+# 🧑‍🏭 Worker Streamlit dengan cache data yang sudah hangat
+# =======================================
+# Dinyalakan oleh supervisor (idsd_core/supervisor.py), satu proses per port:
+#   python -m idsd_core.worker idsd_dashboard_ntt.py --port 8601
+# Cache idsd_core.service diisi DULU di proses ini, baru server Streamlit
+# dijalankan di proses yang sama; script dashboard mengimpor modul service
+# yang sama sehingga sesi pertama tidak menunggu store/geometri dimuat.
+# /_stcore/health baru menjawab setelah pemanasan selesai, jadi supervisor
+# tidak mengarahkan user ke worker yang masih dingin.
+import argparse
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker dashboard IDSD (cache dihangatkan dulu)")
+    parser.add_argument("app")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    args, sisa = parser.parse_known_args()
+
+    mulai = time.perf_counter()
+    from idsd_core import service
+
+    isi = service.hangatkan()
+    print(f"🔥 worker :{args.port} hangat dalam {(time.perf_counter() - mulai) * 1000:.0f} ms "
+          f"({len(isi)} entri cache)", flush=True)
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = [
+        "streamlit", "run", os.path.abspath(args.app),
+        f"--server.port={args.port}",
+        f"--server.address={args.host}",
+        "--server.headless=true",
+        "--server.fileWatcherType=none",
+        "--browser.gatherUsageStats=false",
+        *sisa,
+    ]
+    sys.exit(stcli.main())
@@ -1,58 +1,41 @@
 # =======================================
-# 📊 Dashboard Perbandingan IDSD NTT 2023 vs 2024
+# 📊 Dashboard Perbandingan IDSD NTT antar tahun
 # =======================================
+# Tahun dibaca dari store (satu partisi per data_<tahun>_lengkap.csv); hanya
+# tahun di rentang terpilih yang dimuat ke memori.
 
 import streamlit as st
-import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit.components.v1 import html
 from branca.colormap import linear
 import plotly.express as px
-import plotly.graph_objects as go
+from idsd_core import DataTidakValid, service
+from idsd_core.choropleth import layer_choropleth
 
 # ---------------------------
 # ⚙️ Konfigurasi halaman
 # ---------------------------
 st.set_page_config(page_title="Dashboard Perbandingan IDSD NTT", layout="wide")
 
-st.title("📊 Dashboard Perbandingan IDSD Nusa Tenggara Timur (2023 vs 2024)")
+st.title("📊 Dashboard Perbandingan IDSD Nusa Tenggara Timur")
 st.markdown("Bandingkan skor IDSD antar kabupaten/kota dan antar tahun untuk setiap pilar dan indikator.")
 
 # ---------------------------
-# 📂 Load Data
+# 📂 Load Data (layanan bersama idsd_core.service)
 # ---------------------------
-@st.cache_data
-def load_data():
-    df_2023 = pd.read_csv("data_2023_lengkap.csv")
-    df_2024 = pd.read_csv("data_2024_lengkap.csv")
+# Panel skor & geometri di-cache sekali per proses untuk semua dashboard,
+# dikunci versi dataset; lihat build_store.py dan build_geometry.py
+try:
+    panel = service.get_panel()
+    fitur_peta = service.get_fitur_peta(zoom=7)
+except FileNotFoundError as e:
+    st.error(f"❌ Data tidak ditemukan: {e}")
+    st.stop()
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
+    st.stop()
 
-    # Normalisasi nama kabupaten
-    df_2023["kabupaten"] = df_2023["kabupaten"].str.upper().str.strip()
-    df_2024["kabupaten"] = df_2024["kabupaten"].str.upper().str.strip()
-
-    # Samakan kolom antar tahun
-    semua_kolom = sorted(set(df_2023.columns) | set(df_2024.columns))
-    for df in [df_2023, df_2024]:
-        for kol in semua_kolom:
-            if kol not in df.columns:
-                df[kol] = None
-        df = df[semua_kolom]
-
-    return df_2023, df_2024
-
-df_2023, df_2024 = load_data()
-
-# ---------------------------
-# 🗺️ Load GeoJSON
-# ---------------------------
-@st.cache_resource
-def load_geojson():
-    gdf = gpd.read_file("NTT_Kabupaten_All.geojson")
-    gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-    return gdf
-
-gdf = load_geojson()
+daftar_tahun = service.daftar_tahun()
 
 # ---------------------------
 # 📋 Mapping Nama Pilar
@@ -64,55 +47,49 @@ nama_pilar = {
 # ---------------------------
 # 🎯 Filter Pilihan
 # ---------------------------
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 with col1:
     indikator = st.selectbox("🎯 Pilih Pilar IDSD:", [f"pilar_{i}" for i in range(1, 13)],
                              format_func=lambda x: nama_pilar.get(x, x))
 with col2:
     mode = st.radio("📅 Mode Perbandingan:", ["Antar Tahun", "Antar Kabupaten"], horizontal=True)
+with col3:
+    if len(daftar_tahun) > 1:
+        # Dua ujung rentang = pasangan yang dibandingkan; tahun di antaranya ikut di grafik tren
+        tahun_dari, tahun_ke = st.select_slider(
+            "📅 Rentang Tahun:", options=daftar_tahun, value=(daftar_tahun[-2], daftar_tahun[-1])
+        )
+    else:
+        tahun_dari = tahun_ke = daftar_tahun[0]
+        st.info(f"ℹ️ Baru ada data tahun {tahun_dari}")
 
-# ---------------------------
-# 🔄 Gabung Data dan Sinkronisasi
-# ---------------------------
-gdf_merged_2023 = gdf.merge(df_2023[["kabupaten", indikator]], on="kabupaten", how="left")
-gdf_merged_2024 = gdf.merge(df_2024[["kabupaten", indikator]], on="kabupaten", how="left")
+rentang = daftar_tahun[daftar_tahun.index(tahun_dari):daftar_tahun.index(tahun_ke) + 1]
+df_dari = panel.wide(tahun_dari)
+df_ke = panel.wide(tahun_ke)
+label_delta = f"Δ ({tahun_ke} - {tahun_dari})"
 
 # ---------------------------
 # 🎨 Peta Perbandingan
 # ---------------------------
 colmap1, colmap2 = st.columns(2)
 colormap = linear.YlGnBu_09.scale(
-    min(df_2023[indikator].min(), df_2024[indikator].min()),
-    max(df_2023[indikator].max(), df_2024[indikator].max())
+    min(df_dari[indikator].min(), df_ke[indikator].min()),
+    max(df_dari[indikator].max(), df_ke[indikator].max())
 )
 
 with colmap1:
-    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - 2023")
+    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - {tahun_dari}")
     m1 = folium.Map(location=[-8.6, 121.1], zoom_start=7, tiles="CartoDB positron")
 
-    for _, row in gdf_merged_2023.iterrows():
-        val = row[indikator]
-        warna = colormap(val) if pd.notna(val) else "#d3d3d3"
-        folium.GeoJson(
-            row["geometry"].__geo_interface__,
-            style_function=lambda x, fc=warna: {"fillColor": fc, "color": "black", "weight": 1, "fillOpacity": 0.7},
-            tooltip=f"<b>{row['kabupaten']}</b><br>{nama_pilar[indikator]}: {val if pd.notna(val) else 'N/A'}"
-        ).add_to(m1)
+    layer_choropleth(fitur_peta, df_dari, indikator, colormap, alias=[f"{nama_pilar[indikator]}:"]).add_to(m1)
     colormap.add_to(m1)
     html(m1._repr_html_(), height=450)
 
 with colmap2:
-    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - 2024")
+    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - {tahun_ke}")
     m2 = folium.Map(location=[-8.6, 121.1], zoom_start=7, tiles="CartoDB positron")
 
-    for _, row in gdf_merged_2024.iterrows():
-        val = row[indikator]
-        warna = colormap(val) if pd.notna(val) else "#d3d3d3"
-        folium.GeoJson(
-            row["geometry"].__geo_interface__,
-            style_function=lambda x, fc=warna: {"fillColor": fc, "color": "black", "weight": 1, "fillOpacity": 0.7},
-            tooltip=f"<b>{row['kabupaten']}</b><br>{nama_pilar[indikator]}: {val if pd.notna(val) else 'N/A'}"
-        ).add_to(m2)
+    layer_choropleth(fitur_peta, df_ke, indikator, colormap, alias=[f"{nama_pilar[indikator]}:"]).add_to(m2)
     colormap.add_to(m2)
     html(m2._repr_html_(), height=450)
 
@@ -120,29 +97,35 @@ with colmap2:
 # 📊 Perbandingan Skor
 # ---------------------------
 st.markdown("---")
-st.subheader(f"📈 Perbandingan Skor {nama_pilar[indikator]} 2023 vs 2024")
-
-df_compare = pd.merge(
-    df_2023[["kabupaten", indikator]],
-    df_2024[["kabupaten", indikator]],
-    on="kabupaten",
-    how="outer",
-    suffixes=("_2023", "_2024")
-)
+st.subheader(f"📈 Perbandingan Skor {nama_pilar[indikator]} {tahun_dari} vs {tahun_ke}")
 
-df_compare["Δ (2024 - 2023)"] = df_compare[f"{indikator}_2024"] - df_compare[f"{indikator}_2023"]
+df_compare = panel.delta(indikator, tahun_dari, tahun_ke).rename(columns={"delta": label_delta})
 
 fig = px.bar(
-    df_compare.sort_values("Δ (2024 - 2023)", ascending=False),
+    df_compare.sort_values(label_delta, ascending=False),
     x="kabupaten",
-    y="Δ (2024 - 2023)",
-    color="Δ (2024 - 2023)",
+    y=label_delta,
+    color=label_delta,
     color_continuous_scale="RdYlGn",
-    title=f"Δ Skor {nama_pilar[indikator]} (2024 - 2023)"
+    title=f"Δ Skor {nama_pilar[indikator]} ({tahun_ke} - {tahun_dari})"
 )
 fig.update_layout(xaxis_tickangle=-45, height=450)
 st.plotly_chart(fig, use_container_width=True)
 
+if len(rentang) > 2:
+    # Tren sepanjang rentang: satu garis per kabupaten + rata-rata provinsi
+    df_seri = panel.seri(indikator, rentang)
+    df_tren = df_seri.reset_index().melt(id_vars="kabupaten", var_name="tahun", value_name=indikator)
+    fig_tren = px.line(
+        df_tren, x="tahun", y=indikator, color="kabupaten", markers=True,
+        title=f"Tren {nama_pilar[indikator]} {tahun_dari}–{tahun_ke}"
+    )
+    fig_tren.add_scatter(
+        x=rentang, y=df_seri.mean().to_numpy(), name="Rata-rata NTT", line=dict(color="black", width=4)
+    )
+    fig_tren.update_layout(height=500)
+    st.plotly_chart(fig_tren, use_container_width=True)
+
 # ---------------------------
 # 🔍 Detail Indikator per Pilar
 # ---------------------------
@@ -150,26 +133,22 @@ st.markdown("---")
 st.subheader(f"🔍 Detail Indikator {nama_pilar[indikator]}")
 
 # Ambil kolom indikator rinci
-kolom_indikator = [c for c in df_2023.columns if c.startswith(f"{indikator}_")]
+kolom_indikator = panel.kolom_indikator(indikator)
 
 if len(kolom_indikator) > 0:
-    kab = st.selectbox("🏛 Pilih Kabupaten/Kota:", sorted(df_2023["kabupaten"].unique()))
-
-    df_2023_det = df_2023[df_2023["kabupaten"] == kab][kolom_indikator].T.reset_index()
-    df_2024_det = df_2024[df_2024["kabupaten"] == kab][kolom_indikator].T.reset_index()
+    kab = st.selectbox("🏛 Pilih Kabupaten/Kota:", sorted(set(df_dari["kabupaten"]) | set(df_ke["kabupaten"])))
 
-    df_2023_det.columns = ["Indikator", "2023"]
-    df_2024_det.columns = ["Indikator", "2024"]
-
-    df_merge_det = pd.merge(df_2023_det, df_2024_det, on="Indikator", how="outer")
-    df_merge_det["Δ (2024-2023)"] = df_merge_det["2024"] - df_merge_det["2023"]
+    df_merge_det = panel.profil_kabupaten(kab, indikator, tahun=rentang).reset_index()
+    df_merge_det[label_delta] = df_merge_det[tahun_ke] - df_merge_det[tahun_dari]
 
     st.dataframe(df_merge_det, use_container_width=True, height=450)
 
-    # Grafik perbandingan indikator
+    # Grafik perbandingan indikator (graph_objects diimpor saat bagian ini dirender)
+    import plotly.graph_objects as go
+
     fig_ind = go.Figure()
-    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["2023"], orientation='h', name='2023'))
-    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["2024"], orientation='h', name='2024'))
+    for tahun in rentang:
+        fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det[tahun], orientation="h", name=tahun))
     fig_ind.update_layout(
         barmode='group', height=500,
         title=f"Perbandingan Indikator {nama_pilar[indikator]} - {kab}"
@@ -184,12 +163,12 @@ else:
 st.markdown("---")
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric("📈 Rata-rata 2023", f"{df_2023[indikator].mean():.2f}")
+    st.metric(f"📈 Rata-rata {tahun_dari}", f"{df_dari[indikator].mean():.2f}")
 with col2:
-    st.metric("📈 Rata-rata 2024", f"{df_2024[indikator].mean():.2f}")
+    st.metric(f"📈 Rata-rata {tahun_ke}", f"{df_ke[indikator].mean():.2f}")
 with col3:
-    delta_mean = df_2024[indikator].mean() - df_2023[indikator].mean()
-    st.metric("Δ Rata-rata (2024 - 2023)", f"{delta_mean:.2f}",
+    delta_mean = df_ke[indikator].mean() - df_dari[indikator].mean()
+    st.metric(f"Δ Rata-rata ({tahun_ke} - {tahun_dari})", f"{delta_mean:.2f}",
               delta=f"{(delta_mean):+.2f}", delta_color="normal")
 
 st.success("✅ Dashboard perbandingan siap digunakan – semua kolom sudah disinkronkan otomatis.")
@@ -3,33 +3,29 @@
 # =======================================
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit_folium import st_folium
+from streamlit.components.v1 import html
 import plotly.express as px
 import plotly.graph_objects as go
 from branca.colormap import linear
-from io import BytesIO
+from idsd_core import DataTidakValid, service
+from idsd_core.choropleth import layer_choropleth
 
 st.set_page_config(page_title="IDSD NTT Dashboard", layout="wide")
 
-# ===== Load Data =====
-@st.cache_data
-def load_data():
-    df_2023 = pd.read_csv("data_2023_lengkap.csv")
-    df_2024 = pd.read_csv("data_2024_lengkap.csv")
-    return df_2023, df_2024
+# ===== Load Data (layanan bersama idsd_core.service) =====
+try:
+    panel = service.get_panel()
+    fitur_peta = service.get_fitur_peta(zoom=7)
+except FileNotFoundError as e:
+    st.error(f"❌ Data tidak ditemukan: {e}")
+    st.stop()
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
+    st.stop()
 
-df_2023, df_2024 = load_data()
-
-# ===== Load GeoJSON =====
-@st.cache_resource
-def load_geojson():
-    gdf = gpd.read_file("NTT_Kabupaten_All.geojson")
-    gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-    return gdf
-
-gdf = load_geojson()
+daftar_tahun = service.daftar_tahun()
 
 # ===== Nama Pilar =====
 nama_pilar = {f'pilar_{i}': f'Pilar {i}' for i in range(1,13)}
@@ -37,49 +33,42 @@ nama_pilar = {f'pilar_{i}': f'Pilar {i}' for i in range(1,13)}
 # ===== Sidebar =====
 with st.sidebar:
     st.header("Filter Dashboard")
-    tahun = st.selectbox("📅 Pilih Tahun:", ["2023","2024"])
-    df_terpilih = df_2023 if tahun=="2023" else df_2024
-    df_terpilih["kabupaten"] = df_terpilih["kabupaten"].str.upper().str.strip()
-    kolom_pilar = [col for col in df_terpilih.columns if col.startswith('pilar_')]
+    tahun = st.selectbox("📅 Pilih Tahun:", daftar_tahun, index=len(daftar_tahun)-1)
+    df_terpilih = service.get_tahun(tahun)
+    kolom_pilar = panel.kolom_pilar()
     indikator = st.selectbox("🎯 Pilih Pilar:", kolom_pilar, format_func=lambda x: nama_pilar.get(x,x))
     kab_sel = st.selectbox("🏛 Pilih Kabupaten:", sorted(df_terpilih['kabupaten'].unique()) + ["Semua"])
-
-# ===== Merge GeoJSON =====
-df_map = df_terpilih[['kabupaten', indikator]].copy()
-gdf_merged = gdf.merge(df_map, on="kabupaten", how="left")
-gdf_merged[indikator] = pd.to_numeric(gdf_merged[indikator], errors="coerce")
-
-# ===== Colormap =====
-vmin, vmax = gdf_merged[indikator].min(), gdf_merged[indikator].max()
-if vmin==vmax: vmax=vmin+0.01
-colormap = linear.YlGnBu_09.scale(vmin,vmax).to_step(n=10)
-colormap.caption = f"{nama_pilar.get(indikator,indikator)} ({tahun})"
-
-# ===== Highlight kabupaten terpilih =====
-def style_function(feature):
-    val = feature["properties"].get(indikator)
-    base_color = colormap(val) if val is not None else "#d3d3d3"
-    if kab_sel != "Semua" and feature["properties"]["kabupaten"]==kab_sel:
-        base_color = "#ff6600"
-    return {"fillColor": base_color, "color":"black","weight":1,"fillOpacity":0.7}
-
-m = folium.Map(location=[-8.6,121.1], zoom_start=7, tiles="CartoDB positron")
-folium.GeoJson(
-    gdf_merged,
-    style_function=style_function,
-    tooltip=folium.features.GeoJsonTooltip(
-        fields=["kabupaten", indikator],
-        aliases=["Kabupaten/Kota:", f"{nama_pilar.get(indikator,indikator)}:"],
-        localize=True,
-    )
-).add_to(m)
-colormap.add_to(m)
+    # Statis: HTML jadi dari cache bersama, pan/zoom/klik tidak mengirim state ke server
+    peta_statis = st.checkbox("🧊 Peta statis (tanpa rerun)", value=True)
 
 # ===== Layout =====
 col1, col2 = st.columns([2,1])
 with col1:
     st.subheader(f"🗺️ Peta {nama_pilar.get(indikator,indikator)} ({tahun})")
-    st_folium(m, width=900, height=550)
+    highlight = [kab_sel] if kab_sel != "Semua" else []
+    if peta_statis:
+        html(service.peta_html(tahun, indikator, nama_pilar.get(indikator,indikator), highlight), width=900, height=550)
+    else:
+        # ===== Colormap =====
+        nilai_peta = df_terpilih[indikator]
+        vmin, vmax = nilai_peta.min(), nilai_peta.max()
+        if vmin==vmax: vmax=vmin+0.01
+        colormap = linear.YlGnBu_09.scale(vmin,vmax).to_step(n=10)
+        colormap.caption = f"{nama_pilar.get(indikator,indikator)} ({tahun})"
+
+        # ===== Peta (highlight kabupaten terpilih) =====
+        m = folium.Map(location=[-8.6,121.1], zoom_start=7, tiles="CartoDB positron")
+        layer_choropleth(
+            fitur_peta,
+            df_terpilih,
+            indikator,
+            colormap,
+            alias=[f"{nama_pilar.get(indikator,indikator)}:"],
+            highlight=highlight,
+        ).add_to(m)
+        colormap.add_to(m)
+        # returned_objects=[]: komponen tidak mengembalikan state, jadi tidak memicu rerun
+        st_folium(m, width=900, height=550, returned_objects=[])
 
 with col2:
     st.subheader("📋 Tabel Skor Pilar")
@@ -99,41 +88,56 @@ fig.update_layout(xaxis_tickangle=-45, height=500, showlegend=False)
 st.plotly_chart(fig, use_container_width=True)
 
 # ===== Detail Indikator =====
-st.markdown("---")
-st.subheader("🔍 Detail Indikator")
-kolom_indikator = [c for c in df_terpilih.columns if c.startswith(f"{indikator}_")]
-if kolom_indikator:
-    tab_mode = st.radio("Mode Tampilan:", ["Per Kabupaten","Per Indikator"], horizontal=True)
-    if tab_mode=="Per Kabupaten":
-        kab = st.selectbox("Pilih Kabupaten:", sorted(df_terpilih['kabupaten'].unique()))
-        data_kab = df_terpilih[df_terpilih['kabupaten']==kab].iloc[0]
-        df_ind = pd.DataFrame({
-            "Indikator":[c.split("_",2)[2] for c in kolom_indikator],
-            "Nilai":[data_kab[c] for c in kolom_indikator]
-        })
-        st.dataframe(df_ind)
-        fig_bar = go.Figure()
-        fig_bar.add_trace(go.Bar(x=df_ind['Nilai'], y=df_ind['Indikator'], orientation='h',
-                                 marker=dict(color=df_ind['Nilai'], colorscale='YlGnBu')))
-        fig_bar.update_layout(height=500, showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
-    else:
-        ind_sel = st.selectbox("Pilih Indikator:", kolom_indikator)
-        df_ind_all = df_terpilih[['kabupaten', ind_sel]].sort_values(ind_sel, ascending=False)
-        st.dataframe(df_ind_all)
-        fig_ind = px.bar(df_ind_all, x='kabupaten', y=ind_sel, color=ind_sel,
-                         color_continuous_scale='YlGnBu')
-        fig_ind.update_layout(xaxis_tickangle=-45, height=500, showlegend=False)
-        st.plotly_chart(fig_ind, use_container_width=True)
+# Fragment: ganti mode/kabupaten/indikator di bagian ini hanya menjalankan ulang bagian ini
+@st.fragment
+def bagian_detail(df_terpilih, indikator):
+    st.markdown("---")
+    st.subheader("🔍 Detail Indikator")
+    kolom_indikator = [c for c in panel.kolom_indikator(indikator) if df_terpilih[c].notna().any()]
+    if kolom_indikator:
+        tab_mode = st.radio("Mode Tampilan:", ["Per Kabupaten","Per Indikator"], horizontal=True)
+        if tab_mode=="Per Kabupaten":
+            kab = st.selectbox("Pilih Kabupaten:", sorted(df_terpilih['kabupaten'].unique()))
+            data_kab = df_terpilih[df_terpilih['kabupaten']==kab].iloc[0]
+            df_ind = pd.DataFrame({
+                "Indikator":[c.split("_",2)[2] for c in kolom_indikator],
+                "Nilai":[data_kab[c] for c in kolom_indikator]
+            })
+            st.dataframe(df_ind)
+            fig_bar = go.Figure()
+            fig_bar.add_trace(go.Bar(x=df_ind['Nilai'], y=df_ind['Indikator'], orientation='h',
+                                     marker=dict(color=df_ind['Nilai'], colorscale='YlGnBu')))
+            fig_bar.update_layout(height=500, showlegend=False)
+            st.plotly_chart(fig_bar, use_container_width=True)
+        else:
+            ind_sel = st.selectbox("Pilih Indikator:", kolom_indikator)
+            df_ind_all = df_terpilih[['kabupaten', ind_sel]].sort_values(ind_sel, ascending=False)
+            st.dataframe(df_ind_all)
+            fig_ind = px.bar(df_ind_all, x='kabupaten', y=ind_sel, color=ind_sel,
+                             color_continuous_scale='YlGnBu')
+            fig_ind.update_layout(xaxis_tickangle=-45, height=500, showlegend=False)
+            st.plotly_chart(fig_ind, use_container_width=True)
+
+bagian_detail(df_terpilih, indikator)
+
+# ===== Download Excel (dibuat hanya saat diminta, cache per versi data + filter) =====
+@st.fragment
+def bagian_ekspor(tahun_list, kabupaten):
+    st.subheader("💾 Download Data")
+    if not tahun_list:
+        st.info("ℹ️ Pilih minimal satu tahun untuk ekspor.")
+        return
+    kunci = (tuple(tahun_list), tuple(kabupaten))
+    if st.button("📦 Siapkan File Excel"):
+        st.session_state["ekspor_siap"] = kunci
+    if st.session_state.get("ekspor_siap") == kunci:
+        st.download_button(
+            "📥 Download Data Excel",
+            service.ekspor_excel(tahun_list, kabupaten),
+            file_name=f"IDSD_NTT_{'_'.join(tahun_list)}.xlsx",
+            mime=service.MIME_XLSX,
+        )
 
-# ===== Download Excel =====
-st.markdown("---")
-st.subheader("💾 Download Data")
-def to_excel(df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Data')
-    return output.getvalue()
 
-excel_data = to_excel(df_terpilih)
-st.download_button("📥 Download Data Excel", excel_data, file_name=f"IDSD_NTT_{tahun}.xlsx", mime="application/vnd.ms-excel")
+st.markdown("---")
+bagian_ekspor([tahun], [kab_sel])
@@ -1,58 +1,35 @@
 # =======================================
-# 📊 Dashboard Perbandingan IDSD NTT 2023 vs 2024
+# 📊 Dashboard Perbandingan IDSD NTT antar tahun
 # =======================================
 
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit.components.v1 import html
 from branca.colormap import linear
 import plotly.express as px
 import plotly.graph_objects as go
+from idsd_core import service
 
 # ---------------------------
 # ⚙️ Konfigurasi halaman
 # ---------------------------
 st.set_page_config(page_title="Dashboard Perbandingan IDSD NTT", layout="wide")
 
-st.title("📊 Dashboard Perbandingan IDSD Nusa Tenggara Timur (2023 vs 2024)")
+st.title("📊 Dashboard Perbandingan IDSD Nusa Tenggara Timur")
 st.markdown("Bandingkan skor IDSD antar kabupaten/kota dan antar tahun untuk setiap pilar dan indikator.")
 
 # ---------------------------
 # 📂 Load Data
 # ---------------------------
-@st.cache_data
-def load_data():
-    df_2023 = pd.read_csv("data_2023_lengkap.csv")
-    df_2024 = pd.read_csv("data_2024_lengkap.csv")
-
-    # Normalisasi nama kabupaten
-    df_2023["kabupaten"] = df_2023["kabupaten"].str.upper().str.strip()
-    df_2024["kabupaten"] = df_2024["kabupaten"].str.upper().str.strip()
-
-    # Samakan kolom antar tahun
-    semua_kolom = sorted(set(df_2023.columns) | set(df_2024.columns))
-    for df in [df_2023, df_2024]:
-        for kol in semua_kolom:
-            if kol not in df.columns:
-                df[kol] = None
-        df = df[semua_kolom]
-
-    return df_2023, df_2024
-
-df_2023, df_2024 = load_data()
+# Layanan bersama idsd_core.service: nama kabupaten sudah kanonik (registri),
+# kolom antar tahun sudah disamakan, cache dipakai bersama dashboard lain
+daftar_tahun = service.daftar_tahun()
 
 # ---------------------------
 # 🗺️ Load GeoJSON
 # ---------------------------
-@st.cache_resource
-def load_geojson():
-    gdf = gpd.read_file("NTT_Kabupaten_All.geojson")
-    gdf["kabupaten"] = gdf["kabupaten"].str.upper().str.strip()
-    return gdf
-
-gdf = load_geojson()
+gdf = service.get_geometri(zoom=7)
 
 # ---------------------------
 # 📋 Mapping Nama Pilar
@@ -64,33 +41,42 @@ nama_pilar = {
 # ---------------------------
 # 🎯 Filter Pilihan
 # ---------------------------
-col1, col2 = st.columns(2)
+col1, col2, col3, col4 = st.columns(4)
 with col1:
     indikator = st.selectbox("🎯 Pilih Pilar IDSD:", [f"pilar_{i}" for i in range(1, 13)],
                              format_func=lambda x: nama_pilar.get(x, x))
 with col2:
     mode = st.radio("📅 Mode Perbandingan:", ["Antar Tahun", "Antar Kabupaten"], horizontal=True)
+with col3:
+    tahun_dari = st.selectbox("📅 Tahun Awal:", daftar_tahun, index=max(len(daftar_tahun) - 2, 0))
+with col4:
+    tahun_ke = st.selectbox("📅 Tahun Akhir:", daftar_tahun, index=len(daftar_tahun) - 1)
+
+# Hanya dua tahun terpilih yang dimuat dari store
+df_dari = service.get_tahun(tahun_dari)
+df_ke = service.get_tahun(tahun_ke)
+label_delta = f"Δ ({tahun_ke} - {tahun_dari})"
 
 # ---------------------------
 # 🔄 Gabung Data dan Sinkronisasi
 # ---------------------------
-gdf_merged_2023 = gdf.merge(df_2023[["kabupaten", indikator]], on="kabupaten", how="left")
-gdf_merged_2024 = gdf.merge(df_2024[["kabupaten", indikator]], on="kabupaten", how="left")
+gdf_merged_dari = gdf.merge(df_dari[["kabupaten", indikator]], on="kabupaten", how="left")
+gdf_merged_ke = gdf.merge(df_ke[["kabupaten", indikator]], on="kabupaten", how="left")
 
 # ---------------------------
 # 🎨 Peta Perbandingan
 # ---------------------------
 colmap1, colmap2 = st.columns(2)
 colormap = linear.YlGnBu_09.scale(
-    min(df_2023[indikator].min(), df_2024[indikator].min()),
-    max(df_2023[indikator].max(), df_2024[indikator].max())
+    min(df_dari[indikator].min(), df_ke[indikator].min()),
+    max(df_dari[indikator].max(), df_ke[indikator].max())
 )
 
 with colmap1:
-    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - 2023")
+    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - {tahun_dari}")
     m1 = folium.Map(location=[-8.6, 121.1], zoom_start=7, tiles="CartoDB positron")
 
-    for _, row in gdf_merged_2023.iterrows():
+    for _, row in gdf_merged_dari.iterrows():
         val = row[indikator]
         warna = colormap(val) if pd.notna(val) else "#d3d3d3"
         folium.GeoJson(
@@ -102,10 +88,10 @@ with colmap1:
     html(m1._repr_html_(), height=450)
 
 with colmap2:
-    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - 2024")
+    st.subheader(f"🗺️ Peta {nama_pilar[indikator]} - {tahun_ke}")
     m2 = folium.Map(location=[-8.6, 121.1], zoom_start=7, tiles="CartoDB positron")
 
-    for _, row in gdf_merged_2024.iterrows():
+    for _, row in gdf_merged_ke.iterrows():
         val = row[indikator]
         warna = colormap(val) if pd.notna(val) else "#d3d3d3"
         folium.GeoJson(
@@ -120,25 +106,25 @@ with colmap2:
 # 📊 Perbandingan Skor
 # ---------------------------
 st.markdown("---")
-st.subheader(f"📈 Perbandingan Skor {nama_pilar[indikator]} 2023 vs 2024")
+st.subheader(f"📈 Perbandingan Skor {nama_pilar[indikator]} {tahun_dari} vs {tahun_ke}")
 
 df_compare = pd.merge(
-    df_2023[["kabupaten", indikator]],
-    df_2024[["kabupaten", indikator]],
+    df_dari[["kabupaten", indikator]],
+    df_ke[["kabupaten", indikator]],
     on="kabupaten",
     how="outer",
-    suffixes=("_2023", "_2024")
+    suffixes=("_awal", "_akhir")
 )
 
-df_compare["Δ (2024 - 2023)"] = df_compare[f"{indikator}_2024"] - df_compare[f"{indikator}_2023"]
+df_compare[label_delta] = df_compare[f"{indikator}_akhir"] - df_compare[f"{indikator}_awal"]
 
 fig = px.bar(
-    df_compare.sort_values("Δ (2024 - 2023)", ascending=False),
+    df_compare.sort_values(label_delta, ascending=False),
     x="kabupaten",
-    y="Δ (2024 - 2023)",
-    color="Δ (2024 - 2023)",
+    y=label_delta,
+    color=label_delta,
     color_continuous_scale="RdYlGn",
-    title=f"Δ Skor {nama_pilar[indikator]} (2024 - 2023)"
+    title=f"Δ Skor {nama_pilar[indikator]} ({tahun_ke} - {tahun_dari})"
 )
 fig.update_layout(xaxis_tickangle=-45, height=450)
 st.plotly_chart(fig, use_container_width=True)
@@ -150,26 +136,27 @@ st.markdown("---")
 st.subheader(f"🔍 Detail Indikator {nama_pilar[indikator]}")
 
 # Ambil kolom indikator rinci
-kolom_indikator = [c for c in df_2023.columns if c.startswith(f"{indikator}_")]
+kolom_indikator = [c for c in df_dari.columns if c.startswith(f"{indikator}_")]
 
 if len(kolom_indikator) > 0:
-    kab = st.selectbox("🏛 Pilih Kabupaten/Kota:", sorted(df_2023["kabupaten"].unique()))
+    kab = st.selectbox("🏛 Pilih Kabupaten/Kota:", sorted(set(df_dari["kabupaten"]) | set(df_ke["kabupaten"])))
 
-    df_2023_det = df_2023[df_2023["kabupaten"] == kab][kolom_indikator].T.reset_index()
-    df_2024_det = df_2024[df_2024["kabupaten"] == kab][kolom_indikator].T.reset_index()
+    df_dari_det = df_dari[df_dari["kabupaten"] == kab][kolom_indikator].T.reset_index()
+    df_ke_det = df_ke[df_ke["kabupaten"] == kab][kolom_indikator].T.reset_index()
 
-    df_2023_det.columns = ["Indikator", "2023"]
-    df_2024_det.columns = ["Indikator", "2024"]
+    # Kolom "awal"/"akhir" dulu supaya tahun yang sama di kedua pilihan tidak bentrok
+    df_dari_det.columns = ["Indikator", "awal"]
+    df_ke_det.columns = ["Indikator", "akhir"]
 
-    df_merge_det = pd.merge(df_2023_det, df_2024_det, on="Indikator", how="outer")
-    df_merge_det["Δ (2024-2023)"] = df_merge_det["2024"] - df_merge_det["2023"]
+    df_merge_det = pd.merge(df_dari_det, df_ke_det, on="Indikator", how="outer")
+    df_merge_det[label_delta] = df_merge_det["akhir"] - df_merge_det["awal"]
 
     st.dataframe(df_merge_det, use_container_width=True, height=450)
 
     # Grafik perbandingan indikator
     fig_ind = go.Figure()
-    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["2023"], orientation='h', name='2023'))
-    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["2024"], orientation='h', name='2024'))
+    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["awal"], orientation='h', name=tahun_dari))
+    fig_ind.add_trace(go.Bar(y=df_merge_det["Indikator"], x=df_merge_det["akhir"], orientation='h', name=tahun_ke))
     fig_ind.update_layout(
         barmode='group', height=500,
         title=f"Perbandingan Indikator {nama_pilar[indikator]} - {kab}"
@@ -184,12 +171,12 @@ else:
 st.markdown("---")
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric("📈 Rata-rata 2023", f"{df_2023[indikator].mean():.2f}")
+    st.metric(f"📈 Rata-rata {tahun_dari}", f"{df_dari[indikator].mean():.2f}")
 with col2:
-    st.metric("📈 Rata-rata 2024", f"{df_2024[indikator].mean():.2f}")
+    st.metric(f"📈 Rata-rata {tahun_ke}", f"{df_ke[indikator].mean():.2f}")
 with col3:
-    delta_mean = df_2024[indikator].mean() - df_2023[indikator].mean()
-    st.metric("Δ Rata-rata (2024 - 2023)", f"{delta_mean:.2f}",
+    delta_mean = df_ke[indikator].mean() - df_dari[indikator].mean()
+    st.metric(f"Δ Rata-rata ({tahun_ke} - {tahun_dari})", f"{delta_mean:.2f}",
               delta=f"{(delta_mean):+.2f}", delta_color="normal")
 
 st.success("✅ Dashboard perbandingan siap digunakan – semua kolom sudah disinkronkan otomatis.")
@@ -0,0 +1,41 @@
+# =======================================
+# 📥 Ingest Excel IDSD tahunan (non-interaktif)
+# =======================================
+# Contoh: python ingest_excel.py Data_2025.xlsx 2025
+import argparse
+import sys
+import time
+
+from build_store import cetak_temuan
+from idsd_core.ingest import ingest_excel
+from idsd_core.store import FOLDER_STORE, NAMA_LAPORAN
+from idsd_core.validasi import DataTidakValid
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest rilis Excel IDSD ke store data dashboard")
+    parser.add_argument("excel", help="Path file Excel IDSD (.xlsx/.xls)")
+    parser.add_argument("tahun", help="Tahun data, mis. 2025")
+    parser.add_argument("--sheet", default=0, help="Nama/nomor sheet (default: sheet pertama)")
+    parser.add_argument("--paksa", action="store_true", help="Ingest ulang walaupun hash file tidak berubah")
+    args = parser.parse_args()
+
+    sheet = int(args.sheet) if str(args.sheet).isdigit() else args.sheet
+    mulai = time.perf_counter()
+    try:
+        hasil = ingest_excel(args.excel, args.tahun, sheet=sheet, paksa=args.paksa)
+    except DataTidakValid as e:
+        print(e)
+        cetak_temuan([t for t in e.laporan["temuan"] if t["tingkat"] == "galat"])
+        print(f"🚫 Store tidak dipublikasikan; laporan lengkap: {FOLDER_STORE}/{NAMA_LAPORAN}")
+        sys.exit(1)
+    durasi = time.perf_counter() - mulai
+
+    if hasil["dilewati"]:
+        print(f"⏭️ {args.excel} tidak berubah sejak ingest terakhir ({hasil['sha256'][:12]}), dilewati.")
+    else:
+        print(f"✅ {hasil['tahun']}: {hasil['excel']} -> {hasil['csv']} ({hasil['baris']} baris, {hasil['kolom']} kolom)")
+        for status, nama in hasil["kabupaten"].items():
+            if nama:
+                print(f"⚠️ Kabupaten {status.replace('_', ' ')}: {', '.join(nama)}")
+        print(f"📦 Versi dataset: {hasil['versi']}")
+    print(f"⏱️ {durasi:.2f} detik")
@@ -0,0 +1,48 @@
+# =======================================
+# 🚀 Jalankan dashboard IDSD: N worker di belakang proxy lokal
+# =======================================
+# Pengganti run_idsd_dashboard_autorestart.py / run_idsd_dashboard_qr.py:
+# supervisor (idsd_core/supervisor.py) menyalakan satu worker Streamlit per
+# core, dengan sticky session, health check, backoff eksponensial, dan cache
+# data yang sudah dihangatkan di tiap worker.
+#   python run_idsd_dashboard.py [--app idsd_dashboard_ntt.py] [--workers 4] [--port 8501] [--ngrok]
+# Rolling restart (mis. setelah build_store.py): kill -HUP <pid supervisor>
+# Tile kecamatan dilayani lewat port yang sama (/tiles/); IDSD_TILE_URL menimpa
+# URL tile bila tile dilayani dari host lain.
+import argparse
+import asyncio
+import os
+import webbrowser
+
+from idsd_core.supervisor import Supervisor
+
+
+def buka_ngrok(port):
+    # Opsional: tunnel publik + QR code untuk dibuka dari HP
+    from pyngrok import exception, ngrok
+    import pyqrcode
+
+    try:
+        ngrok.kill()
+    except exception.PyngrokNgrokError:
+        pass
+    public_url = ngrok.connect(port).public_url
+    print(f"🌍 Ngrok URL publik: {public_url}")
+    webbrowser.open(public_url)
+    print("\n📱 Scan QR code ini dari HP untuk buka dashboard:")
+    print(pyqrcode.create(public_url).terminal(quiet_zone=1))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Supervisor multi-worker dashboard IDSD NTT")
+    parser.add_argument("--app", default="idsd_dashboard_ntt.py")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--ngrok", action="store_true", help="buka tunnel ngrok + QR code")
+    args = parser.parse_args()
+
+    supervisor = Supervisor(args.app, args.workers, args.host, args.port)
+    if args.ngrok:
+        buka_ngrok(args.port)
+    asyncio.run(supervisor.jalankan())
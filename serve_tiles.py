@@ -0,0 +1,27 @@
+# =======================================
+# 🌐 Server vector tile kecamatan (lokal)
+# =======================================
+# Dashboard menyalakan server ini sendiri di thread latar bila port masih
+# kosong; script ini untuk menjalankannya sebagai proses terpisah, mis.
+#   python serve_tiles.py --port 8765
+# lalu set IDSD_TILE_URL (URL publik server ini, atau "" untuk path relatif
+# bila /tiles/ diteruskan lewat origin dashboard) sebelum menjalankan dashboard.
+# run_idsd_dashboard.py sudah menjalankan server ini & meneruskan /tiles/ sendiri.
+import argparse
+
+from idsd_core.tiles import HOST_TILES, PORT_TILES, buat_server, ensure_tiles, url_tiles
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server vector tile kecamatan IDSD NTT")
+    parser.add_argument("--host", default=HOST_TILES)
+    parser.add_argument("--port", type=int, default=PORT_TILES)
+    args = parser.parse_args()
+
+    versi = ensure_tiles()["versi"]
+    server = buat_server(args.host, args.port)
+    print(f"🌐 Tile: {url_tiles(f'http://{args.host}:{args.port}', versi)}")
+    print(f"📄 TileJSON: http://{args.host}:{args.port}/tiles/metadata.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server tile dihentikan")
@@ -9,6 +9,15 @@ echo "Memastikan CSV tersedia..."
 [ -f data/idsd_data_2023.csv ] || cp data_2023_lengkap.csv data/idsd_data_2023.csv
 [ -f data/idsd_data_2024.csv ] || cp data_2024_lengkap.csv data/idsd_data_2024.csv
 
+# -------------------------
+# Store Kolumnar (Arrow)
+# -------------------------
+echo "Mengompilasi store data..."
+python build_store.py
+
+echo "Menyederhanakan geometri kabupaten..."
+python build_geometry.py
+
 # -------------------------
 # GeoJSON Kabupaten
 # -------------------------
@@ -31,4 +40,5 @@ if [ ! -f data/geojson_kecamatan_ntt_official.geojson ]; then
     echo '{}' > data/geojson_kecamatan_ntt_official.geojson
 fi
 
-echo "Setup selesai! Dashboard siap dijalankan."
+echo "Setup selesai! Dashboard siap dijalankan:"
+echo "  python run_idsd_dashboard.py --workers $(nproc)"
@@ -2,12 +2,11 @@
 # Import libraries
 # ======================
 import streamlit as st
-import pandas as pd
-import geopandas as gpd
 import folium
 from streamlit_folium import st_folium
-from branca.colormap import linear
 import plotly.express as px
+from idsd_core import DataTidakValid, service
+from idsd_core.choropleth import layer_choropleth
 
 # ======================
 # Streamlit page config
@@ -18,39 +17,34 @@ st.title("🗺️ Peta Interaktif IDSD Nusa Tenggara Timur")
 # ======================
 # Load data
 # ======================
-# CSV skor pilar
+# Skor pilar tahun terbaru & geometri kabupaten dari layanan bersama idsd_core.service
 try:
-    df_scores = pd.read_csv("data/scores.csv")
-except FileNotFoundError:
-    st.error("File data/scores.csv tidak ditemukan. Pastikan file ada di folder 'data/'.")
+    df_scores = service.get_tahun(service.daftar_tahun()[-1])
+    fitur_peta = service.get_fitur_peta(zoom=8)
+except FileNotFoundError as e:
+    st.error(f"Data tidak ditemukan: {e}")
     st.stop()
-
-# GeoJSON kabupaten
-try:
-    gdf_kab = gpd.read_file("data/geojson_kabupaten.geojson")
-except FileNotFoundError:
-    st.error("File data/geojson_kabupaten.geojson tidak ditemukan.")
+except DataTidakValid as e:
+    st.error(f"{e}. Jalankan build_store.py untuk laporan validasi lengkap.")
     st.stop()
 
-# ======================
-# Gabungkan data
-# ======================
-gdf = gdf_kab.merge(df_scores, on="kabupaten", how="left")
-
 # ======================
 # Peta Folium
 # ======================
 m = folium.Map(location=[-10.2, 123.6], zoom_start=8)
 
-for _, row in gdf.iterrows():
-    folium.GeoJson(
-        row["geometry"],
-        name=row["kabupaten"],
-        tooltip=f"{row['kabupaten']}: Pilar 1={row['pilar_1']}, Pilar 2={row['pilar_2']}, Pilar 3={row['pilar_3']}"
-    ).add_to(m)
+layer_choropleth(
+    fitur_peta,
+    df_scores,
+    "pilar_1",
+    nama="Skor Pilar IDSD",
+    kolom_tooltip=["pilar_1", "pilar_2", "pilar_3"],
+    alias=["Pilar 1:", "Pilar 2:", "Pilar 3:"],
+).add_to(m)
 
 st.subheader("Peta Kabupaten NTT dengan Skor Pilar IDSD")
-st_folium(m, width="stretch")
+# returned_objects=[]: peta tidak mengembalikan state, pan/zoom tidak memicu rerun
+st_folium(m, width="stretch", returned_objects=[])
 
 # ======================
 # Statistik ringkas
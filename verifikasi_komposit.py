@@ -0,0 +1,91 @@
+# =======================================
+# 🧮 Verifikasi skor pilar rilis vs hitung ulang dari indikator
+# =======================================
+# Skor pilar dihitung ulang dengan mesin komposit (rata-rata indikator, bobot
+# sama) lalu dibandingkan dengan kolom pilar_N di CSV rilis. Selain itu dicek
+# bahwa Skenario what-if tanpa perubahan sama persis dengan skor & peringkat
+# rilis (agregat), dan kembali ke rilis setelah diubah lalu direset; gagal
+# (exit 1) bila tidak.
+#   python verifikasi_komposit.py
+#   python verifikasi_komposit.py --toleransi 0.05 --detail
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from idsd_core.agregat import KubusAgregat
+from idsd_core.komposit import TOLERANSI_VERIFIKASI, MesinKomposit, Skenario
+from idsd_core.panel import load_panel
+
+
+def cek_skenario_dasar(mesin):
+    # Skenario tanpa perubahan (dan setelah ubah + reset) == skor & peringkat rilis
+    agregat = KubusAgregat(mesin.panel)
+    skenario = Skenario(mesin)
+    masalah = []
+
+    def bandingkan(tahun, keterangan):
+        t = mesin.tahun.index(tahun)
+        peringkat = agregat.tahun(tahun)["peringkat"]
+        for kab in mesin.kabupaten[mesin.ada[t]]:
+            skor = skenario.skor(tahun, kab)
+            k = mesin.panel.kabupaten.get_loc(kab)
+            for pilar in mesin.kolom_pilar:
+                rilis = mesin.panel.nilai[t, k, mesin.panel._i([pilar])[0]]
+                hasil = skor.loc[pilar, "skenario"]
+                if not (np.isnan(rilis) and np.isnan(hasil)) and rilis != hasil:
+                    masalah.append(f"{keterangan} {tahun} {kab} {pilar}: skor {hasil} != rilis {rilis}")
+                    continue
+                baru, lama, _ = skenario.peringkat(tahun, kab, pilar)
+                harapan = peringkat[k, mesin.panel._i([pilar])[0]]
+                if baru is not None and (baru != harapan or lama != harapan):
+                    masalah.append(f"{keterangan} {tahun} {kab} {pilar}: peringkat {baru} != rilis {harapan:.0f}")
+
+    for tahun in mesin.tahun:
+        bandingkan(tahun, "awal")
+        # Ubah semua indikator terisi satu kabupaten, lalu kembalikan
+        t = mesin.tahun.index(tahun)
+        kab = mesin.kabupaten[np.flatnonzero(mesin.ada[t])[0]]
+        k = mesin.kabupaten.get_loc(kab)
+        for i in np.flatnonzero(mesin.A[t, k]):
+            skenario.atur(tahun, kab, mesin.indikator[i], min(5.0, mesin.X[t, k, i] + 0.5))
+        skenario.reset(tahun, kab)
+        bandingkan(tahun, "reset")
+    return masalah
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifikasi skor pilar IDSD terhadap indikator penyusunnya")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI_VERIFIKASI)
+    parser.add_argument("--detail", action="store_true", help="Tampilkan kabupaten yang tidak cocok")
+    args = parser.parse_args()
+
+    mesin = MesinKomposit(load_panel())
+    mulai = time.perf_counter()
+    hasil = mesin.hitung()
+    print(f"⏱️ Hitung ulang {len(mesin.tahun)} tahun × {len(mesin.kabupaten)} kabupaten × "
+          f"{len(mesin.indikator)} indikator: {(time.perf_counter() - mulai) * 1000:.2f} ms")
+
+    laporan = mesin.verifikasi(hasil, args.toleransi)
+    for _, b in laporan.iterrows():
+        tanda = "✅" if b["cocok"] else ("⚠️" if b["n"] else "❔")
+        print(f"{tanda} {b['tahun']} {b['pilar']:<9} n={b['n']:<3} selisih maks {b['selisih_maks']:.3f} "
+              f"rata {b['selisih_rata']:.3f} | tidak cocok {b['tidak_cocok']}")
+        if args.detail and b["tidak_cocok"]:
+            t, p = mesin.tahun.index(b["tahun"]), mesin.kolom_pilar.index(b["pilar"])
+            rilis = mesin.panel.skor(b["tahun"], b["pilar"])
+            hitung = hasil["pilar"][t, mesin.ada[t], p]
+            beda = np.abs(hitung - rilis.to_numpy()) > args.toleransi
+            for kab, r, h in zip(rilis.index[beda], rilis[beda], hitung[beda]):
+                print(f"      {kab:<24} rilis {r:.2f} hitung {h:.2f}")
+
+    cocok = int(laporan["cocok"].sum())
+    print(f"\n📊 {cocok}/{len(laporan)} kombinasi tahun × pilar cocok (toleransi {args.toleransi})")
+
+    masalah = cek_skenario_dasar(mesin)
+    for m in masalah[:10]:
+        print(f"❌ {m}")
+    if masalah:
+        print(f"❌ Skenario what-if tanpa perubahan tidak sama dengan rilis ({len(masalah)} selisih)")
+        sys.exit(1)
+    print("✅ Skenario what-if tanpa perubahan = skor & peringkat rilis (juga setelah ubah + reset)")